@@ -0,0 +1,240 @@
+# 빠른 거리 계산 경로의 정확도 회귀 검사
+#
+# 코스마다(그리고 극지방, 경도 ±180°, 적도의 가상 코스) 촘촘한 격자와 넓은 무작위 점
+# 구름을 만들어 각 빠른 경로의 결과를 Karney 타원체 거리(geographiclib)와 비교함.
+# 경로별로 최대/p99/평균 오차와 처리량을 나란히 보여 주고, 선언된 허용 오차를 넘는
+# 경로가 있으면 종료 코드 1
+#
+#   경로        허용 오차 (선언 위치)
+#   batched     distance_engine.ERROR_BOUND_M            (타원체 일괄 계산)
+#   projected   distance_engine.PROJECTED_ERROR_BOUND_M  (코스 ENU 평면, 반경 밖은 타원체)
+#   raster      DistanceRaster.error_bound_m             (거리 래스터 메타데이터, 범위 밖은 projected)
+#   shot        shot_log.ERROR_BOUND_M                   (샷 거리, SHOT_RANGE_M 이내 쌍만)
+#
+#   python accuracy.py
+#   python accuracy.py --course jindalee --json cache/accuracy.json
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from geographiclib.geodesic import Geodesic
+
+import distance_engine
+import distance_raster
+import shot_log
+from course_data import CourseStore, compile_courses, load_course, open_store
+
+# 가상 코스 홀컵 배치 (중심에서 북/동쪽 미터)
+_theta = np.linspace(0, 2 * np.pi, 9, endpoint=False)
+# 중심 + 반경 300 m 원 위의 9개
+RING = tuple(zip([0.0] + (300 * np.cos(_theta)).tolist(), [0.0] + (300 * np.sin(_theta)).tolist()))
+# 동서로 2.4 km: 래스터 최대 거리가 2048 m를 넘는 코스 (float16이면 값 간격 2 m 구간)
+LINE = ((0.0, -1200.0), (0.0, 0.0), (0.0, 1200.0))
+
+# 가상 코스 (이름, 중심 위도, 중심 경도, 홀컵 배치)
+SYNTHETIC_SITES = (
+    ('north-pole', 89.99, 0.0, RING),
+    ('south-pole', -89.99, 45.0, RING),
+    ('antimeridian', -17.0, 179.999, RING),
+    ('equator', 0.0, 0.0, RING),
+    ('long', -27.5, 153.0, LINE),
+)
+
+GRID_SIZE = 60
+GRID_MARGIN_M = 200.0
+CLOUD_SIZE = 3000
+# 점 구름 반경: 평면 근사 반경의 2배 (타원체 대체 경로도 포함)
+CLOUD_RADIUS_M = 2 * distance_engine.VALID_RADIUS_M
+
+_M_PER_DEG_LAT = 111320.0
+
+
+def _wrap(lat, lon):
+    """극을 넘은 위도는 반대편 경도로 접고, 경도는 [-180, 180)으로"""
+    lat, lon = np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64)
+    over = np.abs(lat) > 90
+    lat = np.where(over, np.sign(lat) * 180 - lat, lat)
+    lon = np.where(over, lon + 180, lon)
+    return lat, (lon + 180) % 360 - 180
+
+
+def _offset(lat0, lon0, dn, de):
+    """중심에서 북/동쪽으로 dn, de 미터 떨어진 점 (근사, 극 근처에서도 유효한 좌표로 접음)"""
+    cos_lat = max(math.cos(math.radians(lat0)), 1e-6)
+    return _wrap(lat0 + np.asarray(dn) / _M_PER_DEG_LAT,
+                 lon0 + np.asarray(de) / (_M_PER_DEG_LAT * cos_lat))
+
+
+def synthetic_course(name, lat0, lon0, directory, layout=RING):
+    """중심에서 layout (북, 동 미터) 위치에 홀컵을 둔 가상 코스"""
+    import yaml
+
+    dn, de = np.array(layout).T
+    lats, lons = _offset(lat0, lon0, dn, de)
+    holes = [{'number': k + 1, 'pin': [lat, lon]} for k, (lat, lon) in enumerate(zip(lats.tolist(), lons.tolist()))]
+    source = os.path.join(directory, f'{name}.yaml')
+    with open(source, 'w', encoding='utf-8') as f:
+        yaml.safe_dump({'id': name, 'holes': holes}, f)
+    store = os.path.join(directory, f'{name}.bin')
+    compile_courses([source], store)
+    return CourseStore(store).course(name)
+
+
+def scenarios(course, seed=0):
+    """{'grid': (P, 2), 'cloud': (P, 2)} — 코스 경계 격자와 코스 중심 주변 점 구름"""
+    lat0, lon0 = distance_engine.center(course.pin[:, 0], course.pin[:, 1])
+    south, west, north, east = course.bounds(GRID_MARGIN_M)
+    if east - west > 180:
+        # 경도 ±180°에 걸친 코스: 경계 상자 대신 중심 기준 정사각형
+        half = GRID_MARGIN_M + 500.0
+        dn, de = np.meshgrid(np.linspace(-half, half, GRID_SIZE), np.linspace(-half, half, GRID_SIZE))
+        glat, glon = _offset(lat0, lon0, dn.ravel(), de.ravel())
+    else:
+        glat, glon = np.meshgrid(np.linspace(south, north, GRID_SIZE), np.linspace(west, east, GRID_SIZE))
+        glat, glon = _wrap(glat.ravel(), glon.ravel())
+    rng = np.random.default_rng(seed)
+    r = CLOUD_RADIUS_M * np.sqrt(rng.uniform(0, 1, CLOUD_SIZE))
+    theta = rng.uniform(0, 2 * np.pi, CLOUD_SIZE)
+    clat, clon = _offset(lat0, lon0, r * np.cos(theta), r * np.sin(theta))
+    return {'grid': np.column_stack([glat, glon]), 'cloud': np.column_stack([clat, clon])}
+
+
+def reference(positions, pins):
+    """Karney 타원체 거리 행렬과 쌍당 계산 시간"""
+    inverse = Geodesic.WGS84.Inverse
+    start = time.perf_counter()
+    out = np.array([
+        [inverse(lat, lon, plat, plon, Geodesic.DISTANCE)['s12'] for plat, plon in pins]
+        for lat, lon in positions.tolist()
+    ])
+    return out, (time.perf_counter() - start) / out.size
+
+
+def _timed(fn, repeat=3):
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def fast_paths(course, raster_dir):
+    """[(이름, 허용 오차, 행렬 함수 또는 None, 건너뛴 이유)] — 래스터는 파일마다 저장된 오차 상한"""
+    hole_coords = course.hole_coords()
+    projected = distance_engine.ProjectedEngine(hole_coords)
+    paths = [
+        ('batched', distance_engine.ERROR_BOUND_M, distance_engine.DistanceEngine(hole_coords).matrix, None),
+        ('projected', distance_engine.PROJECTED_ERROR_BOUND_M, projected.matrix, None),
+    ]
+    south, west, north, east = course.bounds(distance_raster.DEFAULT_MARGIN_M)
+    if east - west > 180:
+        paths.append(('raster', None, None, "위경도 격자는 경도 ±180°를 넘을 수 없음"))
+    else:
+        raster = distance_raster.open_raster(course, fallback=projected)
+        if raster is None:
+            path = distance_raster.build_raster(course, path=os.path.join(raster_dir, f'{course.id}.npy'))
+            raster = distance_raster.DistanceRaster(path, fallback=projected)
+        paths.append(('raster', raster.error_bound_m, raster.matrix, None))
+    return paths
+
+
+def _shot_matrix(positions, pins):
+    return np.array([
+        [shot_log.shot_distance(lat, lon, plat, plon) for plat, plon in pins]
+        for lat, lon in positions.tolist()
+    ])
+
+
+def _errors(got, ref, mask=None):
+    err = np.abs(got - ref)
+    if mask is not None:
+        err = err[mask]
+    if not err.size:
+        return None
+    return {'max': float(err.max()), 'p99': float(np.percentile(err, 99)), 'mean': float(err.mean())}
+
+
+def check_course(course, raster_dir, seed=0):
+    """코스 하나의 시나리오 × 경로 결과 목록"""
+    pins = course.pin.tolist()
+    rows = []
+    paths = fast_paths(course, raster_dir)
+    for scenario, positions in scenarios(course, seed).items():
+        ref, ref_time = reference(positions, pins)
+        pairs = ref.size
+        rows.append({'course': course.id, 'scenario': scenario, 'path': 'karney', 'pairs': pairs,
+                     'tolerance': 0.0, 'pairs_per_s': 1 / ref_time, 'max': 0.0, 'p99': 0.0, 'mean': 0.0,
+                     'ok': True})
+        for name, tolerance, matrix, skipped in paths:
+            row = {'course': course.id, 'scenario': scenario, 'path': name, 'tolerance': tolerance}
+            if matrix is None:
+                rows.append({**row, 'skipped': skipped, 'ok': True})
+                continue
+            got, seconds = _timed(lambda: matrix(positions))
+            stats = _errors(got, ref)
+            rows.append({**row, 'pairs': pairs, 'pairs_per_s': pairs / seconds, **stats,
+                         'ok': stats['max'] <= tolerance})
+        got, seconds = _timed(lambda: _shot_matrix(positions, pins), repeat=1)
+        near = ref <= shot_log.SHOT_RANGE_M
+        stats = _errors(got, ref, near)
+        row = {'course': course.id, 'scenario': scenario, 'path': 'shot', 'tolerance': shot_log.ERROR_BOUND_M}
+        if stats is None:
+            rows.append({**row, 'skipped': f"{shot_log.SHOT_RANGE_M:.0f} m 이내 쌍 없음", 'ok': True})
+        else:
+            rows.append({**row, 'pairs': int(near.sum()), 'pairs_per_s': pairs / seconds, **stats,
+                         'ok': stats['max'] <= shot_log.ERROR_BOUND_M})
+    return rows
+
+
+def run(course_ids=None, synthetic=True, seed=0):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        courses = [load_course(c) for c in (course_ids or open_store().course_ids())]
+        if synthetic:
+            courses += [synthetic_course(name, lat, lon, tmp, layout) for name, lat, lon, layout in SYNTHETIC_SITES]
+        for course in courses:
+            rows.extend(check_course(course, tmp, seed))
+    return rows
+
+
+def _print(rows):
+    print(f"{'코스':14s} {'시나리오':6s} {'경로':10s} {'최대 m':>10} {'p99 m':>10} {'평균 m':>10} "
+          f"{'허용 m':>8} {'쌍/초':>12}")
+    for r in rows:
+        head = f"{r['course']:14s} {r['scenario']:6s} {r['path']:10s}"
+        if 'skipped' in r:
+            print(f"{head} 건너뜀: {r['skipped']}")
+            continue
+        mark = "" if r['ok'] else "  ← 허용 오차 초과"
+        print(f"{head} {r['max']:10.5f} {r['p99']:10.5f} {r['mean']:10.5f} {r['tolerance']:8.3f} "
+              f"{r['pairs_per_s']:12,.0f}{mark}")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="빠른 거리 계산 경로 정확도 검사 (Karney 기준)")
+    parser.add_argument('--course', action='append', help="검사할 코스 (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument('--no-synthetic', action='store_true', help="극지방/경도 180° 가상 코스 제외")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="결과를 JSON으로 저장")
+    args = parser.parse_args(argv)
+
+    rows = run(args.course, not args.no_synthetic, args.seed)
+    _print(rows)
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or '.', exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+    failed = [r for r in rows if not r['ok']]
+    print(f"검사 {len(rows)}개, 허용 오차 초과 {len(failed)}개")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
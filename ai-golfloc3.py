@@ -3,73 +3,117 @@
 ### 개선된 코드
 
 import streamlit as st
-import geocoder
-
-from geopy.distance import geodesic
-
-# Jindalee Golf Course 홀컵 좌표 (위도, 경도)
-HOLE_COORDS = {
-    1: (-27.53918, 152.945457),
-    2: (-27.53658, 152.94362),
-    3: (-27.536325, 152.946275),
-    4: (-27.535989, 152.943866),
-    5: (-27.534852, 152.944261),
-    6: (-27.532689, 152.945452),
-    7: (-27.534462, 152.944352),
-    8: (-27.532874, 152.943498),
-    9: (-27.535837, 152.943191),
-    10: (-27.53918, 152.945457),
-    11: (-27.53658, 152.94362),
-    12: (-27.536325, 152.946275),
-    13: (-27.535989, 152.943866),
-    14: (-27.534852, 152.944261),
-    15: (-27.532689, 152.945452),
-    16: (-27.534462, 152.944352),
-    17: (-27.532874, 152.943498),
-    18: (-27.535837, 152.943191)
-}
+
+from course_data import DEFAULT_COURSE, CourseDataError, load_course
+from distance_engine import ProjectedEngine
+from ip_locator import IpLocator, open_database, parse_ip
+from metrics import start as start_metrics, watch
+from timing import configure as configure_timing, diagnostics_panel, rerun, timer
+
+# 코스 데이터 (courses/*.yaml → courses/courses.bin 메모리 매핑)
+# ?course=<코스 id> 로 코스 선택, 기본값은 GOLF_COURSE 환경 변수 또는 jindalee
+try:
+    COURSE = load_course(st.query_params.get("course", DEFAULT_COURSE))
+except CourseDataError as e:
+    st.error(f"코스 데이터를 불러오지 못했습니다: {e}")
+    st.stop()
+HOLE_COORDS = COURSE.hole_coords()
+
+# 거리 엔진은 프로세스당 한 번만 생성
+@st.cache_resource
+def get_distance_engine(course_id):
+    return ProjectedEngine(load_course(course_id).hole_coords())
+
+# IP 위치 조회기 (로컬 GeoIP 데이터베이스 + TTL 캐시, 프로세스 전체 공유)
+@st.cache_resource
+def get_ip_locator():
+    return watch('ip', IpLocator(open_database()), hits=('hits', 'coalesced'), misses=('misses',))
+
+
+def client_ip():
+    """프록시가 넘겨준 접속자 IP. 없거나 형식이 잘못됐으면 None (서버 공인 IP 기준으로 조회)"""
+    try:
+        from streamlit.web.server.websocket_headers import _get_websocket_headers
+        headers = _get_websocket_headers() or {}
+    except Exception:
+        return None
+    forwarded = headers.get("X-Forwarded-For", "")
+    return parse_ip(forwarded.split(",")[0])
 
 
 # Streamlit UI
-# st.title("🏌️ Jindalee Golf Course 홀 거리 측정")
-st.markdown("#### Jindalee Golf Course :red[홀 거리] by Kevin")
-st.markdown("현 위치에서  홀컵까지 거리 계산")
-
-# 홀 선택
-hole_number = st.selectbox(
-    "홀 번호  선택 (1-18):",
-    options=list(range(1, 19)),
-    index=0
-)
-
-# 현재 위치를 찾기
-g = geocoder.ip('me')
-
-# 위도와 경도 출력
-current_lat = g.latlng[0]
-current_lon = g.latlng[1]
-
-current_pos = (current_lat, current_lon)
-
-# st.button("거리 계산", type="primary")  # 기본 테마 색상
-# st.button("거리 계산", type="secondary")  # 보조 색상
-# 거리 계산
-if st.button("거리 계산", type="secondary"):
-    if hole_number in HOLE_COORDS:
-        target_pos = HOLE_COORDS[hole_number]
-        distance_m = geodesic(current_pos, target_pos).meters
-        distance_yard = distance_m * 1.09361  # 미터 → 야드 변환
-        
-        st.success(
-            f"**홀 {hole_number}까지 거리:**\n\n"
-            f"- {distance_m:.2f} 미터\n"
-        #    f"- {distance_yard:.2f} 야드"
-        )
-        
-        # 추가 시각화 (선택 사항)
-        st.progress(min(1.0, distance_m / 300))  # 300m를 최대 기준으로 진행률 표시
+def main():
+    # st.title("🏌️ Jindalee Golf Course 홀 거리 측정")
+    st.markdown("#### Jindalee Golf Course :red[홀 거리] by Kevin")
+    st.markdown("현 위치에서  홀컵까지 거리 계산")
+
+    # 홀 선택
+    hole_number = st.selectbox(
+        "홀 번호  선택 (1-18):",
+        options=list(range(1, 19)),
+        index=0
+    )
+
+    # 현재 위치를 찾기 (백그라운드에서 조회하고 페이지는 바로 그림)
+    location_future = get_ip_locator().locate_async(client_ip())
+
+    current_pos = None
+    if location_future.done():
+        # 실패한 조회는 잠시 캐시되므로 다시 리런하지 않고 경고만 표시
+        if location_future.exception() is None:
+            current_pos = location_future.result()
+        else:
+            st.warning(f"현재 위치를 가져오지 못했습니다: {location_future.exception()}")
     else:
-        st.error("유효하지 않은 홀 번호입니다.")
+        # 조회가 끝나면 한 번만 전체 리런해서 위치를 채움
+        @st.experimental_fragment(run_every=0.5)
+        def wait_for_location():
+            if location_future.done():
+                st.rerun()
+            st.caption("현재 위치 확인 중...")
+
+        wait_for_location()
+
+    # st.button("거리 계산", type="primary")  # 기본 테마 색상
+    # st.button("거리 계산", type="secondary")  # 보조 색상
+    # 거리 계산
+    if st.button("거리 계산", type="secondary"):
+        if current_pos is None:
+            st.warning("현재 위치를 아직 확인하지 못했습니다. 잠시 후 다시 시도해주세요.")
+        elif hole_number in HOLE_COORDS:
+            with timer('distance.all_holes'):
+                all_distances = get_distance_engine(COURSE.id).as_dict(current_pos)
+            distance_m = all_distances[hole_number]
+            distance_yard = distance_m * 1.09361  # 미터 → 야드 변환
+
+            st.success(
+                f"**홀 {hole_number}까지 거리:**\n\n"
+                f"- {distance_m:.2f} 미터\n"
+            #    f"- {distance_yard:.2f} 야드"
+            )
+
+            # 추가 시각화 (선택 사항)
+            st.progress(min(1.0, distance_m / 300))  # 300m를 최대 기준으로 진행률 표시
+
+            # 전체 홀 거리 표
+            with st.expander("전체 홀 거리"):
+                st.table({
+                    "홀": list(all_distances),
+                    "미터": [f"{d:.1f}" for d in all_distances.values()],
+                })
+        else:
+            st.error("유효하지 않은 홀 번호입니다.")
+
+    diagnostics_panel()
+
+
+if __name__ == "__main__":
+    # ?diag=1 이면 구간별 실행 시간 측정 + 진단 패널
+    configure_timing()
+    # GOLF_METRICS_PORT 가 있으면 Prometheus 지표 서버 (프로세스당 한 번)
+    start_metrics()
+    with rerun('ai-golfloc3'):
+        main()
 
 
 #
\ No newline at end of file
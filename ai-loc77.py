@@ -5,30 +5,49 @@
 import streamlit as st
 import random
 import time
-from geopy.distance import geodesic
+
+from course_data import DEFAULT_COURSE, CourseDataError, load_course
+from distance_engine import ProjectedEngine
+from hole_locator import HoleLocator, HoleTracker
+from metrics import start as start_metrics
+from timing import configure as configure_timing, diagnostics_panel, rerun, timer
  
 
-# Jindalee Golf Course 홀컵 좌표 (위도, 경도)
-HOLE_COORDS = {
-    1: (-27.53918, 152.945457),
-    2: (-27.53658, 152.94362),
-    3: (-27.536325, 152.946275),
-    4: (-27.535989, 152.943866),
-    5: (-27.534852, 152.944261),
-    6: (-27.532689, 152.945452),
-    7: (-27.534462, 152.944352),
-    8: (-27.532874, 152.943498),
-    9: (-27.535837, 152.943191),
-    10: (-27.53918, 152.945457),
-    11: (-27.53658, 152.94362),
-    12: (-27.536325, 152.946275),
-    13: (-27.535989, 152.943866),
-    14: (-27.534852, 152.944261),
-    15: (-27.532689, 152.945452),
-    16: (-27.534462, 152.944352),
-    17: (-27.532874, 152.943498),
-    18: (-27.535837, 152.943191)
-}
+# 코스 데이터 (courses/*.yaml → courses/courses.bin 메모리 매핑)
+# ?course=<코스 id> 로 코스 선택, 기본값은 GOLF_COURSE 환경 변수 또는 jindalee
+try:
+    COURSE = load_course(st.query_params.get("course", DEFAULT_COURSE))
+except CourseDataError as e:
+    st.error(f"코스 데이터를 불러오지 못했습니다: {e}")
+    st.stop()
+HOLE_COORDS = COURSE.hole_coords()
+
+# 거리 엔진은 프로세스당 한 번만 생성
+@st.cache_resource
+def get_distance_engine(course_id):
+    return ProjectedEngine(load_course(course_id).hole_coords())
+
+# 홀 자동 감지용 공간 색인 (프로세스당 한 번 생성)
+@st.cache_resource
+def get_hole_locator(course_id):
+    course = load_course(course_id)
+    return HoleLocator.from_hole_coords(
+        course.hole_coords(), tees=course.tee_coords(), fairways=course.fairway_coords()
+    )
+
+def detect_hole():
+    """현재 위치가 바뀌었으면 진행 중인 홀을 추정하여 홀 선택 값을 갱신"""
+    pos = st.session_state.current_pos
+    if pos is None or pos == st.session_state.get('tracked_pos'):
+        return
+    locator = get_hole_locator(COURSE.id)
+    tracker = st.session_state.get('hole_tracker')
+    if tracker is None or tracker.locator is not locator:
+        st.session_state.hole_tracker = HoleTracker(locator)
+    st.session_state.tracked_pos = pos
+    hole = st.session_state.hole_tracker.update(pos)
+    if hole is not None:
+        st.session_state.hole_number = hole
 
 # Streamlit 앱
 
@@ -43,6 +62,9 @@ def main():
     # 세션 상태 초기화
     if 'current_pos' not in st.session_state:
         st.session_state.current_pos = None
+    # 홀 선택 위젯 값은 세션 상태로만 정함 (홀 자동 감지가 같은 키에 씀)
+    if 'hole_number' not in st.session_state:
+        st.session_state.hole_number = next(iter(HOLE_COORDS))
     
 # 위도와 경도 입력 받기
     # lat = st.text_input("현위치 위도 입력", "")
@@ -61,10 +83,12 @@ def main():
 
     # 거리 계산 섹션
     st.subheader(" 홀 거리 계산")
+    if st.toggle("현재 위치로 홀 자동 선택", value=True):
+        detect_hole()
     hole_number = st.selectbox(
         "홀 번호 선택 (1-18):",
-        options=list(range(1, 19)),
-        index=0
+        options=list(HOLE_COORDS),
+        key="hole_number"
     )
     
     #gps = DummyGPS()
@@ -73,8 +97,9 @@ def main():
         if st.session_state.current_pos is None:
             st.error("먼저 '위치 측정' 버튼으로 현재 위치를 확인해주세요.")
         elif hole_number in HOLE_COORDS:
-            target_pos = HOLE_COORDS[hole_number]
-            distance_m = geodesic(st.session_state.current_pos, target_pos).meters
+            with timer('distance.all_holes'):
+                all_distances = get_distance_engine(COURSE.id).as_dict(st.session_state.current_pos)
+            distance_m = all_distances[hole_number]
             
             st.success(
                 f"**홀 {hole_number}까지 거리:**\n\n"
@@ -87,8 +112,21 @@ def main():
             progress = min(1.0, distance_m / max_distance)
             st.progress(progress)
             st.caption(f"기준 거리: {max_distance}m (진행률 {progress*100:.0f}%)")
+
+            # 전체 홀 거리 표
+            with st.expander("전체 홀 거리"):
+                st.table({
+                    "홀": list(all_distances),
+                    "미터": [f"{d:.1f}" for d in all_distances.values()],
+                })
         else:
             st.error("유효하지 않은 홀 번호입니다.")
 
+    diagnostics_panel()
+
 if __name__ == '__main__':
-    main()
+    configure_timing()
+    # GOLF_METRICS_PORT 가 있으면 Prometheus 지표 서버 (프로세스당 한 번)
+    start_metrics()
+    with rerun('ai-loc77'):
+        main()
@@ -1,9 +1,31 @@
 # Jindalee Golf Course GPS 거리 측정 앱 (모바일 GPS 지원)
 # Jindalee Golf Course GPS 거리 측정 앱 (Android 호환)
+import math
 import streamlit as st
-from geopy.distance import geodesic
 import time
 
+from profiling import profile_script
+
+# ?profile=1 (또는 GOLF_PROFILE 환경 변수) 이면 이 실행 전체를 프로파일링 (아래 import 포함)
+# 아래 import는 그 비용까지 재려고 일부러 이 뒤에 둠 (noqa: E402)
+PROFILE = profile_script('ai-loc7777')
+
+from centerline import Centerlines  # noqa: E402
+from course_data import DEFAULT_COURSE, CourseDataError, load_course  # noqa: E402
+from client_distance import client_distances  # noqa: E402
+from distance_engine import ProjectedEngine  # noqa: E402
+from distance_raster import open_raster  # noqa: E402
+from elevation import PlaysLike, open_dem  # noqa: E402
+from gps_stream import gps_request, gps_stream  # noqa: E402
+from green_geometry import GreenGeometry  # noqa: E402
+from hazard_index import HazardIndex  # noqa: E402
+from hole_locator import HoleLocator, HoleTracker  # noqa: E402
+from map_layer import course_map, marker  # noqa: E402
+from metrics import start as start_metrics  # noqa: E402
+from round_history import RoundHistory  # noqa: E402
+from shot_log import RoundLog  # noqa: E402
+from timing import configure as configure_timing, diagnostics_panel, rerun, timed, timer  # noqa: E402
+
 # 페이지 설정은 항상 최상단에 위치해야 함
 st.set_page_config(
     page_title="Jindalee Golf GPS",
@@ -11,128 +33,118 @@ st.set_page_config(
     layout="centered"
 )
 
-# Jindalee Golf Course 홀컵 좌표 (위도, 경도)
-HOLE_COORDS = {
-    1: (-27.53918, 152.945457),
-    2: (-27.53658, 152.94362),
-    3: (-27.536325, 152.946275),
-    4: (-27.535989, 152.943866),
-    5: (-27.534852, 152.944261),
-    6: (-27.532689, 152.945452),
-    7: (-27.534462, 152.944352),
-    8: (-27.532874, 152.943498),
-    9: (-27.535837, 152.943191),
-    10: (-27.53918, 152.945457),
-    11: (-27.53658, 152.94362),
-    12: (-27.536325, 152.946275),
-    13: (-27.535989, 152.943866),
-    14: (-27.534852, 152.944261),
-    15: (-27.532689, 152.945452),
-    16: (-27.534462, 152.944352),
-    17: (-27.532874, 152.943498),
-    18: (-27.535837, 152.943191)
-}
+# 코스 데이터 (courses/*.yaml → courses/courses.bin 메모리 매핑)
+# ?course=<코스 id> 로 코스 선택, 기본값은 GOLF_COURSE 환경 변수 또는 jindalee
+try:
+    COURSE = load_course(st.query_params.get("course", DEFAULT_COURSE))
+except CourseDataError as e:
+    st.error(f"코스 데이터를 불러오지 못했습니다: {e}")
+    st.stop()
+HOLE_COORDS = COURSE.hole_coords()
+
+# 거리 엔진은 프로세스당 한 번만 생성 (모든 세션/리런 공유)
+# 코스 반경 안에서는 ENU 평면 계산, 밖에서는 타원체 계산으로 자동 전환
+# 거리 래스터를 만들어 두었으면 (python distance_raster.py build <코스>) 격자 조회를 우선 사용
+@st.cache_resource
+def get_distance_engine(course_id):
+    course = load_course(course_id)
+    engine = ProjectedEngine(course.hole_coords())
+    return open_raster(course, fallback=engine) or engine
+
+# 그린 앞/가운데/뒤 거리 계산용 그린 변 배열 (프로세스당 한 번 생성)
+@st.cache_resource
+def get_green_geometry(course_id):
+    return GreenGeometry(load_course(course_id))
+
+# 고저차 반영 거리 (DEM 파일이 있을 때만, python elevation.py convert ...)
+@st.cache_resource
+def get_plays_like(course_id):
+    dem = open_dem()
+    return PlaysLike(load_course(course_id), dem) if dem is not None else None
+
+# 해저드 R-tree (프로세스당 한 번 생성)
+@st.cache_resource
+def get_hazard_index(course_id):
+    return HazardIndex(load_course(course_id))
+
+HAZARD_LABELS = {'bunker': "벙커", 'water': "워터", 'ob': "OB"}
+
+# 도그렉 홀 플레이 라인 거리용 페어웨이 중심선 (프로세스당 한 번 생성)
+@st.cache_resource
+def get_centerlines(course_id):
+    return Centerlines(load_course(course_id))
+
+# 라운드 기록 DB (프로세스당 연결 하나를 모든 세션이 공유)
+@st.cache_resource
+def get_round_history():
+    return RoundHistory()
+
+# 홀 자동 감지용 공간 색인 (프로세스당 한 번 생성)
+@st.cache_resource
+def get_hole_locator(course_id):
+    course = load_course(course_id)
+    return HoleLocator.from_hole_coords(
+        course.hole_coords(), tees=course.tee_coords(), fairways=course.fairway_coords()
+    )
 
-def main():
-    st.markdown("#### :red[홀 거리 측정] by Kevin")
-    st.markdown("현재 위치에서 홀컵까지의 거리를 계산합니다")
-    
-    # 세션 상태 초기화
-    if 'current_pos' not in st.session_state:
-        st.session_state.current_pos = None
-    if 'gps_requested' not in st.session_state:
-        st.session_state.gps_requested = False
-    if 'js_listener_set' not in st.session_state:
-        st.session_state.js_listener_set = False
-    
-    # 위치 서비스 요청 섹션
+def detect_hole():
+    """현재 위치가 바뀌었으면 진행 중인 홀을 추정하여 홀 선택 값을 갱신"""
+    pos = st.session_state.current_pos
+    if pos is None or pos == st.session_state.get('tracked_pos'):
+        return
+    locator = get_hole_locator(COURSE.id)
+    tracker = st.session_state.get('hole_tracker')
+    if tracker is None or tracker.locator is not locator:
+        st.session_state.hole_tracker = HoleTracker(locator)
+    st.session_state.tracked_pos = pos
+    hole = st.session_state.hole_tracker.update(pos)
+    if hole is not None:
+        st.session_state.hole_number = hole
+
+def mark_shot(lat, lon, hole, accuracy=None, timestamp_ms=None):
+    """현재 라운드 기록에 샷 위치를 추가 (첫 샷에서 라운드 파일 생성)"""
+    if st.session_state.get("round_log") is None:
+        st.session_state.round_log = RoundLog.start(COURSE.id)
+    st.session_state.last_shot_m = st.session_state.round_log.mark(lat, lon, hole, accuracy, timestamp_ms)
+
+def shot_caption():
+    log = st.session_state.get("round_log")
+    if log is None:
+        return
+    last = st.session_state.get("last_shot_m")
+    text = f"저장된 샷 {len(log)}개"
+    if last is not None and not math.isnan(last):
+        text += f" · 직전 샷 {last:.0f} m ({last * 1.09361:.0f} yd)"
+    st.caption(text)
+    if st.button("라운드 종료", key="finish_round"):
+        log.flush()
+        round_id = get_round_history().import_round(log.path, COURSE)
+        st.session_state.round_log = st.session_state.last_shot_m = None
+        if round_id is None:
+            st.info("저장할 새 샷이 없습니다 (이미 저장된 라운드).")
+        else:
+            st.success("라운드 기록을 저장했습니다.")
+
+# 위치 서비스 섹션
+# fragment로 분리되어 있어 이 안의 버튼/폼은 이 섹션만 다시 실행함
+# (거리/지도 섹션 재실행 없음)
+@st.experimental_fragment
+@timed('ui.location')
+def location_section():
     st.subheader("📍 위치 서비스")
     
-    # GPS 요청 버튼
+    # GPS 요청 버튼 - 요청 번호를 올리면 GPS 컴포넌트가 위치를 한 번 받아
+    # 컴포넌트 값으로 돌려줌 (도착하면 이 섹션만 다시 실행됨)
     if st.button("현재 위치 가져오기 (GPS 사용)", type="primary"):
-        st.session_state.gps_requested = True
-    
-    # JavaScript 이벤트 리스너 (한 번만 실행)
-    if not st.session_state.js_listener_set:
-        # 이벤트 리스너 스크립트
-        js_event_listener = """
-        <script>
-        window.addEventListener('message', function(event) {
-            if (event.data.type === 'gpsLocation' || event.data.type === 'gpsError') {
-                // Streamlit에 메시지 전달
-                window.parent.postMessage(event.data, '*');
-            }
-        });
-        </script>
-        """
-        
-        # HTML 컴포넌트로 스크립트 삽입 (호환성 있는 방법)
-        try:
-            # 최신 버전용
-            from streamlit.components.v1 import html
-            html(js_event_listener, height=0)
-        except ImportError:
-            # 구버전용
-            st.markdown(js_event_listener, unsafe_allow_html=True)
-        
-        st.session_state.js_listener_set = True
-    
-    # GPS 요청이 있으면 JavaScript 실행
-    if st.session_state.gps_requested:
-        # Android에서 위치 정보를 가져오기 위한 JavaScript
-        location_js = """
-        <script>
-        function getLocation() {
-            if (navigator.geolocation) {
-                navigator.geolocation.getCurrentPosition(
-                    function(position) {
-                        const lat = position.coords.latitude;
-                        const lng = position.coords.longitude;
-                        // Streamlit에 위치 정보 전달
-                        window.parent.postMessage({
-                            type: 'gpsLocation',
-                            lat: lat,
-                            lng: lng
-                        }, '*');
-                    },
-                    function(error) {
-                        window.parent.postMessage({
-                            type: 'gpsError',
-                            error: error.message
-                        }, '*');
-                    }
-                );
-            } else {
-                window.parent.postMessage({
-                    type: 'gpsError',
-                    error: 'Geolocation not supported'
-                }, '*');
-            }
-        }
-        getLocation();
-        </script>
-        """
-        
-        # HTML 컴포넌트로 스크립트 삽입 (호환성 있는 방법)
-        try:
-            # 최신 버전용
-            from streamlit.components.v1 import html
-            html(location_js, height=0)
-        except ImportError:
-            # 구버전용
-            st.markdown(location_js, unsafe_allow_html=True)
-        
-        st.session_state.gps_requested = False
-        st.rerun()
-    
-    # JavaScript로부터 위치 정보 수신
-    if 'gpsLocation' in st.session_state:
-        lat = st.session_state.gpsLocation['lat']
-        lon = st.session_state.gpsLocation['lng']
+        st.session_state.gps_request += 1
+    fix, error = gps_request(st.session_state.gps_request)
+    if error:
+        st.error(f"GPS 오류: {error}")
+    elif fix is not None:
+        lat, lon = fix['lat'], fix['lon']
         st.session_state.current_pos = (lat, lon)
-        st.success(f"위치 갱신 성공! 위도: {lat:.6f}, 경도: {lon:.6f}")
-        st.map([st.session_state.current_pos], zoom=16)
-        del st.session_state.gpsLocation
+        st.success(f"위치 갱신 성공! 위도: {lat:.6f}, 경도: {lon:.6f} (±{fix['accuracy']:.0f} m)")
+        course_map(COURSE.id, [marker(lat, lon, '현재 위치', 'red')], center=(lat, lon), key="gps_map")
     
     # 수동 입력 폼
     st.markdown("**수동 위치 입력 (선택사항)**")
@@ -154,13 +166,77 @@ def main():
             except ValueError:
                 st.error("유효한 숫자를 입력해주세요")
 
-    # 거리 계산 섹션
+# 실시간 위치 섹션 (연속 GPS)
+# 서버 계산: 위치가 올 때마다 이 섹션만 다시 실행되어 칼만 필터로 평활화한 위치와
+#   선택한 홀까지의 거리를 버튼 없이 갱신함
+# 브라우저 계산: 코스 표를 한 번 내려보내고 거리는 브라우저에서 계산.
+#   서버는 홀 변경, 25 m 이상 이동, 샷 저장 이벤트에서만 실행됨
+@st.experimental_fragment
+@timed('ui.live')
+def live_section():
+    mode = st.radio("실시간 위치 (연속 GPS)", ["끄기", "서버 계산", "브라우저 계산"],
+                    horizontal=True, key="live_mode")
+    if mode == "브라우저 계산":
+        client_live_section()
+    elif mode == "서버 계산":
+        server_live_section()
+
+def client_live_section():
+    event = client_distances(COURSE.id, hole=st.session_state.get("hole_number")) or {}
+    kind = event.get('type')
+    if kind == 'position':
+        st.session_state.current_pos = (event['lat'], event['lon'])
+        if st.session_state.get("auto_hole", True):
+            detect_hole()
+    elif kind == 'hole':
+        st.session_state.hole_number = event['hole']
+    elif kind == 'shot':
+        mark_shot(event['lat'], event['lon'], event['hole'], event.get('accuracy'), event.get('timestamp'))
+    elif kind == 'error':
+        st.warning(f"GPS 오류: {event['error']}")
+    shot_caption()
+
+def server_live_section():
+    position_filter, error = gps_stream(active=True)
+    if error:
+        st.warning(f"GPS 오류: {error}")
+    pos = position_filter.position
+    if pos is None:
+        st.info("GPS 위치를 기다리는 중...")
+        return
+    st.session_state.current_pos = pos
+    hole_number = st.session_state.hole_number
+    with timer('distance.live'):
+        distance_m = get_distance_engine(COURSE.id).distance(pos, hole_number)
+    st.metric(f"홀 {hole_number}까지", f"{distance_m:.1f} m", f"{distance_m * 1.09361:.0f} yd",
+              delta_color="off")
+    along = get_centerlines(COURSE.id).along(pos, hole_number)
+    if along is not None:
+        total, bends = along
+        st.caption(f"플레이 라인 {total:.0f} m" + "".join(f" · 꺾임점 {d:.0f} m" for d in bends))
+    st.caption(
+        f"위치 오차 ±{position_filter.accuracy:.1f} m · "
+        f"사용 {position_filter.accepted} / 제외 {position_filter.rejected}"
+    )
+    if st.button("샷 저장", key="mark_shot"):
+        mark_shot(*pos, hole_number, position_filter.accuracy)
+    shot_caption()
+
+# 거리 계산 섹션
+# 홀 변경이나 거리 계산은 이 섹션만 다시 실행하며, 위치는 세션 상태에서 읽음
+@st.experimental_fragment
+@timed('ui.distance')
+def distance_section():
     st.subheader("🏌️ 홀 거리 계산")
+    if st.toggle("현재 위치로 홀 자동 선택", value=True, key="auto_hole"):
+        detect_hole()
     hole_number = st.selectbox(
         "홀 번호 선택 (1-18):",
-        options=list(range(1, 19)),
-        index=0
+        options=list(HOLE_COORDS),
+        key="hole_number"
     )
+    plays_like = get_plays_like(COURSE.id)
+    use_elevation = plays_like is not None and st.toggle("고저차 반영 거리 (plays-like)", key="plays_like")
     
     if st.button("거리 계산", type="primary"):
         if st.session_state.current_pos is None:
@@ -169,1406 +245,141 @@ def main():
             target_pos = HOLE_COORDS[hole_number]
             
             try:
-                distance_m = geodesic(st.session_state.current_pos, target_pos).meters
+                # 전체 홀 거리를 한 번에 계산
+                with timer('distance.all_holes'):
+                    all_distances = get_distance_engine(COURSE.id).as_dict(st.session_state.current_pos)
+                distance_m = all_distances[hole_number]
+                
+                # 그린 앞/가운데/뒤 (그린 외곽선이 있는 홀만)
+                greens = get_green_geometry(COURSE.id)
+                with timer('distance.green'):
+                    front, centre, back = greens.cards(st.session_state.current_pos)
+                k = list(all_distances).index(hole_number)
+                green_line = ""
+                if greens.has_green[k]:
+                    green_line = (
+                        f"\n- 그린 앞 {front[k]:.0f} / 가운데 {centre[k]:.0f} / 뒤 {back[k]:.0f} 미터"
+                    )
+                
+                # 오르막/내리막 보정 거리
+                elevation_line = ""
+                if use_elevation:
+                    adjusted, rise = plays_like.adjust(
+                        st.session_state.current_pos, list(all_distances.values())
+                    )
+                    elevation_line = (
+                        f"\n- 고저차 {rise[k]:+.1f} m → 체감 거리 {adjusted[k]:.0f} 미터"
+                        f" ({adjusted[k] * 1.09361:.0f} 야드)"
+                    )
+                
+                # 도그렉 홀: 페어웨이 중심선을 따라가는 거리
+                dogleg_line = ""
+                along = get_centerlines(COURSE.id).along(st.session_state.current_pos, hole_number)
+                if along is not None:
+                    total, bends = along
+                    dogleg_line = f"\n- 플레이 라인 따라 {total:.0f} 미터"
+                    if bends:
+                        dogleg_line += " (꺾임점까지 " + ", ".join(f"{d:.0f}" for d in bends) + " 미터)"
                 
                 # 거리 시각화
                 st.success(
                     f"**홀 {hole_number}까지 거리:**\n\n"
                     f"- {distance_m:.2f} 미터\n"
                     f"- {distance_m * 1.09361:.2f} 야드"
+                    + dogleg_line + green_line + elevation_line
                 )
                 
+                # 플레이 선 주변 해저드 (레이업/캐리)
+                with timer('distance.hazards'):
+                    hazards = get_hazard_index(COURSE.id).in_play(st.session_state.current_pos, hole_number)
+                if hazards:
+                    st.table({
+                        "해저드": [HAZARD_LABELS[h['kind']] for h in hazards],
+                        "레이업 m": [f"{h['layup']:.0f}" for h in hazards],
+                        "캐리 m": [f"{h['carry']:.0f}" for h in hazards],
+                    })
+                
                 # 거리 진행률 표시
                 max_distance = 300
                 progress = min(1.0, distance_m / max_distance)
                 st.progress(progress)
                 st.caption(f"기준 거리: {max_distance}m (진행률 {progress*100:.0f}%)")
                 
-                # 지도 시각화
-                st.map(
-                    [st.session_state.current_pos, target_pos],
-                    zoom=15,
-                    color=['#FF0000', '#0000FF']  # 빨강: 현재 위치, 파랑: 홀 위치
+                # 전체 홀 거리 표
+                with st.expander("전체 홀 거리"):
+                    card = {
+                        "홀": list(all_distances),
+                        "미터": [f"{d:.1f}" for d in all_distances.values()],
+                        "야드": [f"{d * 1.09361:.1f}" for d in all_distances.values()],
+                    }
+                    if use_elevation:
+                        card["체감 m"] = [f"{d:.0f}" for d in adjusted]
+                    if greens.has_green.any():
+                        for label, values in (("앞", front), ("가운데", centre), ("뒤", back)):
+                            card[label] = [
+                                f"{v:.0f}" if ok else "-" for v, ok in zip(values, greens.has_green)
+                            ]
+                    st.table(card)
+                
+                # 지도 시각화 (코스 기본 지도 + 로컬 타일, 마커만 갱신)
+                course_map(
+                    COURSE.id,
+                    [marker(*st.session_state.current_pos, '현재 위치', 'red'),
+                     marker(*target_pos, f'홀 {hole_number}', 'blue')],
+                    center=st.session_state.current_pos,
+                    key="distance_map"
                 )
             except Exception as e:
                 st.error(f"거리 계산 오류: {str(e)}")
         else:
             st.error("유효하지 않은 홀 번호입니다.")
 
-# 메시지 핸들링 함수
-def handle_js_message(msg):
-    if msg.get('type') == 'gpsLocation':
-        st.session_state.gpsLocation = {
-            'lat': msg['lat'],
-            'lng': msg['lng']
-        }
-        st.rerun()
-    elif msg.get('type') == 'gpsError':
-        st.error(f"GPS 오류: {msg.get('error', '알 수 없는 오류')}")
-
-if __name__ == '__main__':
-    # 세션 상태 초기화
-    if 'messages' not in st.session_state:
-        st.session_state.messages = []
-    
-    # 메시지 처리
-    if hasattr(st, 'session_state') and hasattr(st.session_state, 'messages'):
-        for msg in st.session_state.messages:
-            if 'type' in msg:
-                handle_js_message(msg)
-    
-    # 메시지 처리 후 세션 상태에서 제거
-    st.session_state.messages = []
-    
-    main()
-
-# # Jindalee Golf Course GPS 거리 측정 앱 (Android 호환)
-# import streamlit as st
-# from geopy.distance import geodesic
-# import time
-
-# # 페이지 설정은 항상 최상단에 위치해야 함
-# st.set_page_config(
-#     page_title="Jindalee Golf GPS",
-#     page_icon="⛳",
-#     layout="centered"
-# )
-
-# # Jindalee Golf Course 홀컵 좌표 (위도, 경도)
-# HOLE_COORDS = {
-#     1: (-27.53918, 152.945457),
-#     2: (-27.53658, 152.94362),
-#     3: (-27.536325, 152.946275),
-#     4: (-27.535989, 152.943866),
-#     5: (-27.534852, 152.944261),
-#     6: (-27.532689, 152.945452),
-#     7: (-27.534462, 152.944352),
-#     8: (-27.532874, 152.943498),
-#     9: (-27.535837, 152.943191),
-#     10: (-27.53918, 152.945457),
-#     11: (-27.53658, 152.94362),
-#     12: (-27.536325, 152.946275),
-#     13: (-27.535989, 152.943866),
-#     14: (-27.534852, 152.944261),
-#     15: (-27.532689, 152.945452),
-#     16: (-27.534462, 152.944352),
-#     17: (-27.532874, 152.943498),
-#     18: (-27.535837, 152.943191)
-# }
-
-# def main():
-#     st.markdown("#### :red[홀 거리 측정] by Kevin")
-#     st.markdown("현재 위치에서 홀컵까지의 거리를 계산합니다")
-    
-#     # 세션 상태 초기화
-#     if 'current_pos' not in st.session_state:
-#         st.session_state.current_pos = None
-#     if 'gps_requested' not in st.session_state:
-#         st.session_state.gps_requested = False
-#     if 'js_listener_set' not in st.session_state:
-#         st.session_state.js_listener_set = False
-    
-#     # 위치 서비스 요청 섹션
-#     st.subheader("📍 위치 서비스")
-    
-#     # GPS 요청 버튼
-#     if st.button("현재 위치 가져오기 (GPS 사용)", type="primary"):
-#         st.session_state.gps_requested = True
-    
-#     # JavaScript 이벤트 리스너 (한 번만 실행)
-#     if not st.session_state.js_listener_set:
-#         # 이벤트 리스너 스크립트
-#         js_event_listener = """
-#         <script>
-#         window.addEventListener('message', function(event) {
-#             if (event.data.type === 'gpsLocation' || event.data.type === 'gpsError') {
-#                 // Streamlit에 메시지 전달
-#                 window.parent.postMessage(event.data, '*');
-#             }
-#         });
-#         </script>
-#         """
-        
-#         # HTML 컴포넌트로 스크립트 삽입
-#         st.components.v1.html(js_event_listener, height=0)
-#         st.session_state.js_listener_set = True
-    
-#     # GPS 요청이 있으면 JavaScript 실행
-#     if st.session_state.gps_requested:
-#         # Android에서 위치 정보를 가져오기 위한 JavaScript
-#         location_js = """
-#         <script>
-#         function getLocation() {
-#             if (navigator.geolocation) {
-#                 navigator.geolocation.getCurrentPosition(
-#                     function(position) {
-#                         const lat = position.coords.latitude;
-#                         const lng = position.coords.longitude;
-#                         // Streamlit에 위치 정보 전달
-#                         window.parent.postMessage({
-#                             type: 'gpsLocation',
-#                             lat: lat,
-#                             lng: lng
-#                         }, '*');
-#                     },
-#                     function(error) {
-#                         window.parent.postMessage({
-#                             type: 'gpsError',
-#                             error: error.message
-#                         }, '*');
-#                     }
-#                 );
-#             } else {
-#                 window.parent.postMessage({
-#                     type: 'gpsError',
-#                     error: 'Geolocation not supported'
-#                 }, '*');
-#             }
-#         }
-#         getLocation();
-#         </script>
-#         """
-        
-#         # HTML 컴포넌트로 스크립트 삽입
-#         st.components.v1.html(location_js, height=0)
-#         st.session_state.gps_requested = False
-#         st.rerun()  # st.experimental_rerun() 대신 st.rerun() 사용
-    
-#     # JavaScript로부터 위치 정보 수신
-#     if 'gpsLocation' in st.session_state:
-#         lat = st.session_state.gpsLocation['lat']
-#         lon = st.session_state.gpsLocation['lng']
-#         st.session_state.current_pos = (lat, lon)
-#         st.success(f"위치 갱신 성공! 위도: {lat:.6f}, 경도: {lon:.6f}")
-#         st.map([st.session_state.current_pos], zoom=16)
-#         del st.session_state.gpsLocation
-    
-#     # 수동 입력 폼
-#     st.markdown("**수동 위치 입력 (선택사항)**")
-#     with st.form("manual_location"):
-#         col1, col2 = st.columns(2)
-#         with col1:
-#             manual_lat = st.text_input("위도", value="-27.53918")
-#         with col2:
-#             manual_lon = st.text_input("경도", value="152.945457")
-        
-#         submit_manual = st.form_submit_button("수동 위치 적용")
-        
-#         if submit_manual:
-#             try:
-#                 lat = float(manual_lat)
-#                 lon = float(manual_lon)
-#                 st.session_state.current_pos = (lat, lon)
-#                 st.success(f"수동 위치 적용됨: 위도 {lat:.6f}, 경도 {lon:.6f}")
-#             except ValueError:
-#                 st.error("유효한 숫자를 입력해주세요")
-
-#     # 거리 계산 섹션
-#     st.subheader("🏌️ 홀 거리 계산")
-#     hole_number = st.selectbox(
-#         "홀 번호 선택 (1-18):",
-#         options=list(range(1, 19)),
-#         index=0
-#     )
-    
-#     if st.button("거리 계산", type="primary"):
-#         if st.session_state.current_pos is None:
-#             st.error("먼저 위치 정보를 가져오거나 입력해주세요.")
-#         elif hole_number in HOLE_COORDS:
-#             target_pos = HOLE_COORDS[hole_number]
-            
-#             try:
-#                 distance_m = geodesic(st.session_state.current_pos, target_pos).meters
-                
-#                 # 거리 시각화
-#                 st.success(
-#                     f"**홀 {hole_number}까지 거리:**\n\n"
-#                     f"- {distance_m:.2f} 미터\n"
-#                     f"- {distance_m * 1.09361:.2f} 야드"
-#                 )
-                
-#                 # 거리 진행률 표시
-#                 max_distance = 300
-#                 progress = min(1.0, distance_m / max_distance)
-#                 st.progress(progress)
-#                 st.caption(f"기준 거리: {max_distance}m (진행률 {progress*100:.0f}%)")
-                
-#                 # 지도 시각화
-#                 st.map(
-#                     [st.session_state.current_pos, target_pos],
-#                     zoom=15,
-#                     color=['#FF0000', '#0000FF']  # 빨강: 현재 위치, 파랑: 홀 위치
-#                 )
-#             except Exception as e:
-#                 st.error(f"거리 계산 오류: {str(e)}")
-#         else:
-#             st.error("유효하지 않은 홀 번호입니다.")
-
-# # 메시지 핸들링 함수
-# def handle_js_message(msg):
-#     if msg.get('type') == 'gpsLocation':
-#         st.session_state.gpsLocation = {
-#             'lat': msg['lat'],
-#             'lng': msg['lng']
-#         }
-#         st.rerun()  # st.experimental_rerun() 대신 st.rerun() 사용
-#     elif msg.get('type') == 'gpsError':
-#         st.error(f"GPS 오류: {msg.get('error', '알 수 없는 오류')}")
-
-# if __name__ == '__main__':
-#     # 세션 상태 초기화
-#     if 'messages' not in st.session_state:
-#         st.session_state.messages = []
-    
-#     # 메시지 처리
-#     if hasattr(st, 'session_state') and hasattr(st.session_state, 'messages'):
-#         for msg in st.session_state.messages:
-#             if 'type' in msg:
-#                 handle_js_message(msg)
-    
-#     # 메시지 처리 후 세션 상태에서 제거
-#     st.session_state.messages = []
-    
-#     main()
-
-# # Jindalee Golf Course GPS 거리 측정 앱 (Android 호환)
-# import streamlit as st
-# from geopy.distance import geodesic
-# import time
-
-# # 페이지 설정은 항상 최상단에 위치해야 함
-# st.set_page_config(
-#     page_title="Jindalee Golf GPS",
-#     page_icon="⛳",
-#     layout="centered"
-# )
-
-# # Jindalee Golf Course 홀컵 좌표 (위도, 경도)
-# HOLE_COORDS = {
-#     1: (-27.53918, 152.945457),
-#     2: (-27.53658, 152.94362),
-#     3: (-27.536325, 152.946275),
-#     4: (-27.535989, 152.943866),
-#     5: (-27.534852, 152.944261),
-#     6: (-27.532689, 152.945452),
-#     7: (-27.534462, 152.944352),
-#     8: (-27.532874, 152.943498),
-#     9: (-27.535837, 152.943191),
-#     10: (-27.53918, 152.945457),
-#     11: (-27.53658, 152.94362),
-#     12: (-27.536325, 152.946275),
-#     13: (-27.535989, 152.943866),
-#     14: (-27.534852, 152.944261),
-#     15: (-27.532689, 152.945452),
-#     16: (-27.534462, 152.944352),
-#     17: (-27.532874, 152.943498),
-#     18: (-27.535837, 152.943191)
-# }
-
-# def main():
-#     st.markdown("#### :red[홀 거리 측정] by Kevin")
-#     st.markdown("현재 위치에서 홀컵까지의 거리를 계산합니다")
-    
-#     # 세션 상태 초기화
-#     if 'current_pos' not in st.session_state:
-#         st.session_state.current_pos = None
-#     if 'gps_requested' not in st.session_state:
-#         st.session_state.gps_requested = False
-#     if 'js_listener_set' not in st.session_state:
-#         st.session_state.js_listener_set = False
-    
-#     # 위치 서비스 요청 섹션
-#     st.subheader("📍 위치 서비스")
-    
-#     # GPS 요청 버튼
-#     if st.button("현재 위치 가져오기 (GPS 사용)", type="primary"):
-#         st.session_state.gps_requested = True
-    
-#     # JavaScript 이벤트 리스너 (한 번만 실행)
-#     if not st.session_state.js_listener_set:
-#         # 이벤트 리스너 스크립트
-#         js_event_listener = """
-#         <script>
-#         window.addEventListener('message', function(event) {
-#             if (event.data.type === 'gpsLocation' || event.data.type === 'gpsError') {
-#                 // Streamlit에 메시지 전달
-#                 window.parent.postMessage(event.data, '*');
-#             }
-#         });
-#         </script>
-#         """
-        
-#         # HTML 컴포넌트로 스크립트 삽입
-#         st.components.v1.html(js_event_listener, height=0)
-#         st.session_state.js_listener_set = True
-    
-#     # GPS 요청이 있으면 JavaScript 실행
-#     if st.session_state.gps_requested:
-#         # Android에서 위치 정보를 가져오기 위한 JavaScript
-#         location_js = """
-#         <script>
-#         function getLocation() {
-#             if (navigator.geolocation) {
-#                 navigator.geolocation.getCurrentPosition(
-#                     function(position) {
-#                         const lat = position.coords.latitude;
-#                         const lng = position.coords.longitude;
-#                         // Streamlit에 위치 정보 전달
-#                         window.parent.postMessage({
-#                             type: 'gpsLocation',
-#                             lat: lat,
-#                             lng: lng
-#                         }, '*');
-#                     },
-#                     function(error) {
-#                         window.parent.postMessage({
-#                             type: 'gpsError',
-#                             error: error.message
-#                         }, '*');
-#                     }
-#                 );
-#             } else {
-#                 window.parent.postMessage({
-#                     type: 'gpsError',
-#                     error: 'Geolocation not supported'
-#                 }, '*');
-#             }
-#         }
-#         getLocation();
-#         </script>
-#         """
-        
-#         # HTML 컴포넌트로 스크립트 삽입
-#         st.components.v1.html(location_js, height=0)
-#         st.session_state.gps_requested = False
-#         st.experimental_rerun()
-    
-#     # JavaScript로부터 위치 정보 수신
-#     if 'gpsLocation' in st.session_state:
-#         lat = st.session_state.gpsLocation['lat']
-#         lon = st.session_state.gpsLocation['lng']
-#         st.session_state.current_pos = (lat, lon)
-#         st.success(f"위치 갱신 성공! 위도: {lat:.6f}, 경도: {lon:.6f}")
-#         st.map([st.session_state.current_pos], zoom=16)
-#         del st.session_state.gpsLocation
-    
-#     # 수동 입력 폼
-#     st.markdown("**수동 위치 입력 (선택사항)**")
-#     with st.form("manual_location"):
-#         col1, col2 = st.columns(2)
-#         with col1:
-#             manual_lat = st.text_input("위도", value="-27.53918")
-#         with col2:
-#             manual_lon = st.text_input("경도", value="152.945457")
-        
-#         submit_manual = st.form_submit_button("수동 위치 적용")
-        
-#         if submit_manual:
-#             try:
-#                 lat = float(manual_lat)
-#                 lon = float(manual_lon)
-#                 st.session_state.current_pos = (lat, lon)
-#                 st.success(f"수동 위치 적용됨: 위도 {lat:.6f}, 경도 {lon:.6f}")
-#             except ValueError:
-#                 st.error("유효한 숫자를 입력해주세요")
-
-#     # 거리 계산 섹션
-#     st.subheader("🏌️ 홀 거리 계산")
-#     hole_number = st.selectbox(
-#         "홀 번호 선택 (1-18):",
-#         options=list(range(1, 19)),
-#         index=0
-#     )
-    
-#     if st.button("거리 계산", type="primary"):
-#         if st.session_state.current_pos is None:
-#             st.error("먼저 위치 정보를 가져오거나 입력해주세요.")
-#         elif hole_number in HOLE_COORDS:
-#             target_pos = HOLE_COORDS[hole_number]
-            
-#             try:
-#                 distance_m = geodesic(st.session_state.current_pos, target_pos).meters
-                
-#                 # 거리 시각화
-#                 st.success(
-#                     f"**홀 {hole_number}까지 거리:**\n\n"
-#                     f"- {distance_m:.2f} 미터\n"
-#                     f"- {distance_m * 1.09361:.2f} 야드"
-#                 )
-                
-#                 # 거리 진행률 표시
-#                 max_distance = 300
-#                 progress = min(1.0, distance_m / max_distance)
-#                 st.progress(progress)
-#                 st.caption(f"기준 거리: {max_distance}m (진행률 {progress*100:.0f}%)")
-                
-#                 # 지도 시각화
-#                 st.map(
-#                     [st.session_state.current_pos, target_pos],
-#                     zoom=15,
-#                     color=['#FF0000', '#0000FF']  # 빨강: 현재 위치, 파랑: 홀 위치
-#                 )
-#             except Exception as e:
-#                 st.error(f"거리 계산 오류: {str(e)}")
-#         else:
-#             st.error("유효하지 않은 홀 번호입니다.")
-
-# # 메시지 핸들링 함수
-# def handle_js_message(msg):
-#     if msg.get('type') == 'gpsLocation':
-#         st.session_state.gpsLocation = {
-#             'lat': msg['lat'],
-#             'lng': msg['lng']
-#         }
-#         st.experimental_rerun()
-#     elif msg.get('type') == 'gpsError':
-#         st.error(f"GPS 오류: {msg.get('error', '알 수 없는 오류')}")
-
-# if __name__ == '__main__':
-#     # 세션 상태 초기화
-#     if 'messages' not in st.session_state:
-#         st.session_state.messages = []
-    
-#     # 메시지 처리
-#     if hasattr(st, 'session_state') and hasattr(st.session_state, 'messages'):
-#         for msg in st.session_state.messages:
-#             if 'type' in msg:
-#                 handle_js_message(msg)
-    
-#     # 메시지 처리 후 세션 상태에서 제거
-#     st.session_state.messages = []
-    
-#     main()
-
-# # Jindalee Golf Course GPS 거리 측정 앱 (Android 호환)
-# import streamlit as st
-# from geopy.distance import geodesic
-# import time
-
-# # 페이지 설정은 항상 최상단에 위치해야 함
-# st.set_page_config(
-#     page_title="Jindalee Golf GPS",
-#     page_icon="⛳",
-#     layout="centered"
-# )
-
-# # Jindalee Golf Course 홀컵 좌표 (위도, 경도)
-# HOLE_COORDS = {
-#     1: (-27.53918, 152.945457),
-#     2: (-27.53658, 152.94362),
-#     3: (-27.536325, 152.946275),
-#     4: (-27.535989, 152.943866),
-#     5: (-27.534852, 152.944261),
-#     6: (-27.532689, 152.945452),
-#     7: (-27.534462, 152.944352),
-#     8: (-27.532874, 152.943498),
-#     9: (-27.535837, 152.943191),
-#     10: (-27.53918, 152.945457),
-#     11: (-27.53658, 152.94362),
-#     12: (-27.536325, 152.946275),
-#     13: (-27.535989, 152.943866),
-#     14: (-27.534852, 152.944261),
-#     15: (-27.532689, 152.945452),
-#     16: (-27.534462, 152.944352),
-#     17: (-27.532874, 152.943498),
-#     18: (-27.535837, 152.943191)
-# }
-
-# def main():
-#     st.markdown("#### :red[홀 거리 측정] by Kevin")
-#     st.markdown("현재 위치에서 홀컵까지의 거리를 계산합니다")
-    
-#     # 세션 상태 초기화
-#     if 'current_pos' not in st.session_state:
-#         st.session_state.current_pos = None
-#     if 'gps_requested' not in st.session_state:
-#         st.session_state.gps_requested = False
-    
-#     # 위치 서비스 요청 섹션
-#     st.subheader("📍 위치 서비스")
-    
-#     # GPS 요청 버튼
-#     if st.button("현재 위치 가져오기 (GPS 사용)", type="primary"):
-#         st.session_state.gps_requested = True
-    
-#     # GPS 요청이 있으면 JavaScript 실행
-#     if st.session_state.gps_requested:
-#         # Android에서 위치 정보를 가져오기 위한 JavaScript
-#         location_js = """
-#         <script>
-#         function getLocation() {
-#             if (navigator.geolocation) {
-#                 navigator.geolocation.getCurrentPosition(
-#                     function(position) {
-#                         const lat = position.coords.latitude;
-#                         const lng = position.coords.longitude;
-#                         // Streamlit에 위치 정보 전달
-#                         window.parent.postMessage({
-#                             type: 'gpsLocation',
-#                             lat: lat,
-#                             lng: lng
-#                         }, '*');
-#                     },
-#                     function(error) {
-#                         window.parent.postMessage({
-#                             type: 'gpsError',
-#                             error: error.message
-#                         }, '*');
-#                     }
-#                 );
-#             } else {
-#                 window.parent.postMessage({
-#                     type: 'gpsError',
-#                     error: 'Geolocation not supported'
-#                 }, '*');
-#             }
-#         }
-#         getLocation();
-#         </script>
-#         """
-#         st.components.v1.html(location_js, height=0)
-#         st.session_state.gps_requested = False
-    
-#     # JavaScript 이벤트 리스너 (한 번만 실행)
-#     if 'js_listener_set' not in st.session_state:
-#         js_event_listener = """
-#         <script>
-#         window.addEventListener('message', function(event) {
-#             if (event.data.type === 'gpsLocation' || event.data.type === 'gpsError') {
-#                 // Streamlit에 메시지 전달
-#                 window.parent.postMessage(event.data, '*');
-#             }
-#         });
-#         </script>
-#         """
-#         st.components.v1.html(js_event_listener, height=0)
-#         st.session_state.js_listener_set = True
-    
-#     # JavaScript로부터 위치 정보 수신
-#     if 'gpsLocation' in st.session_state:
-#         lat = st.session_state.gpsLocation['lat']
-#         lon = st.session_state.gpsLocation['lng']
-#         st.session_state.current_pos = (lat, lon)
-#         st.success(f"위치 갱신 성공! 위도: {lat:.6f}, 경도: {lon:.6f}")
-#         st.map([st.session_state.current_pos], zoom=16)
-#         del st.session_state.gpsLocation
-    
-#     # 수동 입력 폼
-#     st.markdown("**수동 위치 입력 (선택사항)**")
-#     with st.form("manual_location"):
-#         col1, col2 = st.columns(2)
-#         with col1:
-#             manual_lat = st.text_input("위도", value="-27.53918")
-#         with col2:
-#             manual_lon = st.text_input("경도", value="152.945457")
-        
-#         submit_manual = st.form_submit_button("수동 위치 적용")
-        
-#         if submit_manual:
-#             try:
-#                 lat = float(manual_lat)
-#                 lon = float(manual_lon)
-#                 st.session_state.current_pos = (lat, lon)
-#                 st.success(f"수동 위치 적용됨: 위도 {lat:.6f}, 경도 {lon:.6f}")
-#             except ValueError:
-#                 st.error("유효한 숫자를 입력해주세요")
-
-#     # 거리 계산 섹션
-#     st.subheader("🏌️ 홀 거리 계산")
-#     hole_number = st.selectbox(
-#         "홀 번호 선택 (1-18):",
-#         options=list(range(1, 19)),
-#         index=0
-#     )
-    
-#     if st.button("거리 계산", type="primary"):
-#         if st.session_state.current_pos is None:
-#             st.error("먼저 위치 정보를 가져오거나 입력해주세요.")
-#         elif hole_number in HOLE_COORDS:
-#             target_pos = HOLE_COORDS[hole_number]
-            
-#             try:
-#                 distance_m = geodesic(st.session_state.current_pos, target_pos).meters
-                
-#                 # 거리 시각화
-#                 st.success(
-#                     f"**홀 {hole_number}까지 거리:**\n\n"
-#                     f"- {distance_m:.2f} 미터\n"
-#                     f"- {distance_m * 1.09361:.2f} 야드"
-#                 )
-                
-#                 # 거리 진행률 표시
-#                 max_distance = 300
-#                 progress = min(1.0, distance_m / max_distance)
-#                 st.progress(progress)
-#                 st.caption(f"기준 거리: {max_distance}m (진행률 {progress*100:.0f}%)")
-                
-#                 # 지도 시각화
-#                 st.map(
-#                     [st.session_state.current_pos, target_pos],
-#                     zoom=15,
-#                     color=['#FF0000', '#0000FF']  # 빨강: 현재 위치, 파랑: 홀 위치
-#                 )
-#             except Exception as e:
-#                 st.error(f"거리 계산 오류: {str(e)}")
-#         else:
-#             st.error("유효하지 않은 홀 번호입니다.")
-
-# # 메시지 핸들링 함수
-# def handle_js_message(msg):
-#     if msg.get('type') == 'gpsLocation':
-#         st.session_state.gpsLocation = {
-#             'lat': msg['lat'],
-#             'lng': msg['lng']
-#         }
-#     elif msg.get('type') == 'gpsError':
-#         st.error(f"GPS 오류: {msg.get('error', '알 수 없는 오류')}")
-
-# if __name__ == '__main__':
-#     # 세션 상태 초기화
-#     if 'messages' not in st.session_state:
-#         st.session_state.messages = []
-    
-#     # 메시지 처리
-#     if hasattr(st, 'session_state') and hasattr(st.session_state, 'messages'):
-#         for msg in st.session_state.messages:
-#             if 'type' in msg:
-#                 handle_js_message(msg)
-    
-#     # 메시지 처리 후 세션 상태에서 제거
-#     st.session_state.messages = []
-    
-#     main()
-
-# # Jindalee Golf Course GPS 거리 측정 앱 (Android 호환)
-# import streamlit as st
-# from geopy.distance import geodesic
-# import time
-
-# # Jindalee Golf Course 홀컵 좌표 (위도, 경도)
-# HOLE_COORDS = {
-#     1: (-27.53918, 152.945457),
-#     2: (-27.53658, 152.94362),
-#     3: (-27.536325, 152.946275),
-#     4: (-27.535989, 152.943866),
-#     5: (-27.534852, 152.944261),
-#     6: (-27.532689, 152.945452),
-#     7: (-27.534462, 152.944352),
-#     8: (-27.532874, 152.943498),
-#     9: (-27.535837, 152.943191),
-#     10: (-27.53918, 152.945457),
-#     11: (-27.53658, 152.94362),
-#     12: (-27.536325, 152.946275),
-#     13: (-27.535989, 152.943866),
-#     14: (-27.534852, 152.944261),
-#     15: (-27.532689, 152.945452),
-#     16: (-27.534462, 152.944352),
-#     17: (-27.532874, 152.943498),
-#     18: (-27.535837, 152.943191)
-# }
-
-# def main():
-#     st.set_page_config(
-#         page_title="Jindalee Golf GPS",
-#         page_icon="⛳",
-#         layout="centered"
-#     )
-    
-#     st.markdown("#### :red[홀 거리 측정] by Kevin")
-#     st.markdown("현재 위치에서 홀컵까지의 거리를 계산합니다")
-    
-#     # 세션 상태 초기화
-#     if 'current_pos' not in st.session_state:
-#         st.session_state.current_pos = None
-#     if 'gps_requested' not in st.session_state:
-#         st.session_state.gps_requested = False
-    
-#     # 위치 서비스 요청 섹션
-#     st.subheader("📍 위치 서비스")
-    
-#     # GPS 요청 버튼
-#     if st.button("현재 위치 가져오기 (GPS 사용)", type="primary"):
-#         st.session_state.gps_requested = True
-#         st.rerun()
-    
-#     # GPS 요청이 있으면 JavaScript 실행
-#     if st.session_state.gps_requested:
-#         # Android에서 위치 정보를 가져오기 위한 JavaScript
-#         location_js = """
-#         <script>
-#         function getLocation() {
-#             if (navigator.geolocation) {
-#                 navigator.geolocation.getCurrentPosition(
-#                     function(position) {
-#                         const lat = position.coords.latitude;
-#                         const lng = position.coords.longitude;
-#                         // Streamlit에 위치 정보 전달
-#                         window.parent.postMessage({
-#                             type: 'gpsLocation',
-#                             lat: lat,
-#                             lng: lng
-#                         }, '*');
-#                     },
-#                     function(error) {
-#                         window.parent.postMessage({
-#                             type: 'gpsError',
-#                             error: error.message
-#                         }, '*');
-#                     }
-#                 );
-#             } else {
-#                 window.parent.postMessage({
-#                     type: 'gpsError',
-#                     error: 'Geolocation not supported'
-#                 }, '*');
-#             }
-#         }
-#         getLocation();
-#         </script>
-#         """
-#         st.components.v1.html(location_js, height=0)
-#         st.session_state.gps_requested = False
-    
-#     # JavaScript로부터 위치 정보 수신
-#     if 'gpsLocation' in st.session_state:
-#         lat = st.session_state.gpsLocation['lat']
-#         lon = st.session_state.gpsLocation['lng']
-#         st.session_state.current_pos = (lat, lon)
-#         st.success(f"위치 갱신 성공! 위도: {lat:.6f}, 경도: {lon:.6f}")
-#         st.map([st.session_state.current_pos], zoom=16)
-#         del st.session_state.gpsLocation
-    
-#     # 수동 입력 폼
-#     st.markdown("**수동 위치 입력 (선택사항)**")
-#     with st.form("manual_location"):
-#         col1, col2 = st.columns(2)
-#         with col1:
-#             manual_lat = st.text_input("위도", value="-27.53918")
-#         with col2:
-#             manual_lon = st.text_input("경도", value="152.945457")
-        
-#         submit_manual = st.form_submit_button("수동 위치 적용")
-        
-#         if submit_manual:
-#             try:
-#                 lat = float(manual_lat)
-#                 lon = float(manual_lon)
-#                 st.session_state.current_pos = (lat, lon)
-#                 st.success(f"수동 위치 적용됨: 위도 {lat:.6f}, 경도 {lon:.6f}")
-#             except ValueError:
-#                 st.error("유효한 숫자를 입력해주세요")
-
-#     # 거리 계산 섹션
-#     st.subheader("🏌️ 홀 거리 계산")
-#     hole_number = st.selectbox(
-#         "홀 번호 선택 (1-18):",
-#         options=list(range(1, 19)),
-#         index=0
-#     )
-    
-#     if st.button("거리 계산", type="primary"):
-#         if st.session_state.current_pos is None:
-#             st.error("먼저 위치 정보를 가져오거나 입력해주세요.")
-#         elif hole_number in HOLE_COORDS:
-#             target_pos = HOLE_COORDS[hole_number]
-            
-#             try:
-#                 distance_m = geodesic(st.session_state.current_pos, target_pos).meters
-                
-#                 # 거리 시각화
-#                 st.success(
-#                     f"**홀 {hole_number}까지 거리:**\n\n"
-#                     f"- {distance_m:.2f} 미터\n"
-#                     f"- {distance_m * 1.09361:.2f} 야드"
-#                 )
-                
-#                 # 거리 진행률 표시
-#                 max_distance = 300
-#                 progress = min(1.0, distance_m / max_distance)
-#                 st.progress(progress)
-#                 st.caption(f"기준 거리: {max_distance}m (진행률 {progress*100:.0f}%)")
-                
-#                 # 지도 시각화
-#                 st.map(
-#                     [st.session_state.current_pos, target_pos],
-#                     zoom=15,
-#                     color=['#FF0000', '#0000FF']  # 빨강: 현재 위치, 파랑: 홀 위치
-#                 )
-#             except Exception as e:
-#                 st.error(f"거리 계산 오류: {str(e)}")
-#         else:
-#             st.error("유효하지 않은 홀 번호입니다.")
-
-# # JavaScript 메시지 처리
-# def handle_js_message(msg):
-#     if msg.get('type') == 'gpsLocation':
-#         st.session_state.gpsLocation = {
-#             'lat': msg['lat'],
-#             'lng': msg['lng']
-#         }
-#         st.rerun()
-#     elif msg.get('type') == 'gpsError':
-#         st.error(f"GPS 오류: {msg.get('error', '알 수 없는 오류')}")
-
-# # JavaScript 이벤트 리스너 등록
-# js_event_listener = """
-# <script>
-# window.addEventListener('message', function(event) {
-#     if (event.data.type === 'gpsLocation' || event.data.type === 'gpsError') {
-#         // Streamlit에 메시지 전달
-#         window.parent.postMessage(event.data, '*');
-#     }
-# });
-# </script>
-# """
-
-# if __name__ == '__main__':
-#     # JavaScript 이벤트 리스너 추가
-#     st.components.v1.html(js_event_listener, height=0)
-    
-#     # 메시지 핸들러 등록
-#     if 'messages' not in st.session_state:
-#         st.session_state.messages = []
-    
-#     # JavaScript 메시지 처리
-#     messages = st.session_state.messages
-#     for msg in messages:
-#         if 'type' in msg:
-#             handle_js_message(msg)
-    
-#     # 메시지 처리 후 세션 상태에서 제거
-#     st.session_state.messages = []
-    
-#     main()
-
-# Jindalee Golf Course GPS 거리 측정 앱 (Android 호환)
-# import streamlit as st
-# from geopy.distance import geodesic
-# import time
-
-# # Jindalee Golf Course 홀컵 좌표 (위도, 경도)
-# HOLE_COORDS = {
-#     1: (-27.53918, 152.945457),
-#     2: (-27.53658, 152.94362),
-#     3: (-27.536325, 152.946275),
-#     4: (-27.535989, 152.943866),
-#     5: (-27.534852, 152.944261),
-#     6: (-27.532689, 152.945452),
-#     7: (-27.534462, 152.944352),
-#     8: (-27.532874, 152.943498),
-#     9: (-27.535837, 152.943191),
-#     10: (-27.53918, 152.945457),
-#     11: (-27.53658, 152.94362),
-#     12: (-27.536325, 152.946275),
-#     13: (-27.535989, 152.943866),
-#     14: (-27.534852, 152.944261),
-#     15: (-27.532689, 152.945452),
-#     16: (-27.534462, 152.944352),
-#     17: (-27.532874, 152.943498),
-#     18: (-27.535837, 152.943191)
-# }
+# 라운드 통계 섹션 (홀별 평균 드라이브, 그린 적중률)
+# 라운드를 저장할 때 쌓아 둔 홀 결과/누적 합계만 읽음
+@st.experimental_fragment
+@timed('ui.stats')
+def stats_section():
+    with st.expander("📊 라운드 통계"):
+        history = get_round_history()
+        rounds = history.round_count(COURSE.id)
+        if not rounds:
+            st.caption("저장된 라운드가 없습니다.")
+            return
+        last = st.select_slider("최근 라운드", options=["전체", 5, 10, 20, 50], value=20, key="stats_last")
+        stats = history.hole_stats(COURSE.id, None if last == "전체" else last)
+        st.caption(f"저장된 라운드 {rounds}개")
+        st.table({
+            "홀": list(stats),
+            "평균 드라이브 m": [f"{s['drive']:.0f}" if s['drive'] is not None else "-" for s in stats.values()],
+            "GIR": [f"{s['gir'] * 100:.0f}%" if s['gir'] is not None else "-" for s in stats.values()],
+        })
 
-# def main():
-#     st.set_page_config(
-#         page_title="Jindalee Golf GPS",
-#         page_icon="⛳",
-#         layout="centered"
-#     )
-    
-#     st.markdown("#### :red[홀 거리 측정] by Kevin")
-#     st.markdown("현재 위치에서 홀컵까지의 거리를 계산합니다")
-    
-#     # 세션 상태 초기화
-#     if 'current_pos' not in st.session_state:
-#         st.session_state.current_pos = None
-    
-#     # 위치 서비스 요청 섹션
-#     st.subheader("📍 위치 서비스")
-    
-#     # 위치 요청 버튼 - Android에서 위치 접근 권한 요청
-#     if st.button("현재 위치 가져오기 (GPS 사용)", type="primary"):
-#         with st.spinner("위치 정보 수신 중..."):
-#             # Android에서 위치 정보를 가져오기 위한 JavaScript 호출
-#             location_js = """
-#             <script>
-#             if (navigator.geolocation) {
-#                 navigator.geolocation.getCurrentPosition(
-#                     function(position) {
-#                         const lat = position.coords.latitude;
-#                         const lng = position.coords.longitude;
-#                         window.parent.postMessage({
-#                             type: 'locationUpdate',
-#                             lat: lat,
-#                             lng: lng
-#                         }, '*');
-#                     },
-#                     function(error) {
-#                         window.parent.postMessage({
-#                             type: 'locationError',
-#                             error: error.message
-#                         }, '*');
-#                     }
-#                 );
-#             } else {
-#                 window.parent.postMessage({
-#                     type: 'locationError',
-#                     error: 'Geolocation not supported'
-#                 }, '*');
-#             }
-#             </script>
-#             """
-            
-#             # JavaScript 실행
-#             st.components.v1.html(location_js, height=0)
-            
-#             # 위치 정보 수신 대기
-#             time.sleep(2)
-    
-#     # JavaScript로부터 위치 정보 수신
-#     location_update = st.query_params().get("locationUpdate", None)
-#     location_error = st.query_params().get("locationError", None)
-    
-#     if location_update:
-#         try:
-#             lat = float(location_update[0].split(',')[0])
-#             lon = float(location_update[0].split(',')[1])
-#             st.session_state.current_pos = (lat, lon)
-#             st.success(f"위치 갱신 성공! 위도: {lat:.6f}, 경도: {lon:.6f}")
-#             st.map([st.session_state.current_pos], zoom=16)
-#         except:
-#             st.warning("위치 정보를 처리하는 데 실패했습니다.")
-    
-#     if location_error:
-#         st.error(f"위치 정보 오류: {location_error[0]}")
-    
-#     # 수동 입력 폼
-#     st.markdown("**수동 위치 입력 (선택사항)**")
-#     with st.form("manual_location"):
-#         col1, col2 = st.columns(2)
-#         with col1:
-#             manual_lat = st.text_input("위도", value="-27.53918")
-#         with col2:
-#             manual_lon = st.text_input("경도", value="152.945457")
-        
-#         submit_manual = st.form_submit_button("수동 위치 적용")
-        
-#         if submit_manual:
-#             try:
-#                 lat = float(manual_lat)
-#                 lon = float(manual_lon)
-#                 st.session_state.current_pos = (lat, lon)
-#                 st.success(f"수동 위치 적용됨: 위도 {lat:.6f}, 경도 {lon:.6f}")
-#             except ValueError:
-#                 st.error("유효한 숫자를 입력해주세요")
-
-#     # 거리 계산 섹션
-#     st.subheader("🏌️ 홀 거리 계산")
-#     hole_number = st.selectbox(
-#         "홀 번호 선택 (1-18):",
-#         options=list(range(1, 19)),
-#         index=0
-#     )
-    
-#     if st.button("거리 계산", type="primary"):
-#         if st.session_state.current_pos is None:
-#             st.error("먼저 위치 정보를 가져오거나 입력해주세요.")
-#         elif hole_number in HOLE_COORDS:
-#             target_pos = HOLE_COORDS[hole_number]
-            
-#             try:
-#                 distance_m = geodesic(st.session_state.current_pos, target_pos).meters
-                
-#                 # 거리 시각화
-#                 st.success(
-#                     f"**홀 {hole_number}까지 거리:**\n\n"
-#                     f"- {distance_m:.2f} 미터\n"
-#                     f"- {distance_m * 1.09361:.2f} 야드"
-#                 )
-                
-#                 # 거리 진행률 표시
-#                 max_distance = 300
-#                 progress = min(1.0, distance_m / max_distance)
-#                 st.progress(progress)
-#                 st.caption(f"기준 거리: {max_distance}m (진행률 {progress*100:.0f}%)")
-                
-#                 # 지도 시각화
-#                 st.map(
-#                     [st.session_state.current_pos, target_pos],
-#                     zoom=15,
-#                     color=['#FF0000', '#0000FF']  # 빨강: 현재 위치, 파랑: 홀 위치
-#                 )
-#             except Exception as e:
-#                 st.error(f"거리 계산 오류: {str(e)}")
-#         else:
-#             st.error("유효하지 않은 홀 번호입니다.")
-
-# if __name__ == '__main__':
-#     main()
-
-# # Jindalee Golf Course GPS 거리 측정 앱 (Android 호환)
-# import streamlit as st
-# from geopy.distance import geodesic
-# import time
-
-# # Jindalee Golf Course 홀컵 좌표 (위도, 경도)
-# HOLE_COORDS = {
-#     1: (-27.53918, 152.945457),
-#     2: (-27.53658, 152.94362),
-#     3: (-27.536325, 152.946275),
-#     4: (-27.535989, 152.943866),
-#     5: (-27.534852, 152.944261),
-#     6: (-27.532689, 152.945452),
-#     7: (-27.534462, 152.944352),
-#     8: (-27.532874, 152.943498),
-#     9: (-27.535837, 152.943191),
-#     10: (-27.53918, 152.945457),
-#     11: (-27.53658, 152.94362),
-#     12: (-27.536325, 152.946275),
-#     13: (-27.535989, 152.943866),
-#     14: (-27.534852, 152.944261),
-#     15: (-27.532689, 152.945452),
-#     16: (-27.534462, 152.944352),
-#     17: (-27.532874, 152.943498),
-#     18: (-27.535837, 152.943191)
-# }
-
-# def get_geolocation():
-#     """Android에서 안정적인 위치 정보 가져오기"""
-#     try:
-#         # Streamlit의 내장 위치 기능 사용
-#         return st.gps()
-#     except Exception as e:
-#         st.warning(f"위치 서비스 오류: {str(e)}")
-#         return None
-
-# def main():
-#     st.markdown("#### :red[홀 거리 측정] by Kevin")
-#     st.markdown("현재 위치에서 홀컵까지의 거리를 계산합니다")
-    
-#     # 세션 상태 초기화
-#     if 'current_pos' not in st.session_state:
-#         st.session_state.current_pos = None
-#         st.session_state.location_retry = 0
-    
-#     # 위치 서비스 요청 섹션
-#     st.subheader("📍 위치 서비스")
-    
-#     # 위치 요청 버튼
-#     if st.button("현재 위치 가져오기", type="primary"):
-#         with st.spinner("위치 정보 수신 중..."):
-#             location = None
-#             retry_count = 0
-            
-#             # 최대 3회 재시도
-#             while not location and retry_count < 3:
-#                 location = get_geolocation()
-#                 retry_count += 1
-#                 if not location:
-#                     time.sleep(1)  # 재시도 전 대기
-            
-#             if location:
-#                 lat = location.get("latitude")
-#                 lon = location.get("longitude")
-                
-#                 if lat is not None and lon is not None:
-#                     st.session_state.current_pos = (lat, lon)
-#                     st.success(f"위치 갱신 성공! 위도: {lat:.6f}, 경도: {lon:.6f}")
-#                     st.map([st.session_state.current_pos], zoom=16)
-#                 else:
-#                     st.warning("위치 정보를 가져오지 못했습니다. 위치 서비스가 활성화되었는지 확인하세요.")
-#             else:
-#                 st.warning("위치 정보를 가져오지 못했습니다. 수동으로 입력해주세요.")
-    
-#     # 수동 입력 폼
-#     st.markdown("**수동 위치 입력 (선택사항)**")
-#     with st.form("manual_location"):
-#         col1, col2 = st.columns(2)
-#         with col1:
-#             manual_lat = st.text_input("위도", value="-27.53918")
-#         with col2:
-#             manual_lon = st.text_input("경도", value="152.945457")
-        
-#         submit_manual = st.form_submit_button("수동 위치 적용")
-        
-#         if submit_manual:
-#             try:
-#                 lat = float(manual_lat)
-#                 lon = float(manual_lon)
-#                 st.session_state.current_pos = (lat, lon)
-#                 st.success(f"수동 위치 적용됨: 위도 {lat:.6f}, 경도 {lon:.6f}")
-#             except ValueError:
-#                 st.error("유효한 숫자를 입력해주세요")
-
-#     # 거리 계산 섹션
-#     st.subheader("🏌️ 홀 거리 계산")
-#     hole_number = st.selectbox(
-#         "홀 번호 선택 (1-18):",
-#         options=list(range(1, 19)),
-#         index=0
-#     )
-    
-#     if st.button("거리 계산", type="primary"):
-#         if st.session_state.current_pos is None:
-#             st.error("먼저 위치 정보를 가져오거나 입력해주세요.")
-#         elif hole_number in HOLE_COORDS:
-#             target_pos = HOLE_COORDS[hole_number]
-            
-#             try:
-#                 distance_m = geodesic(st.session_state.current_pos, target_pos).meters
-                
-#                 # 거리 시각화
-#                 st.success(
-#                     f"**홀 {hole_number}까지 거리:**\n\n"
-#                     f"- {distance_m:.2f} 미터\n"
-#                     f"- {distance_m * 1.09361:.2f} 야드"
-#                 )
-                
-#                 # 거리 진행률 표시
-#                 max_distance = 300
-#                 progress = min(1.0, distance_m / max_distance)
-#                 st.progress(progress)
-#                 st.caption(f"기준 거리: {max_distance}m (진행률 {progress*100:.0f}%)")
-                
-#                 # 지도 시각화
-#                 st.map(
-#                     [st.session_state.current_pos, target_pos],
-#                     zoom=15,
-#                     color=['#FF0000', '#0000FF']  # 빨강: 현재 위치, 파랑: 홀 위치
-#                 )
-#             except Exception as e:
-#                 st.error(f"거리 계산 오류: {str(e)}")
-#         else:
-#             st.error("유효하지 않은 홀 번호입니다.")
-
-# if __name__ == '__main__':
-#     st.set_page_config(
-#         page_title="Jindalee Golf GPS",
-#         page_icon="⛳",
-#         layout="centered"
-#     )
-#     main()
-
-
-# # Jindalee Golf Course GPS 거리 측정 앱 (모바일 GPS 지원)
-# #
-
-# import streamlit as st
-# from geopy.distance import geodesic
-# from streamlit_geolocation import streamlit_geolocation
-
-# # Jindalee Golf Course 홀컵 좌표 (위도, 경도)
-# HOLE_COORDS = {
-#     1: (-27.53918, 152.945457),
-#     2: (-27.53658, 152.94362),
-#     3: (-27.536325, 152.946275),
-#     4: (-27.535989, 152.943866),
-#     5: (-27.534852, 152.944261),
-#     6: (-27.532689, 152.945452),
-#     7: (-27.534462, 152.944352),
-#     8: (-27.532874, 152.943498),
-#     9: (-27.535837, 152.943191),
-#     10: (-27.53918, 152.945457),
-#     11: (-27.53658, 152.94362),
-#     12: (-27.536325, 152.946275),
-#     13: (-27.535989, 152.943866),
-#     14: (-27.534852, 152.944261),
-#     15: (-27.532689, 152.945452),
-#     16: (-27.534462, 152.944352),
-#     17: (-27.532874, 152.943498),
-#     18: (-27.535837, 152.943191)
-# }
-
-# def main():
-#     st.markdown("#### :red[홀 거리 측정] by Kevin")
-#     st.markdown("현재 위치에서 홀컵까지의 거리를 계산합니다")
-    
-#     # 세션 상태 초기화
-#     if 'current_pos' not in st.session_state:
-#         st.session_state.current_pos = None
-    
-#     # 위치 서비스 요청 섹션
-#     st.subheader("📍 위치 서비스")
-#     st.markdown("**1. 현재 위치 가져오기**")
-    
-#     # 위치 요청 버튼
-#     location = streamlit_geolocation()
-    
-#     # 위치 정보 처리 - None 값 체크 추가
-#     if location and 'latitude' in location and 'longitude' in location:
-#         lat = location['latitude']
-#         lon = location['longitude']
-        
-#         # 위치 정보가 유효한 경우에만 처리
-#         if lat is not None and lon is not None:
-#             st.session_state.current_pos = (lat, lon)
-#             st.success(f"위치 갱신 성공! 위도: {lat:.6f}, 경도: {lon:.6f}")
-#             st.map([st.session_state.current_pos], zoom=16)
-#         else:
-#             st.warning("위치 정보를 가져오지 못했습니다. 위치 서비스가 활성화되었는지 확인하세요.")
-#     else:
-#         st.warning("위치 정보를 가져오지 못했습니다. 수동으로 입력하세요.")
-    
-#     # 수동 입력 폼
-#     st.markdown("**2. 수동 위치 입력 (선택사항)**")
-#     with st.form("manual_location"):
-#         manual_lat = st.text_input("위도", value="-27.53918")
-#         manual_lon = st.text_input("경도", value="152.945457")
-#         submit_manual = st.form_submit_button("수동 위치 적용")
-        
-#         if submit_manual:
-#             try:
-#                 lat = float(manual_lat)
-#                 lon = float(manual_lon)
-#                 st.session_state.current_pos = (lat, lon)
-#                 st.success(f"수동 위치 적용됨: 위도 {lat:.6f}, 경도 {lon:.6f}")
-#             except ValueError:
-#                 st.error("유효한 숫자를 입력해주세요")
-
-#     # 거리 계산 섹션
-#     st.subheader("🏌️ 홀 거리 계산")
-#     hole_number = st.selectbox(
-#         "홀 번호 선택 (1-18):",
-#         options=list(range(1, 19)),
-#         index=0
-#     )
-    
-#     if st.button("거리 계산", type="primary"):
-#         if st.session_state.current_pos is None:
-#             st.error("먼저 위치 정보를 가져오거나 입력해주세요.")
-#         elif hole_number in HOLE_COORDS:
-#             target_pos = HOLE_COORDS[hole_number]
-#             distance_m = geodesic(st.session_state.current_pos, target_pos).meters
-            
-#             # 거리 시각화
-#             st.success(
-#                 f"**홀 {hole_number}까지 거리:**\n\n"
-#                 f"- {distance_m:.2f} 미터\n"
-#                 f"- {distance_m * 1.09361:.2f} 야드"
-#             )
-            
-#             # 거리 진행률 표시
-#             max_distance = 300
-#             progress = min(1.0, distance_m / max_distance)
-#             st.progress(progress)
-#             st.caption(f"기준 거리: {max_distance}m (진행률 {progress*100:.0f}%)")
-            
-#             # 지도 시각화
-#             st.map(
-#                 [st.session_state.current_pos, target_pos],
-#                 zoom=15,
-#                 color=['#FF0000', '#0000FF']  # 빨강: 현재 위치, 파랑: 홀 위치
-#             )
-#         else:
-#             st.error("유효하지 않은 홀 번호입니다.")
-
-# if __name__ == '__main__':
-#     main()
-
-#
-
-# import streamlit as st
-# from geopy.distance import geodesic
-# from streamlit_geolocation import streamlit_geolocation
-
-# # Jindalee Golf Course 홀컵 좌표 (위도, 경도)
-# HOLE_COORDS = {
-#     1: (-27.53918, 152.945457),
-#     2: (-27.53658, 152.94362),
-#     3: (-27.536325, 152.946275),
-#     4: (-27.535989, 152.943866),
-#     5: (-27.534852, 152.944261),
-#     6: (-27.532689, 152.945452),
-#     7: (-27.534462, 152.944352),
-#     8: (-27.532874, 152.943498),
-#     9: (-27.535837, 152.943191),
-#     10: (-27.53918, 152.945457),
-#     11: (-27.53658, 152.94362),
-#     12: (-27.536325, 152.946275),
-#     13: (-27.535989, 152.943866),
-#     14: (-27.534852, 152.944261),
-#     15: (-27.532689, 152.945452),
-#     16: (-27.534462, 152.944352),
-#     17: (-27.532874, 152.943498),
-#     18: (-27.535837, 152.943191)
-# }
-
-# def main():
-#     st.markdown("#### :red[홀 거리 측정] by Kevin")
-#     st.markdown("현재 위치에서 홀컵까지의 거리를 계산합니다")
-    
-#     # 세션 상태 초기화
-#     if 'current_pos' not in st.session_state:
-#         st.session_state.current_pos = None
-    
-#     # 위치 서비스 요청 섹션
-#     st.subheader("📍 위치 서비스")
-#     st.markdown("**1. 현재 위치 가져오기**")
-    
-#     # 위치 요청 버튼
-#     location = streamlit_geolocation()
-    
-#     # 위치 정보 처리
-#     if location and 'latitude' in location and 'longitude' in location:
-#         lat = location['latitude']
-#         lon = location['longitude']
-#         st.session_state.current_pos = (lat, lon)
-#         st.success(f"위치 갱신 성공! 위도: {lat:.6f}, 경도: {lon:.6f}")
-#         st.map([st.session_state.current_pos], zoom=16)
-#     else:
-#         st.warning("위치 정보를 가져오지 못했습니다. 수동으로 입력하세요.")
-    
-#     # 수동 입력 폼
-#     st.markdown("**2. 수동 위치 입력 (선택사항)**")
-#     with st.form("manual_location"):
-#         manual_lat = st.text_input("위도", value="-27.53918")
-#         manual_lon = st.text_input("경도", value="152.945457")
-#         submit_manual = st.form_submit_button("수동 위치 적용")
-        
-#         if submit_manual:
-#             try:
-#                 lat = float(manual_lat)
-#                 lon = float(manual_lon)
-#                 st.session_state.current_pos = (lat, lon)
-#                 st.success(f"수동 위치 적용됨: 위도 {lat:.6f}, 경도 {lon:.6f}")
-#             except ValueError:
-#                 st.error("유효한 숫자를 입력해주세요")
-
-#     # 거리 계산 섹션
-#     st.subheader("🏌️ 홀 거리 계산")
-#     hole_number = st.selectbox(
-#         "홀 번호 선택 (1-18):",
-#         options=list(range(1, 19)),
-#         index=0
-#     )
+def main():
+    st.markdown("#### :red[홀 거리 측정] by Kevin")
+    st.markdown("현재 위치에서 홀컵까지의 거리를 계산합니다")
     
-#     if st.button("거리 계산", type="primary"):
-#         if st.session_state.current_pos is None:
-#             st.error("먼저 위치 정보를 가져오거나 입력해주세요.")
-#         elif hole_number in HOLE_COORDS:
-#             target_pos = HOLE_COORDS[hole_number]
-#             distance_m = geodesic(st.session_state.current_pos, target_pos).meters
-            
-#             # 거리 시각화
-#             st.success(
-#                 f"**홀 {hole_number}까지 거리:**\n\n"
-#                 f"- {distance_m:.2f} 미터\n"
-#                 f"- {distance_m * 1.09361:.2f} 야드"
-#             )
-            
-#             # 거리 진행률 표시
-#             max_distance = 300
-#             progress = min(1.0, distance_m / max_distance)
-#             st.progress(progress)
-#             st.caption(f"기준 거리: {max_distance}m (진행률 {progress*100:.0f}%)")
-            
-#             # 지도 시각화
-#             st.map(
-#                 [st.session_state.current_pos, target_pos],
-#                 zoom=15,
-#                 color=['#FF0000', '#0000FF']  # 빨강: 현재 위치, 파랑: 홀 위치
-#             )
-#         else:
-#             st.error("유효하지 않은 홀 번호입니다.")
+    # 세션 상태 초기화
+    if 'current_pos' not in st.session_state:
+        st.session_state.current_pos = None
+    if 'gps_request' not in st.session_state:
+        st.session_state.gps_request = 0
+    # 홀 선택 위젯 값은 세션 상태로만 정함 (홀 자동 감지/브라우저 거리 모드가 같은 키에 씀)
+    if 'hole_number' not in st.session_state:
+        st.session_state.hole_number = next(iter(HOLE_COORDS))
+    
+    location_section()
+    live_section()
+    distance_section()
+    stats_section()
+    diagnostics_panel()
 
-# if __name__ == '__main__':
-#     main()
\ No newline at end of file
+if __name__ == '__main__':
+    # st.stop()이나 예외로 끝나도 이번 실행의 프로파일을 저장
+    try:
+        configure_timing()
+        # GOLF_METRICS_PORT 가 있으면 Prometheus 지표 서버 (프로세스당 한 번)
+        start_metrics()
+        with rerun('ai-loc7777'):
+            main()
+    finally:
+        PROFILE.stop()
@@ -1,42 +1,116 @@
 # 
 
+import os
+
 import streamlit as st
-import folium
-from streamlit_folium import folium_static
-from geopy.geocoders import Nominatim
-from streamlit_geolocation import streamlit_geolocation
+
+from profiling import profile_script
+
+# ?profile=1 (또는 GOLF_PROFILE 환경 변수) 이면 이 실행 전체를 프로파일링 (아래 import 포함)
+# 아래 import는 그 비용까지 재려고 일부러 이 뒤에 둠 (noqa: E402)
+PROFILE = profile_script('ai-loc88')
+
+from geopy.geocoders import Nominatim  # noqa: E402
+from streamlit_geolocation import streamlit_geolocation  # noqa: E402
+
+from course_data import DEFAULT_COURSE, CourseDataError, load_course  # noqa: E402
+from geocode_cache import ReverseGeocodeCache  # noqa: E402
+from map_layer import course_map, location_map, marker  # noqa: E402
+from metrics import start as start_metrics, watch  # noqa: E402
+from offline_geocoder import load_gazetteer  # noqa: E402
+from timing import configure as configure_timing, diagnostics_panel, rerun, timer  # noqa: E402
+
+# 주소 조회 캐시는 프로세스 전체에서 공유 (세션 간 동시 요청도 한 번만 조회)
+@st.cache_resource
+def get_reverse_geocoder():
+    return watch(
+        'geocode', ReverseGeocodeCache(Nominatim(user_agent="my_app")),
+        hits=('memory_hits', 'disk_hits', 'coalesced'), misses=('misses',)
+    )
+
+# 오프라인 주소 검색용 로컬 주소 지점 파일 (CSV/GeoJSON, GOLF_GAZETTEER 환경 변수)
+@st.cache_resource
+def get_offline_geocoder():
+    path = os.environ.get("GOLF_GAZETTEER")
+    if path and os.path.exists(path):
+        return load_gazetteer(path)
+    return None
+
+# 코스 경계에서 이만큼(m) 벗어나기 전까지는 코스 지도를 보여 줌
+COURSE_MARGIN_M = 200.0
 
 def main():
     st.title('모바일 GPS 위치 추적기 by Kevin')
 
     # 위치 정보 가져오기
+    # 브라우저가 위치를 보내기 전에는 딕셔너리가 아니라 기본 문자열("No Location Info")이 옴
     location = streamlit_geolocation()
     
-    if location:
+    if isinstance(location, dict):
         lat = location.get('latitude')
         lon = location.get('longitude')
         
         if lat and lon:
-            # 지도 생성
-            m = folium.Map(location=[lat, lon], zoom_start=15)
-            
-            # 현재 위치 마커 추가
-            folium.Marker(
-                [lat, lon],
-                popup='현재 위치',
-                icon=folium.Icon(color='red', icon='info-sign')
-            ).add_to(m)
-
             # 지도 표시
-            folium_static(m)
+            # 코스 안이면 코스 기본 지도는 한 번만 불러오고, 이후에는 현재 위치 마커만 갱신
+            # 코스 밖이면 예전처럼 현재 위치를 가운데에 둔 일반 지도를 그림
+            course_id = st.query_params.get("course", DEFAULT_COURSE)
+            try:
+                south, west, north, east = load_course(course_id).bounds(COURSE_MARGIN_M)
+            except CourseDataError as e:
+                st.error(f"코스 데이터를 불러오지 못했습니다: {e}")
+                st.stop()
+            if south <= lat <= north and west <= lon <= east:
+                course_map(
+                    course_id,
+                    markers=[marker(lat, lon, label='현재 위치', color='red')],
+                    center=(lat, lon),
+                    key="course_map"
+                )
+            else:
+                location_map(lat, lon)
 
             # 주소 정보 표시
+            # 오프라인 모드는 네트워크 없이 로컬 주소 지점 파일에서 바로 찾음
+            offline = get_offline_geocoder()
+            use_offline = st.toggle(
+                "오프라인 주소 검색",
+                value=offline is not None,
+                disabled=offline is None
+            )
+            if offline is not None and offline.skipped:
+                st.caption(f"주소 지점 파일에서 잘못된 행 {offline.skipped}개를 건너뛰었습니다")
             try:
-                geolocator = Nominatim(user_agent="my_app")
-                location = geolocator.reverse(f"{lat}, {lon}")
-                st.write(f"현재 주소: {location.address}")
+                if use_offline:
+                    with timer('geocode.offline'):
+                        location = offline.reverse((lat, lon))
+                else:
+                    with timer('geocode.reverse'):
+                        location = get_reverse_geocoder().reverse(lat, lon)
+                if location is None:
+                    st.write("현재 주소: 주소를 찾을 수 없습니다")
+                else:
+                    st.write(f"현재 주소: {location.address}")
             except Exception as e:
-                st.warning(f"주소를 가져오는 데 실패했습니다: {e}")
+                # 온라인 조회가 실패하면 오프라인 색인으로 대체
+                location = offline.reverse((lat, lon)) if offline is not None else None
+                if location is not None:
+                    st.write(f"현재 주소 (오프라인): {location.address}")
+                else:
+                    st.warning(f"주소를 가져오는 데 실패했습니다: {e}")
+
+            with st.expander("주소 캐시 통계"):
+                st.json(get_reverse_geocoder().stats())
+
+    diagnostics_panel()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # st.stop()이나 예외로 끝나도 이번 실행의 프로파일을 저장
+    try:
+        configure_timing()
+        # GOLF_METRICS_PORT 가 있으면 Prometheus 지표 서버 (프로세스당 한 번)
+        start_metrics()
+        with rerun('ai-loc88'):
+            main()
+    finally:
+        PROFILE.stop()
\ No newline at end of file
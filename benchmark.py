@@ -0,0 +1,275 @@
+# 벤치마크 (거리 계산, 역지오코딩, 앱 스크립트 실행 시간)
+#
+# 네트워크 없이 로컬에서만 실행: 지오코더는 StubGeocoder, 앱 스크립트 실행 중에는
+# 외부 소켓 연결을 막음 (IP 위치 조회 등은 실패로 처리됨)
+# 결과는 항목별 1회 실행 시간(초)을 JSON으로 저장하고, 기준 결과와 비교해
+# tolerance 이상 느려진 항목이 있거나 예외가 난 앱 스크립트가 있으면 종료 코드 1
+# (예외가 난 스크립트의 시간은 결과에 넣지 않음)
+#
+#   python benchmark.py run --save-baseline          # 기준 결과 저장
+#   python benchmark.py run                          # 실행 + 기준과 비교
+#   python benchmark.py run --only distance,geocode
+#   python benchmark.py compare old.json new.json
+import json
+import os
+import platform
+import socket
+import sys
+import tempfile
+import time
+import timeit
+from contextlib import contextmanager
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BENCH_DIR = os.path.join(ROOT, 'cache', 'bench')
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'latest.json')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_TOLERANCE = 0.25
+
+APP_SCRIPTS = ('ai-loc7777.py', 'ai-loc77.py', 'ai-golfloc3.py', 'ai-loc88.py')
+
+
+def _per_call(fn, repeat=5, min_time=0.2):
+    """fn 1회 실행 시간 (초, repeat번 중 최솟값)"""
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat, number)) / number
+
+
+def _positions(course, n, radius_m=300.0, seed=0):
+    """코스 중심 주변 무작위 위치 (n, 2)"""
+    rng = np.random.default_rng(seed)
+    lat0, lon0 = course.pin[:, 0].mean(), course.pin[:, 1].mean()
+    dn, de = rng.uniform(-radius_m, radius_m, (2, n))
+    return np.column_stack([lat0 + dn / 111320.0, lon0 + de / (111320.0 * np.cos(np.radians(lat0)))])
+
+
+def bench_distance(course):
+    from geopy.distance import geodesic
+
+    from distance_engine import DistanceEngine, ProjectedEngine, geodesic_distance
+    from distance_raster import DistanceRaster, build_raster, open_raster
+
+    hole_coords = course.hole_coords()
+    pins = list(hole_coords.values())
+    exact = DistanceEngine(hole_coords)
+    projected = ProjectedEngine(hole_coords)
+    engines = {'exact': exact, 'projected': projected}
+
+    # 앱과 같이 격자 밖 위치는 ProjectedEngine으로 계산
+    tmp = None
+    raster = open_raster(course, fallback=projected)
+    if raster is None:
+        tmp = tempfile.TemporaryDirectory()
+        raster = DistanceRaster(build_raster(course, path=os.path.join(tmp.name, 'raster.npy')), projected)
+    engines['raster'] = raster
+
+    position = tuple(_positions(course, 1)[0].tolist())
+    batch = _positions(course, 10000, seed=1)
+    small = batch[:50]
+    results = {
+        'distance.single.geopy': _per_call(lambda: geodesic(position, pins[0]).meters),
+        'distance.single.geodesic_distance': _per_call(lambda: geodesic_distance(*position, *pins[0])),
+        'distance.all_holes.geopy': _per_call(lambda: [geodesic(position, p).meters for p in pins]),
+        # 위치 50개 × 전체 홀을 geopy로 계산한 시간을 위치 1만 개 기준으로 환산
+        'distance.batch_10k.geopy': _per_call(
+            lambda: [geodesic(tuple(p), q).meters for p in small.tolist() for q in pins], repeat=3,
+        ) * len(batch) / len(small),
+    }
+    for name, engine in engines.items():
+        results[f'distance.single.{name}'] = _per_call(lambda: engine.distance(position, 1))
+        results[f'distance.all_holes.{name}'] = _per_call(lambda: engine.distances(position))
+    for name in ('exact', 'projected', 'raster'):
+        results[f'distance.batch_10k.{name}'] = _per_call(lambda: engines[name].matrix(batch), repeat=3)
+    if tmp is not None:
+        del raster, engines
+        tmp.cleanup()
+    return results
+
+
+def bench_geocode():
+    from geocode_cache import ReverseGeocodeCache, StubGeocoder
+    from offline_geocoder import OfflineReverseGeocoder
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, 'geocode.sqlite3')
+        cache = ReverseGeocodeCache(StubGeocoder(), db_path=db, min_interval=0)
+        counter = iter(range(10**9))
+        # 매번 다른 셀 → 지오코더 호출 + SQLite 저장
+        results['geocode.miss'] = _per_call(
+            lambda: cache.reverse(-27.5 + next(counter) * 0.001, 152.94), repeat=3, min_time=0.05,
+        )
+        results['geocode.memory_hit'] = _per_call(lambda: cache.reverse(-27.5, 152.94))
+        # 메모리 캐시 없이 SQLite에서만 읽기
+        disk = ReverseGeocodeCache(StubGeocoder(), db_path=db, max_entries=0, min_interval=0)
+        results['geocode.disk_hit'] = _per_call(lambda: disk.reverse(-27.5, 152.94))
+        cache._db.close()
+        disk._db.close()
+
+    rng = np.random.default_rng(0)
+    lats, lons = -27.55 + rng.uniform(0, 0.1, (2, 100000))
+    offline = OfflineReverseGeocoder(
+        [(lat, lon, f"{i} Stub St") for i, (lat, lon) in enumerate(zip(lats.tolist(), lons.tolist()))]
+    )
+    results['geocode.offline'] = _per_call(lambda: offline.reverse("-27.53, 152.94"))
+    return results
+
+
+@contextmanager
+def _no_network():
+    """외부 주소로의 소켓 연결을 막음 (로컬 루프백은 허용)"""
+    original = socket.socket.connect
+
+    def connect(self, address):
+        host = address[0] if isinstance(address, tuple) else address
+        if isinstance(host, str) and host not in ('127.0.0.1', '::1', 'localhost'):
+            raise OSError("benchmark: network disabled")
+        return original(self, address)
+
+    socket.socket.connect = connect
+    try:
+        yield
+    finally:
+        socket.socket.connect = original
+
+
+def bench_apps(scripts=APP_SCRIPTS, reruns=5):
+    """스크립트별 첫 실행(import, 캐시 생성 포함)과 리런 시간 (Streamlit AppTest)
+
+    실행 중 예외가 난 스크립트는 시간 대신 errors에 메시지만 남김
+    """
+    from streamlit.testing.v1 import AppTest
+
+    results, errors = {}, {}
+    with _no_network():
+        for script in scripts:
+            name = os.path.splitext(script)[0]
+            at = AppTest.from_file(os.path.join(ROOT, script), default_timeout=60)
+            start = time.perf_counter()
+            at.run()
+            first = time.perf_counter() - start
+            times = []
+            for _ in range(reruns):
+                if at.exception:
+                    break
+                start = time.perf_counter()
+                at.run()
+                times.append(time.perf_counter() - start)
+            if at.exception:
+                errors[script] = at.exception[0].message
+                continue
+            results[f'app.{name}.first'] = first
+            results[f'app.{name}.rerun'] = float(np.median(times))
+    return results, errors
+
+
+SUITES = ('distance', 'geocode', 'apps')
+
+
+def run(only=SUITES, course_id=None):
+    from course_data import DEFAULT_COURSE, load_course
+
+    course = load_course(course_id or DEFAULT_COURSE)
+    results, errors = {}, {}
+    if 'distance' in only:
+        results.update(bench_distance(course))
+    if 'geocode' in only:
+        results.update(bench_geocode())
+    if 'apps' in only:
+        app_results, errors = bench_apps()
+        results.update(app_results)
+    return {
+        'meta': {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'course': course.id,
+            'python': platform.python_version(), 'numpy': np.__version__,
+            'machine': platform.machine(), 'processor': platform.processor(),
+        },
+        'results': results,
+        'errors': errors,
+    }
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """[(항목, 기준 초, 현재 초, 비율, 느려짐 여부)] — 양쪽에 모두 있는 항목만"""
+    rows = []
+    for name, now in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        ratio = now / before if before else float('inf')
+        rows.append((name, before, now, ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def _format_time(seconds):
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.2f} µs"
+
+
+def _print_results(report):
+    for name, seconds in report['results'].items():
+        print(f"{name:40s} {_format_time(seconds):>12}  ({1 / seconds:,.3g}/s)")
+    for script, message in report['errors'].items():
+        print(f"{script}: 스크립트 오류 - {message}")
+
+
+def _print_comparison(rows, tolerance):
+    regressed = [row for row in rows if row[4]]
+    for name, before, now, ratio, slow in rows:
+        mark = "  ← 느려짐" if slow else ""
+        print(f"{name:40s} {_format_time(before):>12} → {_format_time(now):>12}  ×{ratio:.2f}{mark}")
+    print(f"비교 {len(rows)}개, 허용 범위(+{tolerance:.0%}) 초과 {len(regressed)}개")
+    return 1 if regressed else 0
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="벤치마크 실행/비교")
+    sub = parser.add_subparsers(dest='command', required=True)
+    bench = sub.add_parser('run')
+    bench.add_argument('-o', '--output', default=DEFAULT_OUTPUT)
+    bench.add_argument('--baseline', default=DEFAULT_BASELINE)
+    bench.add_argument('--save-baseline', action='store_true', help="결과를 기준 결과로도 저장")
+    bench.add_argument('--only', default=','.join(SUITES), help="실행할 묶음 (쉼표 구분)")
+    bench.add_argument('--course')
+    bench.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    diff = sub.add_parser('compare')
+    diff.add_argument('baseline')
+    diff.add_argument('current')
+    diff.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.current, encoding='utf-8') as f:
+            current = json.load(f)
+        return _print_comparison(compare(current, baseline, args.tolerance), args.tolerance)
+
+    report = run(tuple(s.strip() for s in args.only.split(',')), args.course)
+    _print_results(report)
+    paths = [args.output] + ([args.baseline] if args.save_baseline else [])
+    for path in paths:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    print(f"저장: {', '.join(paths)}")
+    failed = 1 if report['errors'] else 0
+    if args.save_baseline or not os.path.exists(args.baseline):
+        return failed
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    return _print_comparison(compare(report, baseline, args.tolerance), args.tolerance) or failed
+
+
+if __name__ == '__main__':
+    sys.exit(main())
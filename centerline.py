@@ -0,0 +1,79 @@
+# 도그렉 홀의 플레이 라인 거리 (페어웨이 중심선 따라)
+#
+# 홀마다 티 → 페어웨이 지점들 → 홀컵을 잇는 중심선을 코스 ENU 평면에서 미리 계산해
+# 두고(선분 시작점, 방향, 길이, 누적 길이), 위치가 오면 가장 가까운 선분에 투영함.
+# 실시간 GPS마다 실행되므로 조회 경로는 NumPy 임시 배열 없이 스칼라 연산만 사용
+#
+#   남은 거리 = 현재 위치에서 앞쪽 첫 꼭짓점까지 직선 + 그 점부터 홀컵까지 중심선 길이
+# 꺾임점은 방향이 BEND_DEG 이상 바뀌는 꼭짓점 (일직선 위의 페어웨이 지점은 제외)
+import math
+
+import numpy as np
+
+from distance_engine import LocalFrame, center
+
+BEND_DEG = 15.0
+
+
+class Centerlines:
+    """페어웨이 지점이 있는 홀의 중심선 (없는 홀은 조회 시 None)"""
+
+    def __init__(self, course, frame=None):
+        self.frame = frame or LocalFrame(*center(course.pin[:, 0], course.pin[:, 1]))
+        self._lines = {}
+        for i, number in enumerate(course.number.tolist()):
+            fairway = course.fairway_points(i)
+            if not len(fairway):
+                continue
+            pts = [fairway, course.pin[i:i + 1]]
+            if not np.isnan(course.tee[i, 0]):
+                pts.insert(0, course.tee[i:i + 1])
+            pts = np.concatenate(pts)
+            e, n = self.frame.to_enu(pts[:, 0], pts[:, 1])
+            seg = np.hypot(np.diff(e), np.diff(n))
+            # 남은 길이: 각 꼭짓점에서 홀컵까지의 중심선 길이
+            remaining = np.concatenate([np.cumsum(seg[::-1])[::-1], [0.0]])
+            # 선분: (시작 e, 시작 n, 방향 e, 방향 n, 1/길이², 끝점 인덱스)
+            segments = tuple(
+                (e[k], n[k], e[k + 1] - e[k], n[k + 1] - n[k], 1.0 / max(seg[k] * seg[k], 1e-12), k + 1)
+                for k in range(len(seg))
+            )
+            heading = np.arctan2(np.diff(n), np.diff(e))
+            turn = np.abs((np.diff(heading) + np.pi) % (2 * np.pi) - np.pi)
+            bends = tuple((np.flatnonzero(turn >= np.radians(BEND_DEG)) + 1).tolist())
+            self._lines[number] = (
+                segments, tuple(e.tolist()), tuple(n.tolist()), tuple(remaining.tolist()), bends,
+            )
+
+    def __contains__(self, hole_number):
+        return hole_number in self._lines
+
+    def vertices(self, hole_number):
+        """중심선 꼭짓점 ENU 좌표 (지도 표시용)"""
+        _, e, n, _, _ = self._lines[hole_number]
+        return e, n
+
+    def along(self, position, hole_number):
+        """(홀컵까지 플레이 라인 거리, 앞쪽 꺾임점들까지 거리 튜플) m. 중심선이 없으면 None
+
+        꺾임점 거리도 중심선을 따라 잰 값 (가까운 순서)
+        """
+        line = self._lines.get(hole_number)
+        if line is None:
+            return None
+        segments, e, n, remaining, bends = line
+        px, py = self.frame.point_to_enu(*position)
+
+        # 가장 가까운 선분 찾기 (선분 수가 적어 선형 탐색이 이분 탐색보다 빠름)
+        best, best_end = math.inf, 1
+        for ax, ay, dx, dy, inv, end in segments:
+            t = ((px - ax) * dx + (py - ay) * dy) * inv
+            t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+            ex, ey = px - ax - t * dx, py - ay - t * dy
+            d2 = ex * ex + ey * ey
+            if d2 < best:
+                best, best_end = d2, end
+
+        # 투영된 선분의 끝점까지 직선, 그 뒤는 중심선을 따라
+        total = math.hypot(e[best_end] - px, n[best_end] - py) + remaining[best_end]
+        return total, tuple(total - remaining[k] for k in bends if k >= best_end)
@@ -0,0 +1,97 @@
+# 브라우저 거리 계산 모드
+#
+# 코스 표(홀컵, 그린 외곽선)를 코스 ENU 평면 좌표로 바꿔 JSON 파일로 한 번만 내려보내고,
+# 브라우저 컴포넌트가 GPS 위치마다 모든 홀 거리를 직접 계산해 표시함.
+# 서버에는 홀 변경, 일정 거리 이상 이동, 샷 저장 같은 굵은 이벤트만 올라옴
+#
+# 거리 계산은 distance_engine.ProjectedEngine과 같은 방식
+# (WGS84 → ECEF → 코스 중심 ENU 평면, 반경 VALID_RADIUS_M 안에서 오차 1 cm 이하).
+# 기준점과 반경은 서버의 ProjectedEngine 값을 그대로 보내고 (브라우저에서 다시 계산하지 않음),
+# 반경 밖에서는 브라우저도 타원체 거리(Vincenty)로 계산함
+# 해저드 레이업/캐리는 보내지 않고 서버(HazardIndex)가 position 이벤트마다 계산함
+# 브라우저의 Vincenty/칼만 필터는 Python 구현을 옮긴 것 (tests/test_client_parity.py로 같은 값인지 확인)
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+import streamlit.components.v1 as components
+
+from distance_engine import ProjectedEngine
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'distance_component', 'frontend')
+DATA_DIR = os.path.join(FRONTEND_DIR, 'courses')
+
+_component = components.declare_component('client_distance', path=FRONTEND_DIR)
+
+
+def course_payload(course):
+    """브라우저로 보낼 코스 표 (좌표는 코스 ENU 평면 미터, 1 cm 단위로 반올림)
+
+    홀컵은 반경 밖 타원체 계산용으로 위경도도 함께 보냄. 평면 근사를 쓰지 않는 코스
+    (홀이 반경 밖까지 퍼진 경우)는 radius_m이 0이라 브라우저도 항상 타원체 계산
+    """
+    engine = ProjectedEngine(course.hole_coords())
+    frame = engine.frame
+    east, north = frame.to_enu(course.pin[:, 0], course.pin[:, 1])
+    holes = []
+    for i, number in enumerate(course.number):
+        green = course.green_polygon(i)
+        ge, gn = frame.to_enu(green[:, 0], green[:, 1])
+        holes.append({
+            'number': int(number),
+            'par': int(course.par[i]),
+            'pin': [round(float(east[i]), 2), round(float(north[i]), 2)],
+            'lat': float(course.pin[i, 0]),
+            'lon': float(course.pin[i, 1]),
+            'green': [[round(float(e), 2), round(float(n), 2)] for e, n in zip(ge, gn)],
+        })
+    return {
+        'course': course.id,
+        'frame': {'lat0': frame.lat0, 'lon0': frame.lon0},
+        'radius_m': engine.radius_m if engine.enabled else 0.0,
+        'holes': holes,
+    }
+
+
+@lru_cache(maxsize=None)
+def course_data_url(course_id):
+    """코스 표 JSON을 (없을 때만) 저장하고 컴포넌트 기준 상대 URL을 반환
+
+    파일 이름에 내용 해시가 들어 있으므로 브라우저는 코스가 바뀔 때만 다시 받음
+    """
+    from course_data import load_course
+
+    data = json.dumps(course_payload(load_course(course_id)), separators=(',', ':')).encode()
+    name = f"{course_id}-{hashlib.sha1(data).hexdigest()[:12]}.json"
+    path = os.path.join(DATA_DIR, name)
+    if not os.path.exists(path):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    return f"courses/{name}"
+
+
+def client_distances(course_id, hole=None, move_m=25.0, height=560, key='client_distance',
+                     state_key='client_distance_seen'):
+    """브라우저 거리 표시. 새 이벤트가 있으면 그 dict를, 없으면 None을 반환
+
+    이벤트 종류
+      {'type': 'position', 'lat', 'lon', 'accuracy'}  move_m 이상 움직였을 때
+      {'type': 'hole', 'hole'}                          표에서 홀을 눌렀을 때
+      {'type': 'shot', 'hole', 'lat', 'lon', 'accuracy', 'timestamp'}  샷 저장
+      {'type': 'error', 'error'}
+    """
+    import streamlit as st
+
+    event = _component(
+        data_url=course_data_url(course_id), hole=hole, move_m=move_m, height=height,
+        key=key, default=None,
+    )
+    # 컴포넌트 값은 다음 이벤트 전까지 그대로 남으므로 번호로 한 번만 처리
+    if not event or event['id'] == st.session_state.get(state_key):
+        return None
+    st.session_state[state_key] = event['id']
+    return event
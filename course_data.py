@@ -0,0 +1,413 @@
+# 코스 데이터 (편집용 YAML/GeoJSON 원본 → 메모리 매핑용 바이너리)
+#
+# 원본: courses/<코스>.yaml 또는 courses/<코스>.geojson
+# 컴파일: python course_data.py compile courses -o courses/courses.bin
+#
+# 바이너리 형식 (리틀 엔디언)
+#   MAGIC(8) | 인덱스 길이(uint64) | 인덱스 JSON | 8바이트 정렬된 배열들
+# 인덱스에는 코스별 배열의 (dtype, shape, offset)이 들어 있어
+# 코스 하나를 여는 것은 dict 조회 + np.frombuffer 뷰 생성뿐임 (복사 없음)
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from functools import lru_cache
+
+import numpy as np
+
+MAGIC = b'GOLFCRS1'
+COURSE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'courses')
+DEFAULT_STORE = os.path.join(COURSE_DIR, 'courses.bin')
+DEFAULT_COURSE = os.environ.get('GOLF_COURSE', 'jindalee')
+
+# 해저드 종류 코드
+HAZARD_KINDS = ('bunker', 'water', 'ob')
+
+
+class CourseDataError(ValueError):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# 원본 파싱 → 공통 딕셔너리
+#   {'id', 'name', 'holes': [{'number', 'par', 'pin', 'tee', 'green', 'fairway',
+#                             'hazards': [{'kind', 'polygon'}]}]}
+# 좌표는 모두 (위도, 경도)
+# ---------------------------------------------------------------------------
+
+def _latlon(value, where):
+    try:
+        lat, lon = (float(v) for v in value)
+    except (TypeError, ValueError):
+        raise CourseDataError(f"{where}: (위도, 경도) 좌표가 아닙니다: {value!r}")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise CourseDataError(f"{where}: 좌표 범위를 벗어났습니다: {value!r}")
+    return lat, lon
+
+
+def _points(points, where):
+    """(위도, 경도) 좌표 목록"""
+    if not isinstance(points, (list, tuple)):
+        raise CourseDataError(f"{where}: 좌표 목록이 아닙니다: {points!r}")
+    return [_latlon(p, where) for p in points]
+
+
+def _int(value, where, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise CourseDataError(f"{where}: {name}가 정수가 아닙니다: {value!r}") from None
+
+
+def _ring(points, where):
+    """다각형 외곽선 좌표 (닫는 점이 중복되어 있으면 제거)"""
+    ring = _points(points or [], where)
+    if len(ring) > 1 and ring[0] == ring[-1]:
+        ring.pop()
+    return ring
+
+
+def _normalize(course, source):
+    if not isinstance(course, dict):
+        raise CourseDataError(f"{source}: 코스 문서가 매핑(id, name, holes)이 아닙니다")
+    course_id = course.get('id') or os.path.splitext(os.path.basename(source))[0]
+    raw_holes = course.get('holes') or []
+    if not isinstance(raw_holes, list):
+        raise CourseDataError(f"{source}: holes가 목록이 아닙니다")
+    holes = []
+    seen = set()
+    for k, raw in enumerate(raw_holes):
+        if not isinstance(raw, dict):
+            raise CourseDataError(f"{source} {k}번째 홀: 매핑이 아닙니다: {raw!r}")
+        if 'number' not in raw:
+            raise CourseDataError(f"{source} {k}번째 홀: number가 없습니다")
+        n = _int(raw['number'], f"{source} {k}번째 홀", 'number')
+        where = f"{source} 홀 {n}"
+        if n in seen:
+            raise CourseDataError(f"{where}: 홀 번호 중복")
+        seen.add(n)
+        if 'pin' not in raw:
+            raise CourseDataError(f"{where}: pin 좌표가 없습니다")
+        hazards = []
+        for hz in raw.get('hazards') or []:
+            if not isinstance(hz, dict) or 'polygon' not in hz:
+                raise CourseDataError(f"{where}: 해저드에 polygon이 없습니다: {hz!r}")
+            kind = hz.get('kind', 'bunker')
+            if kind not in HAZARD_KINDS:
+                raise CourseDataError(f"{where}: 알 수 없는 해저드 종류 {kind!r}")
+            hazards.append({
+                'kind': kind,
+                'polygon': _ring(hz['polygon'], where),
+            })
+        holes.append({
+            'number': n,
+            'par': _int(raw.get('par') or 0, where, 'par'),
+            'pin': _latlon(raw['pin'], where),
+            'tee': _latlon(raw['tee'], where) if raw.get('tee') else None,
+            'green': _ring(raw.get('green'), where),
+            'fairway': _points(raw.get('fairway') or [], where),
+            'hazards': hazards,
+        })
+    if not holes:
+        raise CourseDataError(f"{source}: 홀이 없습니다")
+    holes.sort(key=lambda h: h['number'])
+    return {'id': course_id, 'name': course.get('name') or course_id, 'holes': holes}
+
+
+def _from_geojson(data, source):
+    """GeoJSON FeatureCollection → 공통 딕셔너리
+
+    feature.properties: hole(번호), kind(pin/tee/green/fairway/hazard),
+    hazard(bunker/water/ob), par. GeoJSON 좌표 순서는 (경도, 위도)
+    """
+    if not isinstance(data, dict) or data.get('type') != 'FeatureCollection':
+        raise CourseDataError(f"{source}: GeoJSON FeatureCollection이 아닙니다")
+    props = data.get('properties') or {}
+    holes = {}
+    for i, feature in enumerate(data.get('features') or []):
+        where = f"{source} feature {i}"
+        p = feature.get('properties') or {}
+        geom = feature.get('geometry') or {}
+        try:
+            n = int(p['hole'])
+        except KeyError:
+            raise CourseDataError(f"{where}: hole 번호가 없습니다") from None
+        except (TypeError, ValueError):
+            raise CourseDataError(f"{where}: hole 번호가 정수가 아닙니다: {p['hole']!r}") from None
+        hole = holes.setdefault(n, {'number': n, 'hazards': []})
+        if p.get('par'):
+            try:
+                hole['par'] = int(p['par'])
+            except (TypeError, ValueError):
+                raise CourseDataError(f"{where}: par가 정수가 아닙니다: {p['par']!r}") from None
+        kind = p.get('kind')
+        coords = geom.get('coordinates')
+        try:
+            if geom.get('type') == 'Polygon':
+                coords = coords[0]
+            if geom.get('type') == 'Point':
+                coords = [coords[1], coords[0]]
+            else:
+                coords = [[c[1], c[0]] for c in coords]
+        except (TypeError, IndexError, KeyError):
+            raise CourseDataError(f"{where}: geometry 좌표가 올바르지 않습니다: {geom!r}") from None
+        if kind in ('pin', 'tee', 'green', 'fairway'):
+            hole[kind] = coords
+        elif kind == 'hazard':
+            hole['hazards'].append({'kind': p.get('hazard', 'bunker'), 'polygon': coords})
+        else:
+            raise CourseDataError(f"{where}: 알 수 없는 feature 종류 {kind!r}")
+    course = {'id': props.get('id'), 'name': props.get('name'), 'holes': list(holes.values())}
+    return course
+
+
+def load_source(path):
+    """YAML 또는 GeoJSON 원본 파일 하나를 읽어 공통 딕셔너리로 반환"""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            import yaml
+            try:
+                course = yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise CourseDataError(f"{path}: YAML을 읽을 수 없습니다: {e}") from None
+        elif path.endswith(('.geojson', '.json')):
+            try:
+                data = json.load(f)
+            except ValueError as e:
+                raise CourseDataError(f"{path}: JSON을 읽을 수 없습니다: {e}") from None
+            course = _from_geojson(data, path)
+        else:
+            raise CourseDataError(f"지원하지 않는 코스 파일 형식: {path}")
+    return _normalize(course, path)
+
+
+def source_files(directory=COURSE_DIR):
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.endswith(('.yaml', '.yml', '.geojson', '.json'))
+    )
+
+
+# ---------------------------------------------------------------------------
+# 컴파일
+# ---------------------------------------------------------------------------
+
+def _ragged(groups, width=2, dtype=np.float64):
+    """가변 길이 좌표 목록들 → (이어붙인 배열, 오프셋 배열)"""
+    offsets = np.zeros(len(groups) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(g) for g in groups])
+    flat = np.array([p for g in groups for p in g], dtype=dtype).reshape(-1, width)
+    return flat, offsets
+
+
+def _course_arrays(course):
+    holes = course['holes']
+    hazards = [(h['number'], hz) for h in holes for hz in h['hazards']]
+    green, green_off = _ragged([h['green'] for h in holes])
+    fairway, fairway_off = _ragged([h['fairway'] for h in holes])
+    hazard_pts, hazard_off = _ragged([hz['polygon'] for _, hz in hazards])
+    nan = (np.nan, np.nan)
+    return {
+        'number': np.array([h['number'] for h in holes], dtype=np.int32),
+        'par': np.array([h['par'] for h in holes], dtype=np.int8),
+        'pin': np.array([h['pin'] for h in holes], dtype=np.float64),
+        'tee': np.array([h['tee'] or nan for h in holes], dtype=np.float64),
+        'green': green, 'green_offsets': green_off,
+        'fairway': fairway, 'fairway_offsets': fairway_off,
+        'hazard': hazard_pts, 'hazard_offsets': hazard_off,
+        'hazard_hole': np.array([n for n, _ in hazards], dtype=np.int32),
+        'hazard_kind': np.array([HAZARD_KINDS.index(hz['kind']) for _, hz in hazards],
+                                dtype=np.int8),
+    }
+
+
+def compile_courses(sources, out_path):
+    """원본 파일들을 하나의 바이너리로 컴파일 (임시 파일에 쓴 뒤 교체)
+
+    인덱스에 코스별 원본 파일 이름(source)을 남겨 원본이 지워진 것도 알아챌 수 있게 함
+    """
+    index = {}
+    blobs = []
+    offset = 0
+    for path in sources:
+        course = load_source(path)
+        if course['id'] in index:
+            raise CourseDataError(f"코스 id 중복: {course['id']}")
+        entry = {'name': course['name'], 'source': os.path.basename(path), 'arrays': {}}
+        for key, arr in _course_arrays(course).items():
+            arr = np.ascontiguousarray(arr, dtype=arr.dtype.newbyteorder('<'))
+            entry['arrays'][key] = [arr.dtype.str, list(arr.shape), offset]
+            data = arr.tobytes()
+            pad = (-len(data)) % 8
+            blobs.append(data + b'\0' * pad)
+            offset += len(data) + pad
+        index[course['id']] = entry
+
+    header = json.dumps(index, ensure_ascii=False).encode('utf-8')
+    header += b' ' * ((-(len(MAGIC) + 8 + len(header))) % 8)
+    # 여러 프로세스가 동시에 컴파일해도 서로의 임시 파일을 덮어쓰지 않도록 고유한 이름 사용
+    directory = os.path.dirname(os.path.abspath(out_path))
+    with tempfile.NamedTemporaryFile(dir=directory, prefix=os.path.basename(out_path) + '.',
+                                     suffix='.tmp', delete=False) as f:
+        try:
+            f.write(MAGIC)
+            f.write(struct.pack('<Q', len(header)))
+            f.write(header)
+            for blob in blobs:
+                f.write(blob)
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+    os.chmod(f.name, 0o644)  # NamedTemporaryFile은 0600으로 만듦
+    os.replace(f.name, out_path)
+    return list(index)
+
+
+# ---------------------------------------------------------------------------
+# 메모리 매핑 로더
+# ---------------------------------------------------------------------------
+
+class Course:
+    """컴파일된 코스 하나 (모든 배열은 공유 mmap 위의 읽기 전용 뷰)"""
+
+    def __init__(self, course_id, name, arrays):
+        self.id = course_id
+        self.name = name
+        for key, arr in arrays.items():
+            setattr(self, key, arr)
+
+    def __len__(self):
+        return len(self.number)
+
+    def hole_coords(self):
+        """기존 HOLE_COORDS와 같은 {홀 번호: (위도, 경도)} 딕셔너리"""
+        return {int(n): (float(lat), float(lon)) for n, (lat, lon) in zip(self.number, self.pin)}
+
+    def tee_coords(self):
+        return {int(n): (float(lat), float(lon))
+                for n, (lat, lon) in zip(self.number, self.tee) if not np.isnan(lat)}
+
+    def _ragged(self, values, offsets, i):
+        return values[offsets[i]:offsets[i + 1]]
+
+    def green_polygon(self, i):
+        """i번째 홀(배열 순서)의 그린 외곽선 (N, 2)"""
+        return self._ragged(self.green, self.green_offsets, i)
+
+    def fairway_points(self, i):
+        return self._ragged(self.fairway, self.fairway_offsets, i)
+
+    def fairway_coords(self):
+        return {int(n): [tuple(p) for p in self.fairway_points(i).tolist()]
+                for i, n in enumerate(self.number) if self.fairway_offsets[i + 1] > self.fairway_offsets[i]}
+
+    def hazard_polygon(self, k):
+        """k번째 해저드의 외곽선 (N, 2)"""
+        return self._ragged(self.hazard, self.hazard_offsets, k)
+
+    def bounds(self, margin_m=0.0):
+        """모든 좌표(홀컵, 티, 그린, 페어웨이, 해저드)를 감싸는 (남, 서, 북, 동)"""
+        pts = np.concatenate([
+            self.pin, self.tee[~np.isnan(self.tee[:, 0])], self.green, self.fairway, self.hazard,
+        ])
+        dlat = margin_m / 111320.0
+        dlon = dlat / np.cos(np.radians(pts[:, 0].mean()))
+        return (float(pts[:, 0].min() - dlat), float(pts[:, 1].min() - dlon),
+                float(pts[:, 0].max() + dlat), float(pts[:, 1].max() + dlon))
+
+
+class CourseStore:
+    """코스 바이너리 파일 하나를 mmap으로 열어 두고 코스를 O(1)로 제공"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise CourseDataError(f"코스 바이너리 형식이 아닙니다: {path}")
+        (header_len,) = struct.unpack_from('<Q', self._mm, len(MAGIC))
+        start = len(MAGIC) + 8
+        self._index = json.loads(self._mm[start:start + header_len].decode('utf-8'))
+        self._data_offset = start + header_len
+        self._courses = {}
+
+    def course_ids(self):
+        return list(self._index)
+
+    def course(self, course_id=DEFAULT_COURSE):
+        cached = self._courses.get(course_id)
+        if cached is not None:
+            return cached
+        try:
+            entry = self._index[course_id]
+        except KeyError:
+            raise CourseDataError(f"등록되지 않은 코스: {course_id}") from None
+        arrays = {}
+        for key, (dtype, shape, offset) in entry['arrays'].items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape)) if shape else 1
+            arrays[key] = np.frombuffer(
+                self._mm, dtype=dtype, count=count, offset=self._data_offset + offset
+            ).reshape(shape)
+        course = self._courses[course_id] = Course(course_id, entry['name'], arrays)
+        return course
+
+
+def _stale(store_path, directory):
+    # 바이너리가 없거나, 더 새로운 원본이 있거나, 원본 파일 목록이 달라졌으면(추가/삭제) 다시 컴파일
+    if not os.path.exists(store_path):
+        return True
+    built = os.path.getmtime(store_path)
+    sources = source_files(directory)
+    if any(os.path.getmtime(p) > built for p in sources):
+        return True
+    try:
+        index = CourseStore(store_path)._index
+    except (CourseDataError, OSError, ValueError):
+        return True
+    compiled = {entry.get('source') for entry in index.values()}
+    return compiled != {os.path.basename(p) for p in sources}
+
+
+@lru_cache(maxsize=None)
+def open_store(path=DEFAULT_STORE, source_dir=COURSE_DIR):
+    """프로세스당 한 번만 여는 코스 저장소. 원본이 더 새로우면 먼저 다시 컴파일"""
+    if os.path.isdir(source_dir) and _stale(path, source_dir):
+        compile_courses(source_files(source_dir), path)
+    return CourseStore(path)
+
+
+def load_course(course_id=DEFAULT_COURSE):
+    return open_store().course(course_id)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="코스 원본(YAML/GeoJSON)을 바이너리로 컴파일")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('compile')
+    build.add_argument('sources', nargs='+', help="원본 파일 또는 디렉터리")
+    build.add_argument('-o', '--output', default=DEFAULT_STORE)
+    show = sub.add_parser('list')
+    show.add_argument('store', nargs='?', default=DEFAULT_STORE)
+    args = parser.parse_args(argv)
+
+    if args.command == 'compile':
+        files = []
+        for src in args.sources:
+            files.extend(source_files(src) if os.path.isdir(src) else [src])
+        ids = compile_courses(files, args.output)
+        print(f"{args.output}: {len(ids)}개 코스 ({', '.join(ids)})")
+    else:
+        store = CourseStore(args.store)
+        for course_id in store.course_ids():
+            course = store.course(course_id)
+            print(f"{course_id}: {course.name} ({len(course)}홀)")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
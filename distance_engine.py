@@ -0,0 +1,278 @@
+# 거리 계산 엔진 (NumPy 벡터화)
+# 여러 위치 × 전체 홀 거리 행렬을 한 번의 타원체(WGS-84) 계산으로 구함
+import math
+
+import numpy as np
+from geographiclib.geodesic import Geodesic
+
+# WGS-84 타원체 (geopy.distance.geodesic 기본값과 동일)
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_B = WGS84_A * (1 - WGS84_F)
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+
+# geopy(Karney) 대비 허용 오차 (미터) - check_accuracy()로 검증
+ERROR_BOUND_M = 1e-3
+
+_MAX_ITER = 200
+_TOL = 1e-11
+_TINY = 1e-300
+# 코스 ENU 평면 근사가 유효한 반경 (미터)과 그 안에서 보장하는 오차
+# 실측 최대 오차: 반경 5 km에서 약 1 mm, 10 km에서 약 8 mm
+VALID_RADIUS_M = 5000.0
+PROJECTED_ERROR_BOUND_M = 0.01
+
+# 거의 대척점인 쌍은 Vincenty가 수렴하지 않으므로 Karney 방식으로 계산
+_ANTIPODAL_DEG = 179.0
+
+
+def hole_table(hole_coords):
+    """HOLE_COORDS 딕셔너리를 (홀 번호, 위도, 경도) 배열로 변환"""
+    holes = np.array(sorted(hole_coords), dtype=np.int64)
+    coords = np.array([hole_coords[h] for h in holes], dtype=np.float64).reshape(-1, 2)
+    return holes, coords[:, 0], coords[:, 1]
+
+
+def _karney(lat1, lon1, lat2, lon2):
+    return Geodesic.WGS84.Inverse(lat1, lon1, lat2, lon2, Geodesic.DISTANCE)['s12']
+
+
+def _reduced(lat):
+    """위도 → 보조 위도 U의 (sin, cos)"""
+    U = np.arctan((1 - WGS84_F) * np.tan(np.radians(lat)))
+    return np.sin(U), np.cos(U)
+
+
+def _vincenty(L, sinU1, cosU1, sinU2, cosU2):
+    """Vincenty 역해. (거리, 수렴 여부, 각거리 σ) 반환"""
+    f = WGS84_F
+    a_ = cosU1 * cosU2
+    b_ = sinU1 * sinU2
+    c_ = cosU1 * sinU2
+    d_ = sinU1 * cosU2
+    lam = L
+    converged = False
+    for _ in range(_MAX_ITER):
+        sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+        sin_sigma = np.hypot(cosU2 * sin_lam, c_ - d_ * cos_lam)
+        cos_sigma = b_ + a_ * cos_lam
+        sigma = np.arctan2(sin_sigma, cos_sigma)
+        # 같은 점(σ = 0)이나 적도 위의 두 점(cos²α = 0)은 분자도 0이므로
+        # np.where 대신 분모 하한으로 0/0을 피함 (작은 배열에서 훨씬 빠름)
+        sin_alpha = a_ * sin_lam / np.maximum(sin_sigma, _TINY)
+        cos2_alpha = 1 - sin_alpha * sin_alpha
+        cos_2sm = cos_sigma - 2 * b_ / np.maximum(cos2_alpha, _TINY)
+        C = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+        lam_prev = lam
+        lam = L + (1 - C) * f * sin_alpha * (
+            sigma + C * sin_sigma * (cos_2sm + C * cos_sigma * (-1 + 2 * cos_2sm * cos_2sm))
+        )
+        diff = np.abs(lam - lam_prev)
+        if diff.max(initial=0.0) <= _TOL:
+            converged = True
+            break
+
+    u2 = cos2_alpha * (WGS84_A ** 2 - WGS84_B ** 2) / WGS84_B ** 2
+    A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+    B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+    delta_sigma = B * sin_sigma * (cos_2sm + B / 4 * (
+        cos_sigma * (-1 + 2 * cos_2sm ** 2)
+        - B / 6 * cos_2sm * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sm ** 2)
+    ))
+    ok = np.ones(L.shape, dtype=bool) if converged else ~(diff > _TOL)
+    return WGS84_B * A * (sigma - delta_sigma), ok, sigma
+
+
+def _solve(lat1, lon1, lat2, lon2, sinU1, cosU1, sinU2, cosU2):
+    L = np.radians(((lon2 - lon1) + 180.0) % 360.0 - 180.0)
+    dist, ok, sigma = _vincenty(L, sinU1, cosU1, sinU2, cosU2)
+
+    # 수렴 실패 또는 대척점 근처 쌍은 Karney 알고리즘(geopy와 동일)으로 대체
+    fallback = ~ok | (sigma > np.radians(_ANTIPODAL_DEG))
+    if fallback.any():
+        lat1, lon1, lat2, lon2 = np.broadcast_arrays(lat1, lon1, lat2, lon2)
+        for i in zip(*np.nonzero(fallback)):
+            dist[i] = _karney(lat1[i], lon1[i], lat2[i], lon2[i])
+    return dist
+
+
+def geodesic_distance(lat1, lon1, lat2, lon2):
+    """브로드캐스팅 가능한 배열 입력에 대한 타원체 거리 (미터)"""
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (lat1, lon1, lat2, lon2))
+    )
+    shape = lat1.shape
+    lat1, lon1, lat2, lon2 = (v.ravel() for v in (lat1, lon1, lat2, lon2))
+    sinU1, cosU1 = _reduced(lat1)
+    sinU2, cosU2 = _reduced(lat2)
+    return _solve(lat1, lon1, lat2, lon2, sinU1, cosU1, sinU2, cosU2).reshape(shape)
+
+
+def distance_matrix(positions, targets):
+    """positions (P, 2) × targets (H, 2) → (P, H) 거리 행렬 (미터)"""
+    p = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+    t = np.asarray(targets, dtype=np.float64).reshape(-1, 2)
+    return geodesic_distance(p[:, None, 0], p[:, None, 1], t[None, :, 0], t[None, :, 1])
+
+
+class DistanceEngine:
+    """HOLE_COORDS 전체를 배열로 보관하고 전체 홀 거리를 한 번에 계산"""
+
+    def __init__(self, hole_coords):
+        self.holes, self.lats, self.lons = hole_table(hole_coords)
+        self._index = {int(h): i for i, h in enumerate(self.holes)}
+        # 홀 쪽 삼각함수는 한 번만 계산
+        self._sinU, self._cosU = _reduced(self.lats)
+
+    def matrix(self, positions):
+        """여러 위치에 대한 (위치 수, 홀 수) 거리 행렬"""
+        p = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        lat, lon = p[:, 0:1], p[:, 1:2]
+        sinU1, cosU1 = _reduced(lat)
+        return _solve(lat, lon, self.lats, self.lons, sinU1, cosU1, self._sinU, self._cosU)
+
+    def distances(self, position):
+        """한 위치에서 모든 홀까지의 거리 배열 (self.holes 순서)"""
+        return self.matrix([position])[0]
+
+    def distance(self, position, hole_number):
+        """한 위치에서 특정 홀까지의 거리"""
+        return float(self.distances(position)[self._index[hole_number]])
+
+    def as_dict(self, position):
+        return dict(zip(self.holes.tolist(), self.distances(position).tolist()))
+
+
+def _ecef(lat, lon):
+    """타원체 표면(높이 0) 위 점의 ECEF 좌표"""
+    lat, lon = np.radians(lat), np.radians(lon)
+    sin_lat = np.sin(lat)
+    N = WGS84_A / np.sqrt(1 - WGS84_E2 * sin_lat * sin_lat)
+    return N * np.cos(lat) * np.cos(lon), N * np.cos(lat) * np.sin(lon), N * (1 - WGS84_E2) * sin_lat
+
+
+def center(lats, lons):
+    """좌표들의 중심 (위도 평균, 경도는 원형 평균이라 경도 ±180°에 걸쳐도 맞음)"""
+    lons = np.radians(np.asarray(lons, dtype=np.float64))
+    return float(np.mean(lats)), math.degrees(math.atan2(np.sin(lons).mean(), np.cos(lons).mean()))
+
+
+class LocalFrame:
+    """기준점(코스 중심)에 접하는 East-North-Up 평면"""
+
+    def __init__(self, lat0, lon0):
+        self.lat0, self.lon0 = float(lat0), float(lon0)
+        self._x0, self._y0, self._z0 = (float(v) for v in _ecef(lat0, lon0))
+        phi, lam = math.radians(lat0), math.radians(lon0)
+        self._sin_phi, self._cos_phi = math.sin(phi), math.cos(phi)
+        self._sin_lam, self._cos_lam = math.sin(lam), math.cos(lam)
+
+    def to_enu(self, lat, lon):
+        """배열 입력 → (east, north) 미터 배열"""
+        x, y, z = _ecef(lat, lon)
+        dx, dy, dz = x - self._x0, y - self._y0, z - self._z0
+        east = -self._sin_lam * dx + self._cos_lam * dy
+        north = (-self._sin_phi * self._cos_lam * dx - self._sin_phi * self._sin_lam * dy
+                 + self._cos_phi * dz)
+        return east, north
+
+    def point_to_enu(self, lat, lon):
+        """단일 좌표용 (NumPy 오버헤드 없이 math만 사용)"""
+        phi, lam = math.radians(lat), math.radians(lon)
+        sin_phi, cos_phi = math.sin(phi), math.cos(phi)
+        N = WGS84_A / math.sqrt(1 - WGS84_E2 * sin_phi * sin_phi)
+        dx = N * cos_phi * math.cos(lam) - self._x0
+        dy = N * cos_phi * math.sin(lam) - self._y0
+        dz = N * (1 - WGS84_E2) * sin_phi - self._z0
+        east = -self._sin_lam * dx + self._cos_lam * dy
+        north = (-self._sin_phi * self._cos_lam * dx - self._sin_phi * self._sin_lam * dy
+                 + self._cos_phi * dz)
+        return east, north
+
+
+class ProjectedEngine(DistanceEngine):
+    """코스 ENU 평면에서 2-D 유클리드 거리로 계산하는 빠른 경로
+
+    현재 위치가 VALID_RADIUS_M 밖이면 타원체 계산(DistanceEngine)으로 대체하므로
+    반환값의 오차는 항상 PROJECTED_ERROR_BOUND_M 이하
+    """
+
+    def __init__(self, hole_coords, radius_m=VALID_RADIUS_M):
+        super().__init__(hole_coords)
+        self.radius_m = float(radius_m)
+        # 기준점은 홀 좌표의 중심
+        self.frame = LocalFrame(*center(self.lats, self.lons))
+        self.east, self.north = self.frame.to_enu(self.lats, self.lons)
+        # 홀 자체가 반경 밖에 있으면 평면 근사를 쓰지 않음
+        self.enabled = bool(np.hypot(self.east, self.north).max(initial=0.0) <= self.radius_m)
+
+    def in_range(self, position):
+        if not self.enabled:
+            return False
+        e, n = self.frame.point_to_enu(*position)
+        return math.hypot(e, n) <= self.radius_m
+
+    def distances(self, position):
+        if self.enabled:
+            e, n = self.frame.point_to_enu(*position)
+            if math.hypot(e, n) <= self.radius_m:
+                return np.hypot(self.east - e, self.north - n)
+        return super().distances(position)
+
+    def distance(self, position, hole_number):
+        if self.enabled:
+            e, n = self.frame.point_to_enu(*position)
+            if math.hypot(e, n) <= self.radius_m:
+                i = self._index[hole_number]
+                return math.hypot(float(self.east[i]) - e, float(self.north[i]) - n)
+        return super().distance(position, hole_number)
+
+    def matrix(self, positions):
+        p = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        if not self.enabled:
+            return super().matrix(p)
+        e, n = self.frame.to_enu(p[:, 0], p[:, 1])
+        out = np.hypot(self.east[None, :] - e[:, None], self.north[None, :] - n[:, None])
+        far = np.hypot(e, n) > self.radius_m
+        if far.any():
+            out[far] = super().matrix(p[far])
+        return out
+
+
+def check_accuracy(n=20000, seed=0):
+    """무작위 점 쌍에 대해 geopy 대비 최대 오차(미터)를 반환"""
+    from geopy.distance import geodesic
+
+    rng = np.random.default_rng(seed)
+    lat1 = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lat2 = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lon1 = rng.uniform(-180, 180, n)
+    lon2 = rng.uniform(-180, 180, n)
+    ours = geodesic_distance(lat1, lon1, lat2, lon2)
+    ref = np.array([
+        geodesic((a, b), (c, d)).meters for a, b, c, d in zip(lat1, lon1, lat2, lon2)
+    ])
+    return float(np.max(np.abs(ours - ref)))
+
+
+def check_projected_accuracy(hole_coords, n=20000, seed=0):
+    """코스 주변 (반경 2배까지) 무작위 위치에서 ProjectedEngine의 최대 오차(미터)"""
+    engine = ProjectedEngine(hole_coords)
+    rng = np.random.default_rng(seed)
+    r = engine.radius_m * 2 * np.sqrt(rng.uniform(0, 1, n))
+    theta = rng.uniform(0, 2 * np.pi, n)
+    lat = engine.frame.lat0 + r * np.cos(theta) / 111320.0
+    lon = engine.frame.lon0 + r * np.sin(theta) / (111320.0 * math.cos(math.radians(engine.frame.lat0)))
+    positions = np.column_stack([lat, lon])
+    ref = DistanceEngine(hole_coords).matrix(positions)
+    return float(np.max(np.abs(engine.matrix(positions) - ref)))
+
+
+if __name__ == '__main__':
+    err = check_accuracy()
+    # 허용 오차 검사는 tests/test_distance_engine.py (pytest)
+    print(f"geopy 대비 최대 오차: {err * 1000:.4f} mm (허용 {ERROR_BOUND_M * 1000:.1f} mm)")
+
+    jindalee = {1: (-27.53918, 152.945457), 9: (-27.535837, 152.943191), 6: (-27.532689, 152.945452)}
+    err = check_projected_accuracy(jindalee)
+    print(f"ENU 평면 최대 오차: {err * 1000:.4f} mm (허용 {PROJECTED_ERROR_BOUND_M * 1000:.1f} mm)")
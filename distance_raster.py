@@ -0,0 +1,262 @@
+# 홀컵 거리 래스터 (미리 계산한 거리 격자 + 메모리 매핑)
+#
+# 코스 경계 상자를 약 1 m 간격의 위·경도 격자로 나누고, 각 격자점에서 모든 홀컵까지의
+# 거리를 저장함 (최대 거리가 1024 m 미만이면 float16, 이상이면 float32 — float16 간격은
+# 512~1024 m에서 0.5 m, 1024~2048 m에서 1 m, 그 이상 2 m). 실시간 위치 조회는 격자 인덱스
+# 계산과 주변 4점의 쌍선형 보간뿐 (삼각함수 없음)
+#
+# 오차 상한은 래스터마다 build_raster()가 최대 거리로 계산해 메타데이터(error_bound_m)에 저장
+#
+# 파일: cache/rasters/<코스>-<해시>.npy, 모양 (위도 칸, 경도 칸, 홀) — 한 격자점의 모든
+# 홀 거리가 붙어 있어 조회 한 번이 캐시 라인 몇 개만 읽음. 격자 정보는 같은 이름의 .json
+#
+#   python distance_raster.py build jindalee
+#   python distance_raster.py validate jindalee
+#   python distance_raster.py info
+import glob
+import hashlib
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+from distance_engine import PROJECTED_ERROR_BOUND_M, LocalFrame, center
+
+RASTER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'rasters')
+
+_M_PER_DEG_LAT = 111320.0
+DEFAULT_STEP_M = 1.0
+DEFAULT_MARGIN_M = 100.0
+# float16 저장 시 반올림 오차가 이 값을 넘으면 (최대 거리 1024 m 이상) float32로 저장
+ROUNDING_LIMIT_M = 0.25
+
+
+def error_bound(dtype, max_distance_m, step_m):
+    """래스터 조회의 geodesic 대비 오차 상한 (m)
+
+    저장 반올림(최대 거리에서의 값 간격의 절반) + 쌍선형 보간 + ENU 평면 근사.
+    보간 오차는 홀컵이 든 격자 칸의 가운데에서 가장 커서 칸 대각선의 절반
+    """
+    rounding = float(np.spacing(np.dtype(dtype).type(max_distance_m))) / 2
+    return rounding + step_m * math.sqrt(0.5) + PROJECTED_ERROR_BOUND_M
+
+
+def _storage_dtype(max_distance_m):
+    rounding = float(np.spacing(np.float16(max_distance_m))) / 2
+    return np.float16 if rounding <= ROUNDING_LIMIT_M else np.float32
+
+
+def _course_key(course):
+    digest = hashlib.sha1()
+    for key in ('number', 'pin', 'tee', 'green', 'fairway', 'hazard'):
+        digest.update(getattr(course, key).tobytes())
+    return f"{course.id}-{digest.hexdigest()[:12]}"
+
+
+def raster_path(course):
+    return os.path.join(RASTER_DIR, _course_key(course) + '.npy')
+
+
+def build_raster(course, step_m=DEFAULT_STEP_M, margin_m=DEFAULT_MARGIN_M, path=None):
+    """코스 거리 래스터를 만들어 저장하고 경로를 반환
+
+    거리는 코스 중심 ENU 평면에서 계산 (ProjectedEngine과 같은 방식, 오차 1 cm 이하)
+    """
+    path = path or raster_path(course)
+    south, west, north, east = course.bounds(margin_m)
+    lat_step = step_m / _M_PER_DEG_LAT
+    lon_step = lat_step / math.cos(math.radians((south + north) / 2))
+    ny = int(math.ceil((north - south) / lat_step)) + 1
+    nx = int(math.ceil((east - west) / lon_step)) + 1
+
+    frame = LocalFrame(*center(course.pin[:, 0], course.pin[:, 1]))
+    pin_e, pin_n = frame.to_enu(course.pin[:, 0], course.pin[:, 1])
+    lons = west + lon_step * np.arange(nx)
+
+    # 홀컵까지의 거리는 볼록 함수이므로 최댓값은 격자 모서리에서 나옴 (저장 형식 선택용)
+    corner_e, corner_n = frame.to_enu(
+        np.array([south, south, north, north]), np.array([west, east, west, east])
+    )
+    corner_max = float(np.hypot(corner_e[:, None] - pin_e, corner_n[:, None] - pin_n).max())
+    dtype = _storage_dtype(corner_max * 1.01)
+
+    os.makedirs(RASTER_DIR, exist_ok=True)
+    tmp = path + '.tmp'
+    out = np.lib.format.open_memmap(tmp, mode='w+', dtype=dtype, shape=(ny, nx, len(course.pin)))
+    rows = max(1, (1 << 22) // (nx * len(course.pin)))
+    max_distance = 0.0
+    for i0 in range(0, ny, rows):
+        lats = south + lat_step * np.arange(i0, min(i0 + rows, ny))
+        e, n = frame.to_enu(lats[:, None], lons[None, :])
+        block = np.hypot(e[..., None] - pin_e, n[..., None] - pin_n)
+        max_distance = max(max_distance, float(block.max()))
+        out[i0:i0 + len(lats)] = block
+    out.flush()
+    del out
+    os.replace(tmp, path)
+
+    meta = {
+        'course': course.id, 'holes': [int(h) for h in course.number],
+        'south': south, 'west': west, 'lat_step': lat_step, 'lon_step': lon_step,
+        'shape': [ny, nx, len(course.pin)], 'step_m': step_m,
+        'max_distance_m': max_distance,
+        'error_bound_m': error_bound(dtype, max_distance, step_m),
+    }
+    with open(path[:-4] + '.json', 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    return path
+
+
+class DistanceRaster:
+    """메모리 매핑된 거리 래스터. 격자 밖 위치는 fallback 엔진(있으면)으로 계산"""
+
+    def __init__(self, path, fallback=None):
+        with open(path[:-4] + '.json', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.path = path
+        # np.memmap 하위 클래스는 슬라이싱마다 부가 처리가 있어 일반 ndarray 뷰로 사용
+        self.grid = np.load(path, mmap_mode='r').view(np.ndarray)
+        self.holes = np.array(meta['holes'])
+        self._index = {h: k for k, h in enumerate(meta['holes'])}
+        self._south, self._west = meta['south'], meta['west']
+        self._inv_lat, self._inv_lon = 1.0 / meta['lat_step'], 1.0 / meta['lon_step']
+        self._ny, self._nx = meta['shape'][0] - 1, meta['shape'][1] - 1
+        self.fallback = fallback
+        # 오차 상한이 없는 이전 형식 메타데이터는 격자 대각선 길이를 최대 거리로 잡아 계산
+        self.error_bound_m = meta.get('error_bound_m')
+        if self.error_bound_m is None:
+            step = meta['step_m']
+            diagonal = math.hypot(meta['shape'][0] * step, meta['shape'][1] * step)
+            self.error_bound_m = error_bound(self.grid.dtype, diagonal, step)
+
+    @property
+    def nbytes(self):
+        return self.grid.nbytes
+
+    def _cell(self, lat, lon):
+        # 좌표가 없는 GPS 위치(NaN/inf)는 격자 밖과 같이 처리 (fallback 엔진으로)
+        fy = (lat - self._south) * self._inv_lat
+        fx = (lon - self._west) * self._inv_lon
+        if not (math.isfinite(fy) and math.isfinite(fx)):
+            return None
+        i, j = int(fy), int(fx)
+        if fy < 0 or fx < 0 or i >= self._ny or j >= self._nx:
+            return None
+        return i, j, fy - i, fx - j
+
+    def distances(self, position):
+        """모든 홀까지의 거리 배열 (self.holes 순서)"""
+        cell = self._cell(*position)
+        if cell is None:
+            if self.fallback is None:
+                raise ValueError("래스터 범위 밖의 위치입니다.")
+            return self.fallback.distances(position)
+        i, j, ty, tx = cell
+        weights = np.array([(1 - ty) * (1 - tx), (1 - ty) * tx, ty * (1 - tx), ty * tx])
+        return weights @ self.grid[i:i + 2, j:j + 2].reshape(4, -1)
+
+    def distance(self, position, hole_number):
+        cell = self._cell(*position)
+        if cell is None:
+            if self.fallback is None:
+                raise ValueError("래스터 범위 밖의 위치입니다.")
+            return self.fallback.distance(position, hole_number)
+        i, j, ty, tx = cell
+        k = self._index[hole_number]
+        g = self.grid
+        a, b = float(g[i, j, k]), float(g[i, j + 1, k])
+        c, d = float(g[i + 1, j, k]), float(g[i + 1, j + 1, k])
+        top = a + (b - a) * tx
+        return top + (c + (d - c) * tx - top) * ty
+
+    def matrix(self, positions):
+        """positions (P, 2) → (P, 홀) 거리 행렬. 격자 밖 위치는 fallback 엔진으로 계산"""
+        p = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        fy = (p[:, 0] - self._south) * self._inv_lat
+        fx = (p[:, 1] - self._west) * self._inv_lon
+        inside = np.isfinite(fy) & np.isfinite(fx) & (fy >= 0) & (fx >= 0) & (fy < self._ny) & (fx < self._nx)
+        out = np.empty((len(p), len(self.holes)))
+        i, j = fy[inside].astype(np.int64), fx[inside].astype(np.int64)
+        ty, tx = (fy[inside] - i)[:, None], (fx[inside] - j)[:, None]
+        g = self.grid
+        top = g[i, j] + (g[i, j + 1] - g[i, j].astype(np.float64)) * tx
+        bottom = g[i + 1, j] + (g[i + 1, j + 1] - g[i + 1, j].astype(np.float64)) * tx
+        out[inside] = top + (bottom - top) * ty
+        if not inside.all():
+            if self.fallback is None:
+                raise ValueError("래스터 범위 밖의 위치입니다.")
+            out[~inside] = self.fallback.matrix(p[~inside])
+        return out
+
+    def as_dict(self, position):
+        return dict(zip(self.holes.tolist(), self.distances(position).tolist()))
+
+
+def open_raster(course, fallback=None):
+    """이 코스 데이터로 만든 래스터가 있으면 열고, 없으면 None"""
+    path = raster_path(course)
+    return DistanceRaster(path, fallback) if os.path.exists(path) else None
+
+
+def validate(course, raster, samples=2000, seed=0):
+    """래스터 범위 안의 무작위 위치에서 geopy.distance.geodesic과 비교한 오차 (m)"""
+    from geopy.distance import geodesic
+
+    rng = np.random.default_rng(seed)
+    ny, nx = raster.grid.shape[:2]
+    lats = raster._south + rng.uniform(0, ny - 1, samples) / raster._inv_lat
+    lons = raster._west + rng.uniform(0, nx - 1, samples) / raster._inv_lon
+    errors = []
+    for lat, lon in zip(lats.tolist(), lons.tolist()):
+        got = raster.distances((lat, lon))
+        for k, (plat, plon) in enumerate(course.pin.tolist()):
+            errors.append(abs(got[k] - geodesic((lat, lon), (plat, plon)).meters))
+    errors = np.array(errors)
+    return {'samples': samples, 'max': float(errors.max()),
+            'p99': float(np.percentile(errors, 99)), 'mean': float(errors.mean())}
+
+
+def main(argv=None):
+    import argparse
+
+    from course_data import load_course
+
+    parser = argparse.ArgumentParser(description="홀컵 거리 래스터 만들기/검증")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build')
+    build.add_argument('course')
+    build.add_argument('--step', type=float, default=DEFAULT_STEP_M, help="격자 간격 (m)")
+    build.add_argument('--margin', type=float, default=DEFAULT_MARGIN_M, help="코스 바깥 여유 (m)")
+    check = sub.add_parser('validate')
+    check.add_argument('course')
+    check.add_argument('--samples', type=int, default=2000)
+    sub.add_parser('info')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        course = load_course(args.course)
+        path = build_raster(course, args.step, args.margin)
+        raster = DistanceRaster(path)
+        print(f"{path}: {raster.grid.shape} {raster.grid.dtype}, {raster.nbytes / 2**20:.1f} MiB, "
+              f"오차 상한 {raster.error_bound_m:.3f} m")
+    elif args.command == 'validate':
+        course = load_course(args.course)
+        raster = open_raster(course)
+        if raster is None:
+            print(f"{args.course}: 래스터가 없습니다. 먼저 build를 실행하세요.")
+            return 1
+        result = validate(course, raster, args.samples)
+        print(f"{args.course}: 표본 {result['samples']}개 × 홀 {len(course.pin)}개, "
+              f"최대 {result['max']:.3f} m, p99 {result['p99']:.3f} m, 평균 {result['mean']:.3f} m "
+              f"(상한 {raster.error_bound_m:.3f} m)")
+        return 0 if result['max'] <= raster.error_bound_m else 1
+    else:
+        for path in sorted(glob.glob(os.path.join(RASTER_DIR, '*.npy'))):
+            grid = np.load(path, mmap_mode='r')
+            print(f"{os.path.basename(path)}: {grid.shape}, {grid.nbytes / 2**20:.1f} MiB")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
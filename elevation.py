@@ -0,0 +1,230 @@
+# 고저차 반영 거리 (plays-like)
+#
+# 수치표고모델(DEM)을 256×256 타일 단위로 나눈 float32 배열(.npy)로 변환해 두고
+# 메모리 매핑으로 엶. 조회할 때 필요한 타일만 읽어 LRU 캐시에 보관하므로
+# 코스 주변 타일만 메모리에 올라옴. 표고는 쌍선형 보간으로 여러 지점을 한 번에 계산
+#
+# 변환 (위경도 좌표계 EPSG:4326 DEM만 지원. 다른 좌표계는 gdalwarp -t_srs EPSG:4326 으로 먼저 변환)
+#   python elevation.py convert dem.tif --course jindalee     # GeoTIFF (rasterio 필요)
+#   python elevation.py convert dem.asc --course jindalee     # ESRI ASCII grid
+#   python elevation.py sample -27.539 152.945
+import json
+import math
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_DEM = os.environ.get(
+    'GOLF_DEM',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'dem', 'dem.npy'),
+)
+TILE = 256
+
+# 높이 1 m 차이를 거리 몇 m로 환산할지 (오르막 +, 내리막 -)
+DEFAULT_FACTOR = 1.0
+
+
+def _read_ascii_grid(path):
+    """ESRI ASCII grid → (배열, west, north, 셀 크기, nodata). 첫 행이 북쪽"""
+    header = {}
+    with open(path, encoding='ascii') as f:
+        for _ in range(6):
+            pos = f.tell()
+            parts = f.readline().split()
+            if not parts or not parts[0][0].isalpha():
+                f.seek(pos)
+                break
+            header[parts[0].lower()] = float(parts[1])
+        data = np.loadtxt(f, dtype=np.float32)
+    rows, cell = int(header['nrows']), header['cellsize']
+    west = header.get('xllcorner', header.get('xllcenter', 0) - cell / 2)
+    south = header.get('yllcorner', header.get('yllcenter', 0) - cell / 2)
+    return data.reshape(rows, -1), west, south + rows * cell, cell, cell, header.get('nodata_value')
+
+
+def _read_geotiff(path, bounds=None):
+    try:
+        import rasterio
+        from rasterio.windows import from_bounds
+    except ImportError:
+        raise RuntimeError("GeoTIFF 변환에는 rasterio가 필요합니다 (pip install rasterio)") from None
+    with rasterio.open(path) as src:
+        window = None
+        if bounds is not None:
+            south, west, north, east = bounds
+            window = from_bounds(west, south, east, north, src.transform).round_offsets().round_lengths()
+        data = src.read(1, window=window).astype(np.float32)
+        transform = src.window_transform(window) if window is not None else src.transform
+        return data, transform.c, transform.f, transform.a, -transform.e, src.nodata
+
+
+def convert(src_path, out_path=DEFAULT_DEM, bounds=None):
+    """DEM 파일 → 타일 배열 .npy (+ 같은 이름의 .json 메타데이터)
+
+    bounds(남, 서, 북, 동)를 주면 그 범위만 잘라서 저장
+    """
+    if src_path.endswith('.asc'):
+        data, west, north, lon_step, lat_step, nodata = _read_ascii_grid(src_path)
+        if bounds is not None:
+            south_b, west_b, north_b, east_b = bounds
+            r0 = max(0, int(math.floor((north - north_b) / lat_step)))
+            r1 = min(data.shape[0], int(math.ceil((north - south_b) / lat_step)) + 1)
+            c0 = max(0, int(math.floor((west_b - west) / lon_step)))
+            c1 = min(data.shape[1], int(math.ceil((east_b - west) / lon_step)) + 1)
+            data = data[r0:r1, c0:c1]
+            west, north = west + c0 * lon_step, north - r0 * lat_step
+    else:
+        data, west, north, lon_step, lat_step, nodata = _read_geotiff(src_path, bounds)
+    if nodata is not None:
+        data = np.where(data == nodata, np.nan, data).astype(np.float32)
+
+    rows, cols = data.shape
+    ty, tx = -(-rows // TILE), -(-cols // TILE)
+    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+    tmp = out_path + '.tmp'
+    out = np.lib.format.open_memmap(tmp, mode='w+', dtype=np.float32, shape=(ty, tx, TILE, TILE))
+    out[:] = np.nan
+    for i in range(ty):
+        for j in range(tx):
+            block = data[i * TILE:(i + 1) * TILE, j * TILE:(j + 1) * TILE]
+            out[i, j, :block.shape[0], :block.shape[1]] = block
+    out.flush()
+    del out
+    os.replace(tmp, out_path)
+    meta = {'west': west, 'north': north, 'lon_step': lon_step, 'lat_step': lat_step,
+            'rows': rows, 'cols': cols, 'tile': TILE}
+    with open(out_path[:-4] + '.json', 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    return rows, cols
+
+
+class ElevationModel:
+    """타일 DEM. 타일은 처음 쓸 때 읽어 max_tiles개까지 LRU로 보관 (세션 간 공유, 스레드 안전)"""
+
+    def __init__(self, path=DEFAULT_DEM, max_tiles=64):
+        with open(path[:-4] + '.json', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.path = path
+        self._tiles = np.load(path, mmap_mode='r')
+        self._west, self._north = meta['west'], meta['north']
+        self._inv_lon, self._inv_lat = 1.0 / meta['lon_step'], 1.0 / meta['lat_step']
+        self.rows, self.cols = meta['rows'], meta['cols']
+        self.max_tiles = max_tiles
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _tile(self, key):
+        with self._lock:
+            tile = self._cache.get(key)
+            if tile is not None:
+                self._cache.move_to_end(key)
+                return tile
+        # 타일 읽기는 잠금 밖에서 (동시에 같은 타일을 읽으면 나중 것이 덮어씀)
+        tile = np.array(self._tiles[key])
+        with self._lock:
+            self._cache[key] = tile
+            while len(self._cache) > self.max_tiles:
+                self._cache.popitem(last=False)
+        return tile
+
+    def _values(self, r, c):
+        """정수 행/열 배열의 표고 (범위 밖은 NaN). 같은 타일의 점들은 한 번에 읽음"""
+        out = np.full(r.shape, np.nan, dtype=np.float64)
+        ok = (r >= 0) & (r < self.rows) & (c >= 0) & (c < self.cols)
+        if not ok.any():
+            return out
+        r, c = r[ok], c[ok]
+        tile_ids = (r // TILE) * self._tiles.shape[1] + c // TILE
+        values = np.empty(len(r))
+        for tid in np.unique(tile_ids).tolist():
+            m = tile_ids == tid
+            tile = self._tile(divmod(tid, self._tiles.shape[1]))
+            values[m] = tile[r[m] % TILE, c[m] % TILE]
+        out[ok] = values
+        return out
+
+    def elevation(self, lat, lon):
+        """한 지점의 표고 (실시간 위치용, NumPy 배열 연산 없이). DEM 밖이면 NaN"""
+        fy = (self._north - lat) * self._inv_lat - 0.5
+        fx = (lon - self._west) * self._inv_lon - 0.5
+        r, c = math.floor(fy), math.floor(fx)
+        if r < 0 or c < 0 or r + 1 >= self.rows or c + 1 >= self.cols:
+            return math.nan
+        ty, tx = fy - r, fx - c
+        q = []
+        for rr, cc in ((r, c), (r, c + 1), (r + 1, c), (r + 1, c + 1)):
+            q.append(float(self._tile((rr // TILE, cc // TILE))[rr % TILE, cc % TILE]))
+        top = q[0] + (q[1] - q[0]) * tx
+        return top + (q[2] + (q[3] - q[2]) * tx - top) * ty
+
+    def sample(self, lats, lons):
+        """여러 지점의 표고 (m, 쌍선형 보간). DEM 밖이면 NaN"""
+        lats, lons = np.broadcast_arrays(np.asarray(lats, dtype=np.float64),
+                                         np.asarray(lons, dtype=np.float64))
+        # 셀 중심 기준 좌표
+        fy = (self._north - lats) * self._inv_lat - 0.5
+        fx = (lons - self._west) * self._inv_lon - 0.5
+        r0, c0 = np.floor(fy).astype(np.int64).ravel(), np.floor(fx).astype(np.int64).ravel()
+        ty, tx = fy.ravel() - r0, fx.ravel() - c0
+        r = np.concatenate([r0, r0, r0 + 1, r0 + 1])
+        c = np.concatenate([c0, c0 + 1, c0, c0 + 1])
+        q = self._values(r, c).reshape(4, -1)
+        top = q[0] + (q[1] - q[0]) * tx
+        bottom = q[2] + (q[3] - q[2]) * tx
+        return (top + (bottom - top) * ty).reshape(lats.shape)
+
+
+class PlaysLike:
+    """홀컵 표고를 미리 샘플링해 두고, 위치마다 플레이어 표고 한 점만 조회"""
+
+    def __init__(self, course, dem, factor=DEFAULT_FACTOR):
+        self.dem = dem
+        self.factor = float(factor)
+        self.pin_elevation = dem.sample(course.pin[:, 0], course.pin[:, 1])
+
+    def adjust(self, position, distances):
+        """수평 거리 배열(홀 순서) → (plays-like 거리, 표고차) 배열. 표고를 모르면 수평 거리 그대로"""
+        here = self.dem.elevation(*position)
+        rise = self.pin_elevation - here
+        rise = np.where(np.isnan(rise), 0.0, rise)
+        return np.asarray(distances) + self.factor * rise, rise
+
+
+def open_dem(path=DEFAULT_DEM):
+    """DEM 파일이 있으면 열고, 없으면 None"""
+    return ElevationModel(path) if os.path.exists(path) else None
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DEM 변환/조회")
+    sub = parser.add_subparsers(dest='command', required=True)
+    conv = sub.add_parser('convert')
+    conv.add_argument('source')
+    conv.add_argument('-o', '--output', default=DEFAULT_DEM)
+    conv.add_argument('--course', help="이 코스 범위만 잘라서 저장")
+    conv.add_argument('--margin', type=float, default=300.0)
+    sample = sub.add_parser('sample')
+    sample.add_argument('lat', type=float)
+    sample.add_argument('lon', type=float)
+    sample.add_argument('--dem', default=DEFAULT_DEM)
+    args = parser.parse_args(argv)
+
+    if args.command == 'convert':
+        bounds = None
+        if args.course:
+            from course_data import load_course
+            bounds = load_course(args.course).bounds(args.margin)
+        rows, cols = convert(args.source, args.output, bounds)
+        size = os.path.getsize(args.output)
+        print(f"{args.output}: {rows}×{cols} 셀, {size / 2**20:.1f} MiB")
+    else:
+        print(f"{float(ElevationModel(args.dem).sample(args.lat, args.lon)):.2f} m")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,237 @@
+# 역지오코딩(좌표 → 주소) 캐시
+# 좌표를 격자 셀로 스냅한 뒤 메모리 LRU → SQLite → 실제 지오코더 순으로 조회
+# - 같은 셀을 여러 세션이 동시에 요청하면 한 번만 가져옴 (나머지는 결과를 기다림)
+# - 실제 지오코더 호출 간격은 min_interval초 이상 유지 (Nominatim 1 req/s 정책)
+# - 저장한 주소는 ttl초, 주소를 찾지 못한 결과(None)는 empty_ttl초가 지나면 다시 조회
+#   (메모리와 SQLite 모두 가져온 시각 기준)
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from geopy.location import Location
+
+from timing import timer
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'geocode.sqlite3')
+
+_M_PER_DEG_LAT = 111320.0
+
+
+class _Flight:
+    """진행 중인 조회 하나 (같은 셀을 기다리는 요청들이 공유)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class ReverseGeocodeCache:
+    """geopy 지오코더의 reverse()를 감싸는 캐시. 반환값은 geopy Location 또는 None"""
+
+    def __init__(self, geocoder, db_path=DEFAULT_DB, cell_m=25.0, max_entries=4096,
+                 min_interval=1.0, timeout=10, ttl=30 * 86400.0, empty_ttl=86400.0):
+        self.geocoder = geocoder
+        self.cell_m = float(cell_m)
+        self.max_entries = max_entries
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.ttl = ttl
+        self.empty_ttl = empty_ttl
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._flights = {}
+        self._rate_lock = threading.Lock()
+        self._last_call = 0.0
+
+        self._db = None
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS reverse_geocode ("
+                " cell_m REAL NOT NULL, i INTEGER NOT NULL, j INTEGER NOT NULL,"
+                " address TEXT, lat REAL, lon REAL, raw TEXT, fetched_at REAL NOT NULL,"
+                " PRIMARY KEY (cell_m, i, j))"
+            )
+            self._db.commit()
+        self._db_lock = threading.Lock()
+
+        self.counters = {
+            'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'coalesced': 0, 'errors': 0,
+        }
+        self._latency = {}
+
+    # -- 셀 계산 ------------------------------------------------------------
+
+    def cell(self, lat, lon):
+        """좌표 → 격자 셀 (i, j). 경도 간격은 셀 중심 위도에 맞춰 보정"""
+        lat_step = self.cell_m / _M_PER_DEG_LAT
+        i = math.floor(lat / lat_step)
+        lon_step = lat_step / max(math.cos(math.radians((i + 0.5) * lat_step)), 1e-6)
+        return i, math.floor(lon / lon_step)
+
+    def cell_center(self, i, j):
+        lat_step = self.cell_m / _M_PER_DEG_LAT
+        lat = (i + 0.5) * lat_step
+        lon_step = lat_step / max(math.cos(math.radians(lat)), 1e-6)
+        return lat, (j + 0.5) * lon_step
+
+    # -- 조회 --------------------------------------------------------------
+
+    def reverse(self, lat, lon):
+        start = time.perf_counter()
+        key = self.cell(lat, lon)
+        source = 'memory'
+        try:
+            with self._lock:
+                entry = self._memory.get(key)
+                if entry is not None and entry[0] > time.time():
+                    self._memory.move_to_end(key)
+                    self.counters['memory_hits'] += 1
+                    return entry[1]
+                flight = self._flights.get(key)
+                owner = flight is None
+                if owner:
+                    flight = self._flights[key] = _Flight()
+                else:
+                    self.counters['coalesced'] += 1
+
+            if not owner:
+                source = 'coalesced'
+                if not flight.done.wait(self.timeout):
+                    raise TimeoutError("주소 조회 대기 시간 초과")
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+
+            try:
+                found, result, fetched_at = self._load(key)
+                if found:
+                    source = 'disk'
+                    self._count('disk_hits')
+                else:
+                    source = 'geocoder'
+                    self._count('misses')
+                    result = self._fetch(*self.cell_center(*key))
+                    fetched_at = time.time()
+                    self._store(key, result, fetched_at)
+                self._remember(key, result, fetched_at)
+                flight.result = result
+                return result
+            except Exception as e:
+                self._count('errors')
+                flight.error = e
+                raise
+            finally:
+                with self._lock:
+                    self._flights.pop(key, None)
+                flight.done.set()
+        finally:
+            self._record(source, time.perf_counter() - start)
+
+    def _fetch(self, lat, lon):
+        # 실제 지오코더 호출은 한 번에 하나씩, min_interval 간격으로
+        with self._rate_lock:
+            wait = self._last_call + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                with timer('geocode.fetch'):
+                    return self.geocoder.reverse(f"{lat}, {lon}")
+            finally:
+                self._last_call = time.monotonic()
+
+    def _expires(self, result, fetched_at):
+        return fetched_at + (self.ttl if result is not None else self.empty_ttl)
+
+    def _remember(self, key, result, fetched_at):
+        with self._lock:
+            self._memory[key] = (self._expires(result, fetched_at), result)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _load(self, key):
+        """(찾음 여부, 결과, 가져온 시각). 만료된 항목은 없는 것으로 봄"""
+        if self._db is None:
+            return False, None, None
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT address, lat, lon, raw, fetched_at FROM reverse_geocode"
+                " WHERE cell_m = ? AND i = ? AND j = ?", (self.cell_m, *key)
+            ).fetchone()
+        if row is None:
+            return False, None, None
+        address, lat, lon, raw, fetched_at = row
+        result = None if address is None else Location(address, (lat, lon), json.loads(raw) if raw else {})
+        if self._expires(result, fetched_at) <= time.time():
+            return False, None, None
+        return True, result, fetched_at
+
+    def _store(self, key, location, fetched_at):
+        if self._db is None:
+            return
+        if location is None:
+            values = (None, None, None, None)
+        else:
+            raw = json.dumps(location.raw, ensure_ascii=False, default=str)
+            values = (location.address, location.latitude, location.longitude, raw)
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO reverse_geocode VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.cell_m, *key, *values, fetched_at),
+            )
+            self._db.commit()
+
+    # -- 통계 --------------------------------------------------------------
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _record(self, source, seconds):
+        with self._lock:
+            count, total, worst = self._latency.get(source, (0, 0.0, 0.0))
+            self._latency[source] = (count + 1, total + seconds, max(worst, seconds))
+
+    def stats(self):
+        """히트율과 조회 경로별 지연 시간 (평균/최대, 밀리초)"""
+        with self._lock:
+            c = dict(self.counters)
+            latency = {
+                source: {'count': n, 'avg_ms': total / n * 1000, 'max_ms': worst * 1000}
+                for source, (n, total, worst) in self._latency.items()
+            }
+        lookups = c['memory_hits'] + c['disk_hits'] + c['misses'] + c['coalesced']
+        hits = lookups - c['misses']
+        c['lookups'] = lookups
+        c['hit_rate'] = hits / lookups if lookups else 0.0
+        c['latency'] = latency
+        return c
+
+
+class StubGeocoder:
+    """네트워크 없이 쓰는 대체 지오코더 (테스트·벤치마크용)
+
+    delay초 뒤에 좌표가 들어간 가짜 주소를 돌려주고 호출 횟수를 센다
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def reverse(self, query, **kwargs):
+        with self._lock:
+            self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        lat, lon = (float(v) for v in query.split(','))
+        address = f"Stub Rd {lat:.5f}, {lon:.5f}, Jindalee QLD 4074, Australia"
+        return Location(address, (lat, lon), {'lat': lat, 'lon': lon, 'display_name': address})
@@ -0,0 +1,114 @@
+# GPS 위치 평활화 (등속 칼만 필터 + 정확도 기반 이상값 제거)
+#
+# 브라우저 watchPosition이 보내는 연속 위치(위도, 경도, 정확도 m, 시각 ms)를 받아
+# 흔들림을 줄인 위치를 돌려줌. 동·북 두 축은 같은 잡음 모델을 쓰므로 공분산 하나를
+# 공유하는 1-D 필터 두 개로 계산함 (NumPy 없이 스칼라 연산만)
+import math
+
+_M_PER_DEG_LAT = 111320.0
+
+# 자유도 2 카이제곱 99.9% 값 (이보다 큰 혁신 거리는 이상값으로 봄)
+GATE_CHI2 = 13.8
+
+
+class PositionFilter:
+    """등속(constant-velocity) 칼만 필터
+
+    accel_std: 보행/카트 이동의 가속도 표준편차 (m/s²)
+    max_accuracy_m: 보고된 정확도가 이보다 나쁜 위치는 버림
+    max_rejects: 연속으로 이만큼 버려지면 실제 이동으로 보고 필터를 다시 시작
+    """
+
+    def __init__(self, accel_std=1.0, max_accuracy_m=50.0, gate_chi2=GATE_CHI2, max_rejects=5):
+        self.accel_std = float(accel_std)
+        self.max_accuracy_m = float(max_accuracy_m)
+        self.gate_chi2 = float(gate_chi2)
+        self.max_rejects = max_rejects
+        self.reset()
+
+    def reset(self):
+        self._t = None
+        self.accepted = 0
+        self.rejected = 0
+        self._rejects_in_row = 0
+
+    # 기준점 근처의 등거리 원통 좌표 (미터). 같은 변환으로 되돌리므로 위치 손실 없음
+    def _to_xy(self, lat, lon):
+        return (lon - self._lon0) * self._m_per_deg_lon, (lat - self._lat0) * _M_PER_DEG_LAT
+
+    def _start(self, lat, lon, accuracy, t):
+        self._lat0, self._lon0 = lat, lon
+        self._m_per_deg_lon = _M_PER_DEG_LAT * math.cos(math.radians(lat))
+        self._x = [0.0, 0.0]   # 위치 (동, 북)
+        self._v = [0.0, 0.0]   # 속도
+        r = accuracy * accuracy
+        # 공분산 [[위치, 위치-속도], [위치-속도, 속도]] (두 축 공통)
+        self._p = [r, 0.0, 4.0]
+        self._t = t
+        self._rejects_in_row = 0
+
+    @property
+    def position(self):
+        """평활화된 (위도, 경도). 아직 위치가 없으면 None"""
+        if self._t is None:
+            return None
+        return (self._lat0 + self._x[1] / _M_PER_DEG_LAT,
+                self._lon0 + self._x[0] / self._m_per_deg_lon)
+
+    @property
+    def accuracy(self):
+        """추정 위치의 표준편차 (m)"""
+        return math.sqrt(self._p[0]) if self._t is not None else None
+
+    @property
+    def speed(self):
+        return math.hypot(*self._v) if self._t is not None else None
+
+    def update(self, lat, lon, accuracy, timestamp_ms):
+        """위치 하나를 반영. 받아들였으면 True, 버렸으면 False"""
+        accuracy = max(float(accuracy or self.max_accuracy_m), 1.0)
+        t = timestamp_ms / 1000.0
+        if accuracy > self.max_accuracy_m:
+            self.rejected += 1
+            return False
+        if self._t is None:
+            self._start(lat, lon, accuracy, t)
+            self.accepted += 1
+            return True
+        dt = t - self._t
+        if dt < 0:
+            self.rejected += 1
+            return False  # 순서가 뒤바뀐 위치 (이동 판단용 연속 거부 횟수에는 넣지 않음)
+
+        # 예측: x += v·dt, P = F P Fᵀ + Q (이산 백색 가속도 모델)
+        pp, pv, vv = self._p
+        q = self.accel_std * self.accel_std
+        dt2 = dt * dt
+        pp = pp + 2 * dt * pv + dt2 * vv + q * dt2 * dt2 / 4
+        pv = pv + dt * vv + q * dt2 * dt / 2
+        vv = vv + q * dt2
+        px = self._x[0] + self._v[0] * dt
+        py = self._x[1] + self._v[1] * dt
+
+        # 혁신과 이상값 검사 (정확도가 나쁠수록 허용 범위가 넓어짐)
+        mx, my = self._to_xy(lat, lon)
+        ex, ey = mx - px, my - py
+        s = pp + accuracy * accuracy
+        if (ex * ex + ey * ey) / s > self.gate_chi2:
+            self.rejected += 1
+            self._rejects_in_row += 1
+            if self._rejects_in_row >= self.max_rejects:
+                self._start(lat, lon, accuracy, t)
+                self.accepted += 1
+                return True
+            return False
+
+        # 갱신
+        kp, kv = pp / s, pv / s
+        self._x = [px + kp * ex, py + kp * ey]
+        self._v = [self._v[0] + kv * ex, self._v[1] + kv * ey]
+        self._p = [(1 - kp) * pp, (1 - kp) * pv, vv - kv * pv]
+        self._t = t
+        self._rejects_in_row = 0
+        self.accepted += 1
+        return True
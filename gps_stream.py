@@ -0,0 +1,70 @@
+# GPS 컴포넌트 (브라우저 위치 → 컴포넌트 값 → 서버)
+#
+# 위치와 오류는 모두 컴포넌트 값으로 돌아오므로 별도의 postMessage 수신 코드나
+# st.rerun()이 필요 없음. 연속 모드에서는 컴포넌트가 일정 거리 이상 움직였을 때만
+# (그리고 min_interval 간격 이상으로만) 값을 보내 리런 횟수를 줄임.
+# 값에는 아직 처리되지 않은 위치 목록이 들어 있고, 서버는 처리한 마지막 번호를
+# 다음 렌더링 인자(ack)로 돌려줌
+import os
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from gps_filter import PositionFilter
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gps_component', 'frontend')
+
+_component = components.declare_component('gps_stream', path=FRONTEND_DIR)
+
+
+def _state(state_key, with_filter=False):
+    state = st.session_state.get(state_key)
+    if state is None:
+        state = st.session_state[state_key] = {'stream': None, 'ack': 0}
+    if with_filter and 'filter' not in state:
+        state['filter'] = PositionFilter()
+    return state
+
+
+def _new_fixes(state, value):
+    """값에 들어 있는 위치 중 아직 처리하지 않은 것만"""
+    if value['stream'] != state['stream']:
+        # 페이지를 다시 열었거나 컴포넌트가 새로 만들어짐
+        state['stream'], state['ack'] = value['stream'], 0
+    fixes = [fix for fix in value['fixes'] if fix['seq'] > state['ack']]
+    if fixes:
+        state['ack'] = fixes[-1]['seq']
+    return fixes
+
+
+def gps_stream(active=True, min_interval=1.0, min_move_m=2.0, key='gps_stream', state_key='gps_filter'):
+    """연속 위치를 세션의 PositionFilter에 반영하고 (필터, 브라우저 오류 메시지)를 반환
+
+    필터의 position/accuracy가 평활화된 현재 위치. 움직임이 min_move_m보다 작으면
+    브라우저가 값을 보내지 않으므로 리런도 없음
+    """
+    state = _state(state_key, with_filter=True)
+    value = _component(
+        active=active, min_interval_ms=int(min_interval * 1000), min_move_m=min_move_m,
+        stream=state['stream'], ack=state['ack'], key=key, default=None,
+    )
+    position_filter = state['filter']
+    if not value:
+        return position_filter, None
+    for fix in _new_fixes(state, value):
+        position_filter.update(fix['lat'], fix['lon'], fix['accuracy'], fix['timestamp'])
+    return position_filter, value['error']
+
+
+def gps_request(request, key='gps_once', state_key='gps_once_state'):
+    """request 번호가 바뀔 때마다 위치를 한 번 요청
+
+    (위치 dict, 오류 메시지)를 반환. 해당 요청의 결과가 처음 도착한 실행에서만
+    위치가 들어 있고, 그 외에는 (None, None) 또는 (None, 오류)
+    """
+    state = _state(state_key)
+    value = _component(request=request, stream=state['stream'], ack=state['ack'], key=key, default=None)
+    if not value or value['request'] != request:
+        return None, None
+    fixes = _new_fixes(state, value)
+    return (fixes[-1] if fixes else None), value['error']
@@ -0,0 +1,89 @@
+# 그린 앞/가운데/뒤 거리
+#
+# 그린 외곽선을 코스 중심 ENU 평면으로 바꿔 모든 그린의 변(edge)을 한 배열로 이어 두고,
+# 현재 위치에서 각 그린 중심으로 향하는 플레이 선과 모든 변의 교차를 한 번에 계산함.
+#   앞 = 플레이 선이 그린에 들어가는 지점까지, 뒤 = 나가는 지점까지, 가운데 = 그린 중심까지
+# 그린 외곽선이 없는 홀은 앞/뒤가 NaN이고 가운데는 홀컵 거리
+import numpy as np
+
+from distance_engine import LocalFrame, center
+
+
+def _centroid(e, n):
+    """다각형 면적 중심 (신발끈 공식)"""
+    e1, n1 = np.roll(e, -1), np.roll(n, -1)
+    cross = e * n1 - e1 * n
+    area = cross.sum() / 2
+    if abs(area) < 1e-9:
+        return e.mean(), n.mean()
+    return ((e + e1) * cross).sum() / (6 * area), ((n + n1) * cross).sum() / (6 * area)
+
+
+class GreenGeometry:
+    """코스 전체 그린의 변 배열 (홀 순서는 course.number)"""
+
+    def __init__(self, course, frame=None):
+        self.holes = course.number.astype(np.int64)
+        self.frame = frame or LocalFrame(*center(course.pin[:, 0], course.pin[:, 1]))
+        pin_e, pin_n = self.frame.to_enu(course.pin[:, 0], course.pin[:, 1])
+
+        # 가운데 기준점: 그린이 있으면 면적 중심, 없으면 홀컵
+        self.center_e, self.center_n = pin_e.copy(), pin_n.copy()
+        ax, ay, dx, dy, owner, starts = [], [], [], [], [], []
+        count = 0
+        for i in range(len(self.holes)):
+            ring = course.green_polygon(i)
+            if len(ring) < 3:
+                continue
+            e, n = self.frame.to_enu(ring[:, 0], ring[:, 1])
+            self.center_e[i], self.center_n[i] = _centroid(e, n)
+            ax.append(e)
+            ay.append(n)
+            dx.append(np.roll(e, -1) - e)
+            dy.append(np.roll(n, -1) - n)
+            owner.append(np.full(len(e), i))
+            starts.append(count)
+            count += len(e)
+
+        self.has_green = np.zeros(len(self.holes), dtype=bool)
+        self._greens = np.array([int(o[0]) for o in owner], dtype=np.int64)
+        self.has_green[self._greens] = True
+        empty = np.empty(0)
+        self._ax = np.concatenate(ax) if ax else empty
+        self._ay = np.concatenate(ay) if ay else empty
+        self._dx = np.concatenate(dx) if dx else empty
+        self._dy = np.concatenate(dy) if dy else empty
+        self._owner = np.concatenate(owner) if owner else np.empty(0, dtype=np.int64)
+        self._starts = np.array(starts, dtype=np.int64)
+
+    def cards(self, position):
+        """(앞, 가운데, 뒤) 거리 배열 (m, self.holes 순서)"""
+        px, py = self.frame.point_to_enu(*position)
+        ux, uy = self.center_e - px, self.center_n - py
+        centre = np.hypot(ux, uy)
+        front = np.full(len(self.holes), np.nan)
+        back = np.full(len(self.holes), np.nan)
+        if not len(self._starts):
+            return front, centre, back
+
+        # 플레이 선 P + t·u 와 변 A + s·D 의 교점: 0 <= s <= 1 인 t (u는 단위 벡터)
+        length = np.maximum(centre, 1e-9)
+        ux, uy = (ux / length)[self._owner], (uy / length)[self._owner]
+        wx, wy = self._ax - px, self._ay - py
+        den = ux * self._dy - uy * self._dx
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = (wx * self._dy - wy * self._dx) / den
+            s = (wx * uy - wy * ux) / den
+        hit = (s >= 0) & (s <= 1) & np.isfinite(t)
+        near = np.minimum.reduceat(np.where(hit, t, np.inf), self._starts)
+        far = np.maximum.reduceat(np.where(hit, t, -np.inf), self._starts)
+
+        # 그린 안에 서 있으면 앞 거리는 0
+        front[self._greens] = np.where(np.isfinite(near), np.maximum(near, 0.0), np.nan)
+        back[self._greens] = np.where(np.isfinite(far), far, np.nan)
+        return front, centre, back
+
+    def card(self, position, hole_number):
+        front, centre, back = self.cards(position)
+        k = int(np.flatnonzero(self.holes == hole_number)[0])
+        return float(front[k]), float(centre[k]), float(back[k])
@@ -0,0 +1,157 @@
+# 해저드(벙커, 워터, OB) 캐리/레이업 거리
+#
+# 해저드 외곽선을 코스 중심 ENU 평면으로 바꾸고 경계 상자를 STR(Sort-Tile-Recursive)
+# 방식으로 묶은 R-tree에 넣어 둠. 현재 위치에서 목표 지점(홀컵)까지의 플레이 선 주변
+# 통로만 조회하므로 해저드가 수백 개인 코스도 후보는 몇 개뿐임
+#   레이업 = 해저드 앞쪽 가장자리까지 거리, 캐리 = 해저드를 넘기기 위한 거리(가장 먼 점)
+import math
+
+import numpy as np
+
+from course_data import HAZARD_KINDS
+from distance_engine import LocalFrame, center
+
+# 플레이 선 양쪽으로 이 거리 안에 걸치는 해저드를 "플레이 중"으로 봄 (m)
+DEFAULT_CORRIDOR_M = 25.0
+
+
+def _ranges(starts, ends):
+    """[start, end) 구간들을 이어붙인 인덱스 배열과 각 구간의 시작 위치 (파이썬 루프 없이)"""
+    lens = ends - starts
+    first = np.cumsum(lens) - lens
+    idx = np.arange(lens.sum()) - np.repeat(first - starts, lens)
+    return idx, first
+
+
+def _str_order(boxes, node_size):
+    """STR 순서: x 중심으로 정렬해 세로 띠로 나누고, 띠 안에서 y 중심으로 정렬"""
+    n = len(boxes)
+    cx = (boxes[:, 0] + boxes[:, 2]) / 2
+    cy = (boxes[:, 1] + boxes[:, 3]) / 2
+    strips = max(1, math.ceil(math.sqrt(math.ceil(n / node_size))))
+    per_strip = strips * node_size
+    order = np.argsort(cx, kind='stable')
+    for s in range(0, n, per_strip):
+        chunk = order[s:s + per_strip]
+        order[s:s + per_strip] = chunk[np.argsort(cy[chunk], kind='stable')]
+    return order
+
+
+class STRTree:
+    """정적 경계 상자 R-tree (STR 일괄 적재, 노드당 자식 node_size개)
+
+    레벨마다 상자 배열과 자식 범위(start, end)를 저장. 맨 아래 레벨의 항목은 원래 인덱스
+    """
+
+    def __init__(self, boxes, node_size=8):
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        order = _str_order(boxes, node_size) if len(boxes) else np.empty(0, dtype=np.int64)
+        self.items = order
+        levels = [(boxes[order], None)]
+        while len(levels[-1][0]) > node_size:
+            child = levels[-1][0]
+            starts = np.arange(0, len(child), node_size)
+            ends = np.minimum(starts + node_size, len(child))
+            parent = np.column_stack([
+                np.minimum.reduceat(child[:, 0], starts), np.minimum.reduceat(child[:, 1], starts),
+                np.maximum.reduceat(child[:, 2], starts), np.maximum.reduceat(child[:, 3], starts),
+            ])
+            # 부모 노드도 STR 순서로 다시 정렬 (자식 범위는 함께 옮김)
+            order = _str_order(parent, node_size)
+            levels.append((parent[order], np.column_stack([starts[order], ends[order]])))
+        self._levels = levels[::-1]
+
+    def query(self, box):
+        """box(minx, miny, maxx, maxy)와 겹치는 항목의 원래 인덱스 배열"""
+        minx, miny, maxx, maxy = box
+        nodes = np.arange(len(self._levels[0][0]))
+        for boxes, children in self._levels:
+            b = boxes[nodes]
+            nodes = nodes[(b[:, 0] <= maxx) & (b[:, 2] >= minx) & (b[:, 1] <= maxy) & (b[:, 3] >= miny)]
+            if children is not None:
+                if not len(nodes):
+                    break
+                nodes, _ = _ranges(children[nodes, 0], children[nodes, 1])
+        return self.items[nodes]
+
+
+def _segment_distance(px, py, ax, ay, bx, by):
+    """점 (px, py)에서 선분 A-B들까지의 최단 거리 (배열)"""
+    vx, vy = bx - ax, by - ay
+    len2 = np.maximum(vx * vx + vy * vy, 1e-12)
+    t = np.clip(((px - ax) * vx + (py - ay) * vy) / len2, 0.0, 1.0)
+    return np.hypot(px - ax - t * vx, py - ay - t * vy)
+
+
+class HazardIndex:
+    """코스 해저드 외곽선 + STR R-tree"""
+
+    def __init__(self, course, frame=None, node_size=8):
+        self.frame = frame or LocalFrame(*center(course.pin[:, 0], course.pin[:, 1]))
+        self.kind = course.hazard_kind
+        self.hole = course.hazard_hole
+        self.offsets = course.hazard_offsets
+        if len(course.hazard):
+            self.east, self.north = self.frame.to_enu(course.hazard[:, 0], course.hazard[:, 1])
+        else:
+            self.east = self.north = np.empty(0)
+        starts = self.offsets[:-1]
+        boxes = np.empty((len(self.kind), 4))
+        if len(self.kind):
+            boxes[:, 0] = np.minimum.reduceat(self.east, starts)
+            boxes[:, 1] = np.minimum.reduceat(self.north, starts)
+            boxes[:, 2] = np.maximum.reduceat(self.east, starts)
+            boxes[:, 3] = np.maximum.reduceat(self.north, starts)
+        self.tree = STRTree(boxes, node_size)
+        pin_e, pin_n = self.frame.to_enu(course.pin[:, 0], course.pin[:, 1])
+        self._pins = dict(zip(course.number.tolist(), zip(pin_e.tolist(), pin_n.tolist())))
+
+    def __len__(self):
+        return len(self.kind)
+
+    def in_play(self, position, hole_number, corridor_m=DEFAULT_CORRIDOR_M, target=None):
+        """현재 위치에서 목표(기본: 홀컵)까지 플레이 선 주변의 해저드
+
+        [{'index', 'kind', 'hole', 'layup', 'carry'}] (레이업 거리 순, m)
+        """
+        px, py = self.frame.point_to_enu(*position)
+        if target is None:
+            tx, ty = self._pins[hole_number]
+        else:
+            tx, ty = self.frame.point_to_enu(*target)
+        box = (min(px, tx) - corridor_m, min(py, ty) - corridor_m,
+               max(px, tx) + corridor_m, max(py, ty) + corridor_m)
+
+        length = max(math.hypot(tx - px, ty - py), 1e-9)
+        ux, uy = (tx - px) / length, (ty - py) / length
+
+        candidates = self.tree.query(box)
+        if not len(candidates):
+            return []
+
+        # 후보 해저드들의 꼭짓점을 한 배열로 모아 한 번에 계산 (변 = 꼭짓점 → 다음 꼭짓점)
+        starts, ends = self.offsets[candidates], self.offsets[candidates + 1]
+        idx, first = _ranges(starts, ends)
+        nxt = idx + 1
+        nxt[first + (ends - starts) - 1] = starts
+        x, y = self.east[idx], self.north[idx]
+        x1, y1 = self.east[nxt], self.north[nxt]
+
+        # 앞쪽에 있고, 플레이 선 통로 안에 꼭짓점이 있거나 변이 플레이 선을 가로지르는 것
+        ahead = np.maximum.reduceat((x - px) * ux + (y - py) * uy, first) > 0
+        near = np.minimum.reduceat(_segment_distance(x, y, px, py, tx, ty), first) <= corridor_m
+        d1 = (tx - px) * (y - py) - (ty - py) * (x - px)
+        d2 = (tx - px) * (y1 - py) - (ty - py) * (x1 - px)
+        d3 = (x1 - x) * (py - y) - (y1 - y) * (px - x)
+        d4 = (x1 - x) * (ty - y) - (y1 - y) * (tx - x)
+        crosses = np.logical_or.reduceat((d1 * d2 <= 0) & (d3 * d4 <= 0), first)
+        layup = np.minimum.reduceat(_segment_distance(px, py, x, y, x1, y1), first)
+        carry = np.maximum.reduceat(np.hypot(x - px, y - py), first)
+
+        keep = np.flatnonzero(ahead & (near | crosses))
+        keep = keep[np.argsort(layup[keep], kind='stable')]
+        return [
+            {'index': int(candidates[i]), 'kind': HAZARD_KINDS[int(self.kind[candidates[i]])],
+             'hole': int(self.hole[candidates[i]]), 'layup': float(layup[i]), 'carry': float(carry[i])}
+            for i in keep.tolist()
+        ]
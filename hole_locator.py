@@ -0,0 +1,165 @@
+# 현재 위치로 진행 중인 홀 자동 감지
+# 티/그린/페어웨이 지점을 코스 ENU 평면의 균일 격자에 한 번만 색인하고
+# 위치가 들어올 때마다 주변 셀만 탐색하여 가장 가까운 홀을 찾음
+import math
+
+import numpy as np
+
+from distance_engine import LocalFrame, center
+
+# 지점 종류
+TEE, FAIRWAY, GREEN = 'tee', 'fairway', 'green'
+
+
+class HoleLocator:
+    """(홀, 종류, 위도, 경도) 지점 목록 위의 격자 공간 색인"""
+
+    def __init__(self, features, cell_m=50.0):
+        features = list(features)
+        if not features:
+            raise ValueError("색인할 지점이 없습니다.")
+        self.holes = np.array([f[0] for f in features], dtype=np.int64)
+        self.kinds = [f[1] for f in features]
+        lats = np.array([f[2] for f in features], dtype=np.float64)
+        lons = np.array([f[3] for f in features], dtype=np.float64)
+        self.frame = LocalFrame(*center(lats, lons))
+        self.east, self.north = self.frame.to_enu(lats, lons)
+        self.cell_m = float(cell_m)
+
+        # 셀 (i, j) → 지점 인덱스 배열
+        ci = np.floor(self.east / self.cell_m).astype(np.int64)
+        cj = np.floor(self.north / self.cell_m).astype(np.int64)
+        cells = {}
+        for k, key in enumerate(zip(ci.tolist(), cj.tolist())):
+            cells.setdefault(key, []).append(k)
+        self._cells = {key: np.array(idx, dtype=np.int64) for key, idx in cells.items()}
+        self._i_range = (int(ci.min()), int(ci.max()))
+        self._j_range = (int(cj.min()), int(cj.max()))
+
+    @classmethod
+    def from_hole_coords(cls, hole_coords, tees=None, fairways=None, cell_m=50.0):
+        """HOLE_COORDS(그린)와 선택적인 티/페어웨이 좌표로 색인 생성
+
+        tees: {홀: (위도, 경도)}, fairways: {홀: [(위도, 경도), ...]}
+        """
+        features = [(h, GREEN, lat, lon) for h, (lat, lon) in hole_coords.items()]
+        for h, (lat, lon) in (tees or {}).items():
+            features.append((h, TEE, lat, lon))
+        for h, points in (fairways or {}).items():
+            features.extend((h, FAIRWAY, lat, lon) for lat, lon in points)
+        return cls(features, cell_m=cell_m)
+
+    def candidates(self, position, slack_m=0.0):
+        """가장 가까운 지점 거리 + slack_m 안에 있는 홀 목록 [(홀, 거리), ...] (거리순)
+
+        주변 셀부터 한 칸씩 넓혀 가며 탐색하고, 남은 셀이 더 가까울 수 없으면 멈춤
+        """
+        e, n = self.frame.point_to_enu(*position)
+        i0, j0 = math.floor(e / self.cell_m), math.floor(n / self.cell_m)
+        (i_lo, i_hi), (j_lo, j_hi) = self._i_range, self._j_range
+        # 격자 바깥에서 들어온 위치는 격자 경계에 닿는 링부터 탐색
+        first_ring = max(i_lo - i0, i0 - i_hi, j_lo - j0, j0 - j_hi, 0)
+        last_ring = max(i0 - i_lo, i_hi - i0, j0 - j_lo, j_hi - j0)
+        found = []
+        best = math.inf
+        for ring in range(first_ring, last_ring + 1):
+            # 이 링의 셀은 최소 (ring - 1) * cell_m 이상 떨어져 있음
+            if (ring - 1) * self.cell_m > best + slack_m:
+                break
+            for i in range(max(i0 - ring, i_lo), min(i0 + ring, i_hi) + 1):
+                if abs(i - i0) == ring:
+                    js = range(max(j0 - ring, j_lo), min(j0 + ring, j_hi) + 1)
+                else:
+                    js = [j for j in (j0 - ring, j0 + ring) if j_lo <= j <= j_hi]
+                for j in js:
+                    idx = self._cells.get((i, j))
+                    if idx is None:
+                        continue
+                    d = np.hypot(self.east[idx] - e, self.north[idx] - n)
+                    found.append((idx, d))
+                    best = min(best, float(d.min()))
+        if not found:
+            return []
+
+        idx = np.concatenate([f[0] for f in found])
+        dist = np.concatenate([f[1] for f in found])
+        keep = dist <= best + slack_m
+        per_hole = {}
+        for h, d in zip(self.holes[idx[keep]].tolist(), dist[keep].tolist()):
+            if d < per_hole.get(h, math.inf):
+                per_hole[h] = d
+        return sorted(per_hole.items(), key=lambda item: (item[1], item[0]))
+
+    def nearest(self, position):
+        """가장 가까운 홀과 거리 (미터)"""
+        return self.candidates(position)[0]
+
+    def hole_distance(self, position, hole_number):
+        """특정 홀의 가장 가까운 지점까지 거리 (미터)"""
+        e, n = self.frame.point_to_enu(*position)
+        mask = self.holes == hole_number
+        if not mask.any():
+            return math.inf
+        return float(np.hypot(self.east[mask] - e, self.north[mask] - n).min())
+
+
+class HoleTracker:
+    """위치 갱신마다 현재 홀을 추정하되, 경계 근처에서 홀이 흔들리지 않도록 히스테리시스 적용
+
+    - 새 홀이 현재 홀보다 margin_m 이상 가까워야 후보가 됨
+    - 같은 후보가 confirm_fixes번 연속으로 나와야 실제로 전환
+      (단, jump_m 이상 차이 나면 수동 입력처럼 위치가 크게 바뀐 것이므로 즉시 전환)
+    - 같은 좌표를 공유하는 홀(예: 1번과 10번)은 현재 홀 다음 순서를 우선
+    """
+
+    def __init__(self, locator, margin_m=15.0, confirm_fixes=3, tie_m=1.0, jump_m=100.0):
+        self.locator = locator
+        self.margin_m = margin_m
+        self.jump_m = jump_m
+        self.confirm_fixes = confirm_fixes
+        self.tie_m = tie_m
+        self.current = None
+        self._pending = None
+        self._pending_count = 0
+
+    def _pick(self, candidates):
+        best_d = candidates[0][1]
+        tied = sorted(h for h, d in candidates if d <= best_d + self.tie_m)
+        if self.current is not None:
+            if self.current in tied:
+                return self.current
+            later = [h for h in tied if h > self.current]
+            if later:
+                return later[0]
+        return tied[0]
+
+    def update(self, position):
+        """새 위치로 현재 홀을 갱신하고 반환"""
+        candidates = self.locator.candidates(position, slack_m=self.tie_m)
+        if not candidates:
+            return self.current
+        hole = self._pick(candidates)
+
+        if self.current is None:
+            self.current = hole
+            return hole
+        if hole == self.current:
+            self._pending, self._pending_count = None, 0
+            return hole
+
+        current_d = self.locator.hole_distance(position, self.current)
+        new_d = dict(candidates)[hole]
+        if new_d + self.margin_m > current_d:
+            self._pending, self._pending_count = None, 0
+            return self.current
+
+        if current_d - new_d >= self.jump_m:
+            self._pending_count = self.confirm_fixes
+        elif hole == self._pending:
+            self._pending_count += 1
+        else:
+            self._pending, self._pending_count = hole, 1
+        if self._pending_count >= self.confirm_fixes:
+            self.current = hole
+            self._pending, self._pending_count = None, 0
+        return self.current
@@ -0,0 +1,214 @@
+# IP 주소 → 대략적인 위치 (위도, 경도)
+# - 로컬 GeoIP 데이터베이스(IPv4 범위 표)를 메모리 매핑하고 이분 탐색으로 조회
+# - 결과는 TTL 캐시에 보관해 리런/세션 간에 공유 (실패와 찾지 못한 결과는 짧은 TTL로 보관해 재시도 폭주를 막음)
+# - 조회는 백그라운드 스레드에서 실행해 페이지 렌더링을 막지 않음
+#
+# 데이터베이스 만들기 (DB-IP Lite / IP2Location LITE 형식 CSV: 시작, 끝, ..., 위도, 경도)
+#   python ip_locator.py compile dbip-city-lite.csv -o cache/geoip.bin
+import csv
+import ipaddress
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from timing import timer
+
+MAGIC = b'GOLFGIP1'
+DEFAULT_DB = os.environ.get(
+    'GOLF_GEOIP_DB',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'geoip.bin'),
+)
+
+# 레코드: 범위 시작/끝(IPv4 정수)과 위치
+RECORD = np.dtype([('start', '<u4'), ('end', '<u4'), ('lat', '<f4'), ('lon', '<f4')])
+
+
+def _ipv4(value):
+    """점 표기 또는 정수 문자열 → IPv4 정수. IPv6이면 None"""
+    value = value.strip()
+    if value.isdigit():
+        n = int(value)
+        return n if n <= 0xFFFFFFFF else None
+    if ':' in value:
+        return None
+    return int(ipaddress.IPv4Address(value))
+
+
+def parse_ip(value):
+    """헤더 등에서 받은 IP 문자열 → 정규화된 주소 문자열. 형식이 잘못됐으면 None"""
+    try:
+        return str(ipaddress.ip_address((value or '').strip()))
+    except ValueError:
+        return None
+
+
+def compile_geoip_csv(csv_path, out_path):
+    """CSV 범위 표를 시작 주소 순으로 정렬된 고정 폭 레코드 파일로 변환"""
+    rows = []
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            try:
+                start, end = _ipv4(row[0]), _ipv4(row[1])
+                lat, lon = float(row[-2]), float(row[-1])
+            except (ValueError, IndexError):
+                continue  # 헤더 행 등
+            if start is None or end is None:
+                continue
+            rows.append((start, end, lat, lon))
+    records = np.array(rows, dtype=RECORD)
+    records.sort(order='start')
+
+    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+    tmp = out_path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(records)))
+        f.write(records.tobytes())
+    os.replace(tmp, out_path)
+    return len(records)
+
+
+class GeoIpDatabase:
+    """컴파일된 GeoIP 파일을 mmap으로 열어 두고 조회 (파일 크기와 무관하게 O(log n))"""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"GeoIP 데이터베이스 형식이 아닙니다: {path}")
+        (count,) = struct.unpack_from('<Q', self._mm, len(MAGIC))
+        self.records = np.frombuffer(self._mm, dtype=RECORD, count=count, offset=len(MAGIC) + 8)
+        self._starts = self.records['start']
+
+    def __len__(self):
+        return len(self.records)
+
+    def lookup(self, ip):
+        """IPv4 주소 → (위도, 경도). 범위에 없거나 IPv6이면 None"""
+        n = _ipv4(str(ip))
+        if n is None:
+            return None
+        k = int(self._starts.searchsorted(n, 'right')) - 1
+        if k < 0 or n > self.records['end'][k]:
+            return None
+        rec = self.records[k]
+        return float(rec['lat']), float(rec['lon'])
+
+
+def _network_lookup():
+    # 로컬 데이터베이스가 없거나 클라이언트 IP를 모를 때만 쓰는 기존 방식 (외부 HTTP)
+    import geocoder
+
+    g = geocoder.ip('me')
+    return (g.latlng[0], g.latlng[1]) if g.ok and g.latlng else None
+
+
+class IpLocator:
+    """TTL 캐시 + 비동기 조회를 갖춘 IP 위치 조회기 (프로세스당 하나를 공유)"""
+
+    def __init__(self, database=None, ttl=600.0, error_ttl=30.0, max_workers=2):
+        self.database = database
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self._cache = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'coalesced': 0, 'errors': 0}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ip-locate')
+
+    def _cached(self, key):
+        # 캐시 항목: (만료 시각, 결과, 예외) — 실패한 조회는 error_ttl 동안 같은 예외를 돌려줌
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None and hit[0] > time.monotonic():
+                self.counters['hits'] += 1
+                return hit
+        return None
+
+    def _resolve(self, ip):
+        # 사설/루프백 주소(로컬 실행)나 형식이 잘못된 주소(X-Forwarded-For 등)는 기존 방식으로 조회
+        # 데이터베이스에 없는 공인 주소(IPv6 포함)는 None (서버 위치를 클라이언트 위치로 쓰지 않음)
+        ip = parse_ip(ip) if ip is not None else None
+        if ip is not None and self.database is not None and ipaddress.ip_address(ip).is_global:
+            with timer('ip.database'):
+                return self.database.lookup(ip)
+        with timer('ip.network'):
+            return _network_lookup()
+
+    def locate(self, ip=None):
+        """동기 조회. ip가 None이면 서버의 공인 IP 기준 (네트워크 조회)"""
+        return self.locate_async(ip).result()
+
+    def locate_async(self, ip=None):
+        """Future를 반환. 캐시에 있으면 이미 완료된 Future, 같은 IP 조회가 진행 중이면 그것을 공유
+
+        최근 error_ttl 안에 실패한 조회는 다시 시도하지 않고 같은 예외로 완료된 Future를 반환
+        위치를 찾지 못한 결과(None)도 ttl이 아니라 error_ttl 동안만 보관
+        """
+        key = ip or 'me'
+        hit = self._cached(key)
+        if hit is not None:
+            future = Future()
+            if hit[2] is not None:
+                future.set_exception(hit[2])
+            else:
+                future.set_result(hit[1])
+            return future
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                self.counters['coalesced'] += 1
+                return future
+            self.counters['misses'] += 1
+            future = self._pending[key] = self._executor.submit(self._resolve, ip)
+
+        def _done(f):
+            with self._lock:
+                self._pending.pop(key, None)
+                error = f.exception()
+                if error is None:
+                    result = f.result()
+                    ttl = self.ttl if result is not None else self.error_ttl
+                    self._cache[key] = (time.monotonic() + ttl, result, None)
+                else:
+                    self.counters['errors'] += 1
+                    self._cache[key] = (time.monotonic() + self.error_ttl, None, error)
+
+        future.add_done_callback(_done)
+        return future
+
+
+def open_database(path=DEFAULT_DB):
+    """데이터베이스 파일이 있으면 열고, 없으면 None"""
+    return GeoIpDatabase(path) if os.path.exists(path) else None
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="GeoIP CSV를 메모리 매핑용 바이너리로 변환")
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('compile')
+    build.add_argument('csv')
+    build.add_argument('-o', '--output', default=DEFAULT_DB)
+    lookup = sub.add_parser('lookup')
+    lookup.add_argument('ip')
+    lookup.add_argument('--db', default=DEFAULT_DB)
+    args = parser.parse_args(argv)
+
+    if args.command == 'compile':
+        n = compile_geoip_csv(args.csv, args.output)
+        print(f"{args.output}: {n}개 IPv4 범위")
+    else:
+        print(GeoIpDatabase(args.db).lookup(args.ip))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
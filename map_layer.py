@@ -0,0 +1,175 @@
+# 코스 지도 (folium 기본 지도 캐시 + 마커만 갱신하는 컴포넌트)
+#
+# 코스 기본 지도(홀컵, 그린, 해저드)는 코스마다 한 번만 HTML로 렌더링해
+# map_component/frontend/maps/ 아래에 코스 데이터 해시 이름으로 저장함.
+# 브라우저는 이 파일과 Leaflet 자원을 한 번만 받고, 이후 리런마다
+# 컴포넌트 인자로는 바뀐 마커(현재 위치, 목표 지점) 목록만 전달됨
+#
+# 코스 타일 캐시(tile_cache.py)가 설정되어 있으면 배경 타일도 로컬 타일 서버에서 받음
+# (타일 캐시가 나중에 생기면 타일 주소가 바뀌므로 다음 호출부터 새 기본 지도를 씀)
+#
+# 기본 지도 HTML은 컴포넌트가 정적 파일로 제공해야 하므로 map_component/frontend/maps/
+# 아래에 생성됨 (.gitignore 대상, 지워도 다음 호출 때 다시 만듦)
+#
+# 코스 밖 위치는 location_map()으로 사용자 위치 중심의 일반 지도를 그림
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+import folium
+import streamlit.components.v1 as components
+from branca.element import MacroElement
+from jinja2 import Template
+
+import metrics
+from distance_engine import center as course_center
+from tile_cache import ATTRIBUTION, tile_url_template
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'map_component', 'frontend')
+MAP_DIR = os.path.join(FRONTEND_DIR, 'maps')
+
+_component = components.declare_component('course_map', path=FRONTEND_DIR)
+
+# 해저드 종류별 색 (course_data.HAZARD_KINDS 순서)
+HAZARD_STYLE = {
+    'bunker': {'color': '#c9a227', 'fill_color': '#f3e3a0'},
+    'water': {'color': '#1f6fb2', 'fill_color': '#7fb8e6'},
+    'ob': {'color': '#ffffff', 'fill_color': '#ffffff'},
+}
+
+
+class _MarkerUpdates(MacroElement):
+    """컴포넌트가 보낸 마커 목록을 받아 지도 위 동적 레이어만 다시 그리는 스크립트"""
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function() {
+            var map = {{ this._parent.get_name() }};
+            var layer = L.layerGroup().addTo(map);
+            window.addEventListener('message', function(event) {
+                var msg = event.data;
+                if (!msg || msg.type !== 'courseMap:update') return;
+                layer.clearLayers();
+                msg.markers.forEach(function(m) {
+                    var marker = L.circleMarker([m.lat, m.lon], {
+                        radius: m.radius || 8, color: m.color || 'red',
+                        fillColor: m.color || 'red', fillOpacity: 0.9
+                    });
+                    if (m.label) marker.bindTooltip(m.label);
+                    marker.addTo(layer);
+                });
+                if (msg.center) map.panTo(msg.center);
+            });
+        })();
+        {% endmacro %}
+    """)
+
+
+def build_base_map(course, zoom_start=16, tiles=None):
+    """코스의 고정 요소만 그린 folium 지도. tiles는 타일 URL 템플릿 (None이면 OpenStreetMap)"""
+    center = list(course_center(course.pin[:, 0], course.pin[:, 1]))
+    if tiles:
+        m = folium.Map(location=center, zoom_start=zoom_start, tiles=tiles, attr=ATTRIBUTION)
+    else:
+        m = folium.Map(location=center, zoom_start=zoom_start)
+
+    for i, n in enumerate(course.number):
+        lat, lon = course.pin[i]
+        folium.CircleMarker(
+            [float(lat), float(lon)], radius=5, color='#0000FF',
+            fill=True, fill_opacity=0.8, tooltip=f"홀 {int(n)}"
+        ).add_to(m)
+        green = course.green_polygon(i)
+        if len(green):
+            folium.Polygon(
+                green.tolist(), color='#2e7d32', fill=True, fill_opacity=0.3, weight=1
+            ).add_to(m)
+
+    kinds = list(HAZARD_STYLE)
+    for k in range(len(course.hazard_kind)):
+        style = HAZARD_STYLE[kinds[int(course.hazard_kind[k])]]
+        folium.Polygon(
+            course.hazard_polygon(k).tolist(), weight=1, fill=True, fill_opacity=0.5, **style
+        ).add_to(m)
+
+    m.add_child(_MarkerUpdates())
+    return m
+
+
+def base_map_url(course_id):
+    """코스 기본 지도 HTML을 (없을 때만) 저장하고 컴포넌트 기준 상대 URL을 반환
+
+    파일 이름은 코스 데이터(와 타일 주소) 해시이므로 코스가 바뀌지 않는 한 프로세스가
+    다시 떠도 같은 파일을 그대로 씀 (folium 요소 이름은 매번 달라지므로 HTML 해시는 쓰지 않음)
+    타일 주소는 호출마다 다시 확인하므로 프로세스 실행 중에 만든 타일 캐시도 바로 반영됨
+    """
+    return _base_map_url(course_id, tile_url_template(course_id))
+
+
+@lru_cache(maxsize=None)
+def _base_map_url(course_id, tiles):
+    from course_data import load_course
+
+    course = load_course(course_id)
+    digest = hashlib.sha1((tiles or '').encode())
+    for key in ('number', 'pin', 'green', 'green_offsets', 'hazard', 'hazard_offsets', 'hazard_kind'):
+        digest.update(getattr(course, key).tobytes())
+    name = f"{course_id}-{digest.hexdigest()[:12]}.html"
+    path = os.path.join(MAP_DIR, name)
+    if not os.path.exists(path):
+        html = build_base_map(course, tiles=tiles).get_root().render()
+        os.makedirs(MAP_DIR, exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(html)
+        os.replace(tmp, path)
+    return f"maps/{name}"
+
+
+@lru_cache(maxsize=None)
+def _base_map_bytes(base_url):
+    return os.path.getsize(os.path.join(FRONTEND_DIR, base_url))
+
+
+def _count_payload(course_id, base_url, markers):
+    # 지표: 호출마다 보내는 마커 JSON, 세션에서 처음 그리는 기본 지도 HTML
+    import streamlit as st
+
+    size = _base_map_bytes(base_url)
+    metrics.inc('golf_map_renders_total')
+    metrics.inc('golf_map_payload_bytes_total', len(json.dumps(markers)), part='markers')
+    metrics.set_gauge('golf_map_base_bytes', size, course=course_id)
+    seen = st.session_state.setdefault('_map_bases_sent', set())
+    if base_url not in seen:
+        seen.add(base_url)
+        metrics.inc('golf_map_payload_bytes_total', size, part='base')
+
+
+def marker(lat, lon, label=None, color='red'):
+    return {'lat': float(lat), 'lon': float(lon), 'label': label, 'color': color}
+
+
+def course_map(course_id, markers=(), center=None, height=450, key=None):
+    """코스 지도 표시. 같은 코스에서는 마커 목록만 브라우저로 전달됨"""
+    base_url = base_map_url(course_id)
+    markers = list(markers)
+    if metrics.enabled():
+        _count_payload(course_id, base_url, markers)
+    return _component(
+        base_url=base_url,
+        markers=markers,
+        center=list(center) if center else None,
+        height=height,
+        key=key,
+        default=None,
+    )
+
+
+def location_map(lat, lon, zoom_start=15):
+    """코스 밖 위치용: 사용자 위치를 가운데에 두고 현재 위치 마커를 찍은 일반 지도"""
+    from streamlit_folium import folium_static
+
+    m = folium.Map(location=[lat, lon], zoom_start=zoom_start)
+    folium.Marker([lat, lon], popup='현재 위치', icon=folium.Icon(color='red', icon='info-sign')).add_to(m)
+    return folium_static(m)
@@ -0,0 +1,303 @@
+# 운영 지표 (Prometheus 텍스트 형식)
+#
+# 환경 변수 GOLF_METRICS_PORT=<포트> 로 켜면 앱 프로세스 안의 백그라운드 스레드가
+# http://<GOLF_METRICS_HOST, 기본 127.0.0.1>:<포트>/metrics 를 제공함
+# 켜면 timing에 리스너를 등록해 구간/리런 측정값을 받아 집계함 (timing의 로그/진단 패널은 그대로 꺼진 상태).
+# 꺼져 있으면 inc()/observe()는 플래그만 보고 바로 돌아가고, 캐시 카운터는 수집 요청이 올 때만 읽음
+#
+#   golf_reruns_total{script}                     스크립트 실행 수 (rate()로 초당 리런)
+#   golf_rerun_errors_total{script}               예외로 끝난 실행 (st.rerun/st.stop 제외)
+#   golf_rerun_duration_seconds{script}           실행 시간 히스토그램
+#   golf_sessions_active                          최근 ACTIVE_WINDOW초 안에 실행한 세션 수
+#   golf_sessions_connected                       Streamlit에 연결된 세션 수
+#   golf_section_duration_seconds{section}        timing 구간 히스토그램
+#   golf_distance_computations_total{kind}        거리 계산 횟수 (distance.* 구간)
+#   golf_external_calls_total{service}            외부 호출 수 (nominatim, geocoder_ip)
+#   golf_external_call_errors_total{service}
+#   golf_external_call_duration_seconds{service}  외부 호출 지연 히스토그램
+#   golf_cache_events_total{cache,event}          watch()로 등록한 객체의 counters
+#   golf_cache_hit_ratio{cache}                   누적 히트율
+#   golf_map_renders_total                        지도 컴포넌트 호출 수
+#   golf_map_payload_bytes_total{part}            지도로 보낸 바이트 (markers: 호출마다 인자 JSON,
+#                                                 base: 세션에서 처음 그린 기본 지도 HTML, 브라우저 캐시는 모름)
+#   golf_map_base_bytes{course}                   코스 기본 지도 HTML 크기
+#
+# 앱 프로세스 여러 개가 같은 포트를 쓰면 먼저 띄운 프로세스의 지표만 보이므로 앱마다 포트를 따로 지정
+import bisect
+import os
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import timing
+
+PORT_ENV_VAR = 'GOLF_METRICS_PORT'
+HOST_ENV_VAR = 'GOLF_METRICS_HOST'
+ACTIVE_WINDOW = 300.0
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# timing 구간 이름 → 외부 서비스 이름
+EXTERNAL_SECTIONS = {'geocode.fetch': 'nominatim', 'ip.network': 'geocoder_ip'}
+
+# 출력 순서대로 (이름: (종류, 설명))
+FAMILIES = {
+    'golf_reruns_total': ('counter', "Script runs"),
+    'golf_rerun_errors_total': ('counter', "Script runs that raised an exception"),
+    'golf_rerun_duration_seconds': ('histogram', "Script run duration"),
+    'golf_sessions_active': ('gauge', f"Sessions that ran the script in the last {ACTIVE_WINDOW:.0f} s"),
+    'golf_sessions_connected': ('gauge', "Sessions connected to the Streamlit runtime"),
+    'golf_section_duration_seconds': ('histogram', "Timed section duration"),
+    'golf_distance_computations_total': ('counter', "Distance computations by kind"),
+    'golf_external_calls_total': ('counter', "Calls to external services"),
+    'golf_external_call_errors_total': ('counter', "Failed calls to external services"),
+    'golf_external_call_duration_seconds': ('histogram', "External service call latency"),
+    'golf_cache_events_total': ('counter', "Cache counters by event"),
+    'golf_cache_hit_ratio': ('gauge', "Cumulative cache hit ratio"),
+    'golf_map_renders_total': ('counter', "Course map component calls"),
+    'golf_map_payload_bytes_total': ('counter', "Bytes sent to the course map component"),
+    'golf_map_base_bytes': ('gauge', "Size of the course base map HTML"),
+}
+
+_enabled = False
+_lock = threading.Lock()
+_values = {}    # 이름 → {레이블 튜플: 값} (histogram은 [구간별 개수..., +Inf 개수, 합계])
+_sessions = {}  # 세션 id → 마지막 실행 시각 (monotonic)
+_watched = {}   # 캐시 이름 → (객체, 히트 이벤트, 미스 이벤트)
+
+
+def enabled():
+    return _enabled
+
+
+def _key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def inc(name, amount=1, **labels):
+    """counter 증가 (꺼져 있으면 무시)"""
+    if not _enabled:
+        return
+    key = _key(labels)
+    with _lock:
+        values = _values.setdefault(name, {})
+        values[key] = values.get(key, 0) + amount
+
+
+def set_gauge(name, value, **labels):
+    if not _enabled:
+        return
+    with _lock:
+        _values.setdefault(name, {})[_key(labels)] = value
+
+
+def observe(name, seconds, **labels):
+    """histogram에 값 하나 추가 (꺼져 있으면 무시)"""
+    if not _enabled:
+        return
+    key = _key(labels)
+    with _lock:
+        values = _values.setdefault(name, {})
+        counts = values.get(key)
+        if counts is None:
+            counts = values[key] = [0] * (len(BUCKETS) + 1) + [0.0]
+        counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        counts[-1] += seconds
+
+
+def watch(cache, obj, hits=(), misses=()):
+    """counters 딕셔너리를 가진 객체를 등록하고 그대로 반환 (수집 요청 때만 읽음)
+
+    hits/misses에 이벤트 이름을 주면 golf_cache_hit_ratio도 계산
+    """
+    if _enabled:
+        with _lock:
+            _watched[cache] = (obj, tuple(hits), tuple(misses))
+    return obj
+
+
+def _session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx(suppress_warning=True)
+    except Exception:
+        return None
+    return ctx.session_id if ctx is not None else None
+
+
+def _connected_sessions():
+    """Streamlit 런타임에 연결된 세션 수 (런타임 밖이거나 알 수 없으면 None)"""
+    try:
+        from streamlit.runtime import Runtime
+
+        if not Runtime.exists():
+            return None
+        return Runtime.instance()._session_mgr.num_active_sessions()
+    except Exception:
+        return None
+
+
+def _observe(kind, name, seconds, error):
+    # timing 리스너: 구간/리런 측정값을 지표로 옮김
+    session = _session_id()
+    if session is not None:
+        with _lock:
+            _sessions[session] = time.monotonic()
+    if kind == 'rerun':
+        inc('golf_reruns_total', script=name)
+        observe('golf_rerun_duration_seconds', seconds, script=name)
+        if error:
+            inc('golf_rerun_errors_total', script=name)
+        return
+    observe('golf_section_duration_seconds', seconds, section=name)
+    service = EXTERNAL_SECTIONS.get(name)
+    if service is not None:
+        inc('golf_external_calls_total', service=service)
+        observe('golf_external_call_duration_seconds', seconds, service=service)
+        if error:
+            inc('golf_external_call_errors_total', service=service)
+    elif name.startswith('distance.'):
+        inc('golf_distance_computations_total', kind=name[len('distance.'):])
+
+
+def enable():
+    """집계 켜기 (프로세스 전체)"""
+    global _enabled
+    if not _enabled:
+        _enabled = True
+        timing.add_listener(_observe)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(key):
+    if not key:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in key) + '}'
+
+
+def _number(value):
+    if isinstance(value, int):
+        return str(value)
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+def _snapshot():
+    """모든 지표의 {이름: {레이블 튜플: 값}} 복사본 (수집 시점 계산 값 포함)"""
+    cutoff = time.monotonic() - ACTIVE_WINDOW
+    with _lock:
+        values = {
+            name: {key: list(v) if isinstance(v, list) else v for key, v in series.items()}
+            for name, series in _values.items()
+        }
+        for session in [s for s, seen in _sessions.items() if seen < cutoff]:
+            del _sessions[session]
+        values['golf_sessions_active'] = {(): len(_sessions)}
+        watched = list(_watched.items())
+    connected = _connected_sessions()
+    if connected is not None:
+        values['golf_sessions_connected'] = {(): connected}
+    for cache, (obj, hits, misses) in watched:
+        counters = dict(obj.counters)
+        events = values.setdefault('golf_cache_events_total', {})
+        for event, count in counters.items():
+            events[(('cache', cache), ('event', event))] = count
+        hit = sum(counters.get(e, 0) for e in hits)
+        total = hit + sum(counters.get(e, 0) for e in misses)
+        if total:
+            values.setdefault('golf_cache_hit_ratio', {})[(('cache', cache),)] = hit / total
+    return values
+
+
+def render():
+    """현재 지표를 Prometheus 텍스트 형식으로"""
+    values = _snapshot()
+    lines = []
+    for name, (kind, help_text) in FAMILIES.items():
+        series = values.get(name)
+        if not series:
+            continue
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for key in sorted(series):
+            value = series[key]
+            if kind != 'histogram':
+                lines.append(f'{name}{_labels(key)} {_number(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip(BUCKETS + (float('inf'),), value[:-1]):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels(key + (("le", _number(bound)),))} {cumulative}')
+            lines.append(f'{name}_sum{_labels(key)} {_number(value[-1])}')
+            lines.append(f'{name}_count{_labels(key)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+    """/metrics 를 제공하는 HTTP 서버 (백그라운드 스레드)"""
+
+    def __init__(self, host='127.0.0.1', port=9108):
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.httpd.server_address[1]
+
+    def _handler(self):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                data = render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작 (이미 실행 중이면 무시)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.httpd.serve_forever, name='metrics-server', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@lru_cache(maxsize=None)
+def background_server(port, host='127.0.0.1'):
+    """앱 프로세스 안에서 지표 서버를 한 번만 띄움
+
+    다른 프로세스가 이미 같은 포트를 쓰고 있으면 None (이 프로세스의 지표는 제공되지 않음)
+    """
+    try:
+        return MetricsServer(host=host, port=port).start()
+    except OSError:
+        return None
+
+
+def start():
+    """Streamlit 앱 시작 시 호출: GOLF_METRICS_PORT가 있으면 집계를 켜고 서버를 띄움"""
+    port = os.environ.get(PORT_ENV_VAR)
+    if not port:
+        return None
+    enable()
+    return background_server(int(port), os.environ.get(HOST_ENV_VAR, '127.0.0.1'))
@@ -0,0 +1,196 @@
+# 오프라인 역지오코더 (로컬 주소 지점 파일 + 격자 버킷 색인)
+# 네트워크 없이 reverse(위도, 경도)에 geopy Location 형태로 응답
+#
+# 지원 파일
+#   CSV: lat,lon,address 열 또는 OpenAddresses 형식 (LAT, LON, NUMBER, STREET, CITY, POSTCODE ...)
+#   GeoJSON: Point feature (properties.address 또는 OpenAddresses 속성)
+# 좌표가 없거나 숫자가 아닌 행은 건너뛰고 그 수를 OfflineReverseGeocoder.skipped 에 남김
+import csv
+import json
+import math
+from functools import lru_cache
+
+import numpy as np
+from geopy.location import Location
+
+_M_PER_DEG_LAT = 111320.0
+
+# OpenAddresses 열 이름 → 주소 조합 순서
+_ADDRESS_PARTS = ('number', 'street', 'unit', 'city', 'district', 'region', 'postcode')
+
+
+def _address(row):
+    row = {k.lower(): v for k, v in row.items() if v not in (None, '')}
+    for key in ('address', 'display_name', 'name'):
+        if key in row:
+            return str(row[key])
+    number, street = row.get('number'), row.get('street')
+    first = ' '.join(str(p) for p in (number, street) if p)
+    rest = [str(row[k]) for k in _ADDRESS_PARTS[2:] if k in row]
+    return ', '.join([first] + rest if first else rest)
+
+
+def _coord(lat, lon):
+    """숫자가 아니거나 범위를 벗어난 좌표는 ValueError"""
+    lat, lon = float(lat), float(lon)
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+        raise ValueError(f"좌표 범위를 벗어났습니다: {lat}, {lon}")
+    return lat, lon
+
+
+def _read_csv(path, skipped):
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            # 열 수가 헤더보다 많으면 남는 값은 None 키로 들어옴
+            lower = {k.lower(): v for k, v in row.items() if k is not None}
+            lat = lower.get('lat') or lower.get('latitude')
+            lon = lower.get('lon') or lower.get('lng') or lower.get('longitude')
+            try:
+                if None in row or not (lat and lon):
+                    raise ValueError("좌표가 없거나 열 수가 맞지 않습니다")
+                lat, lon = _coord(lat, lon)
+            except ValueError:
+                skipped[0] += 1
+                continue
+            yield lat, lon, _address(lower)
+
+
+def _read_geojson(path, skipped):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    for feature in data.get('features', []):
+        geom = (feature.get('geometry') if isinstance(feature, dict) else None) or {}
+        if geom.get('type') != 'Point':
+            continue
+        try:
+            lon, lat = geom['coordinates'][:2]
+            lat, lon = _coord(lat, lon)
+        except (KeyError, TypeError, ValueError):
+            skipped[0] += 1
+            continue
+        yield lat, lon, _address(feature.get('properties') or {})
+
+
+class OfflineReverseGeocoder:
+    """주소 지점을 위·경도 격자 버킷으로 묶어 가장 가까운 주소를 찾는 역지오코더
+
+    지점은 셀 번호 순으로 정렬해 연속 배열에 저장하고, 행 → (시작, 끝) 딕셔너리와
+    행 안의 이분 탐색으로 버킷을 찾음. 조회는 주변 셀 몇 개만 보므로 지점 수와 무관
+    skipped는 파일에서 읽을 때 건너뛴 잘못된 행 수
+    """
+
+    def __init__(self, points, cell_m=200.0, max_distance_m=500.0, skipped=0):
+        points = list(points)
+        if not points:
+            raise ValueError("주소 지점이 없습니다.")
+        self.skipped = int(skipped)
+        self.cell_m = float(cell_m)
+        self.max_distance_m = float(max_distance_m)
+        self._lat_step = self.cell_m / _M_PER_DEG_LAT
+
+        lat = np.array([p[0] for p in points], dtype=np.float64)
+        lon = np.array([p[1] for p in points], dtype=np.float64)
+        ci = np.floor(lat / self._lat_step).astype(np.int64)
+        cj = np.floor(lon / self._lon_step(ci)).astype(np.int64)
+        order = np.lexsort((cj, ci))
+
+        # 셀 번호 순으로 정렬했으므로 같은 행(ci)의 지점은 연속 구간이고
+        # 그 안에서 cj도 정렬되어 있어 열 범위는 이분 탐색으로 자를 수 있음
+        ci = ci[order]
+        self._ci = ci
+        self._cj = cj[order]
+
+        # 좌표는 자기 셀의 남서쪽 모서리로부터의 차이를 float32로 저장
+        # (차이가 셀 크기 이하라 파일 범위와 상관없이 1 mm 미만으로 반올림됨)
+        self.dlat = (lat[order] - ci * self._lat_step).astype(np.float32)
+        self.dlon = (lon[order] - self._cj * self._lon_step(ci)).astype(np.float32)
+        self.addresses = [points[k][2] for k in order.tolist()]
+
+        starts = np.flatnonzero(np.r_[True, ci[1:] != ci[:-1]])
+        ends = np.r_[starts[1:], len(order)]
+        self._rows = {int(ci[s]): (int(s), int(e)) for s, e in zip(starts, ends)}
+
+    def _lon_step(self, ci):
+        # 경도 간격은 셀 중심 위도 기준 (고위도에서도 셀이 대략 정사각형)
+        center = np.radians((np.asarray(ci) + 0.5) * self._lat_step)
+        return self._lat_step / np.maximum(np.cos(center), 1e-6)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        reader = _read_geojson if path.endswith(('.geojson', '.json')) else _read_csv
+        skipped = [0]
+        points = list(reader(path, skipped))
+        return cls(points, skipped=skipped[0], **kwargs)
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def _search(self, lat, lon, radius_m, cos_lat):
+        """radius_m 안쪽 행/열 범위만 검사해 (인덱스, 거리²) 반환"""
+        i0 = math.floor(lat / self._lat_step)
+        rows = math.ceil(radius_m / self.cell_m)
+        best, best_d2 = None, math.inf
+        for i in range(i0 - rows, i0 + rows + 1):
+            span = self._rows.get(i)
+            if span is None:
+                continue
+            s, e = span
+            lon_step = self._lat_step / max(math.cos(math.radians((i + 0.5) * self._lat_step)), 1e-6)
+            dlon = radius_m / (_M_PER_DEG_LAT * max(cos_lat, 1e-6))
+            cj = self._cj[s:e]
+            lo = s + int(cj.searchsorted(math.floor((lon - dlon) / lon_step)))
+            hi = s + int(cj.searchsorted(math.floor((lon + dlon) / lon_step), 'right'))
+            if lo >= hi:
+                continue
+            dy = (self.dlat[lo:hi] + (i * self._lat_step - lat)) * _M_PER_DEG_LAT
+            dx = (self.dlon[lo:hi] + (self._cj[lo:hi] * lon_step - lon)) * (_M_PER_DEG_LAT * cos_lat)
+            d2 = dx * dx + dy * dy
+            k = int(d2.argmin())
+            if d2[k] < best_d2:
+                best, best_d2 = lo + k, float(d2[k])
+        return best, best_d2
+
+    def nearest(self, lat, lon):
+        """가장 가까운 주소 지점 (인덱스, 거리 m). max_distance_m 안에 없으면 None
+
+        한 셀 반경부터 찾고, 그 안에서 못 찾으면 반경을 두 배씩 넓힘
+        """
+        cos_lat = math.cos(math.radians(lat))
+        radius = min(self.cell_m, self.max_distance_m)
+        while True:
+            best, best_d2 = self._search(lat, lon, radius, cos_lat)
+            if best_d2 <= radius * radius or radius >= self.max_distance_m:
+                break
+            radius = min(radius * 2, self.max_distance_m)
+        if best is None:
+            return None
+        d = math.sqrt(best_d2)
+        return (best, d) if d <= self.max_distance_m else None
+
+    def point(self, k):
+        """k번째 주소 지점의 (위도, 경도)"""
+        ci, cj = int(self._ci[k]), int(self._cj[k])
+        lon_step = self._lat_step / max(math.cos(math.radians((ci + 0.5) * self._lat_step)), 1e-6)
+        return ci * self._lat_step + float(self.dlat[k]), cj * lon_step + float(self.dlon[k])
+
+    def reverse(self, query, **kwargs):
+        """geopy 지오코더와 같은 호출 방식: reverse("위도, 경도") 또는 reverse((위도, 경도))"""
+        if isinstance(query, str):
+            lat, lon = (float(v) for v in query.split(','))
+        else:
+            lat, lon = (float(v) for v in query)
+        hit = self.nearest(lat, lon)
+        if hit is None:
+            return None
+        k, d = hit
+        address = self.addresses[k]
+        point = self.point(k)
+        raw = {'display_name': address, 'lat': point[0], 'lon': point[1],
+               'distance_m': d, 'source': 'offline'}
+        return Location(address, point, raw)
+
+
+@lru_cache(maxsize=None)
+def load_gazetteer(path, cell_m=200.0, max_distance_m=500.0):
+    """같은 파일은 프로세스당 한 번만 읽음"""
+    return OfflineReverseGeocoder.from_file(path, cell_m=cell_m, max_distance_m=max_distance_m)
@@ -0,0 +1,207 @@
+# 실행 프로파일링 (세션 하나 또는 프로세스 전체)
+#
+# 켜는 방법: 앱 주소에 ?profile=1 (그 세션만, GOLF_PROFILE_ALLOW=1 일 때만), 또는 환경 변수 GOLF_PROFILE=1 (전체)
+#   값이 sample 이면 샘플링 프로파일러만 (SAMPLE_INTERVAL 간격으로 스크립트 스레드의
+#   호출 스택만 읽으므로 부담이 작음), 1/cprofile 이면 cProfile도 함께 (함수별 정확한 호출 수/시간)
+# 스크립트 실행(리런)마다 cache/profiles/ 아래에 파일을 남김 (GOLF_PROFILE_DIR로 변경, 최근 KEEP_RUNS번만 보관)
+#   <스크립트>-<시각>.prof    cProfile 결과 (python -m pstats, snakeviz 등으로 보기)
+#   <스크립트>-<시각>.folded  접힌 호출 스택 (flamegraph.pl, speedscope 등에 바로 입력)
+#   <스크립트>-<시각>.txt     상위 함수 요약
+#
+# 스크립트 맨 위(streamlit import 바로 다음)에서 profile_script()를 호출해야 첫 실행의
+# import와 캐시 생성까지 포함되고, main() 호출을 try/finally로 감싸 finally에서 stop()을
+# 부르면 st.stop()이나 예외로 끝나도 저장됨. 그래도 저장되지 않은 채 스크립트 스레드가
+# 끝나면 샘플러가 이를 알아채고 그 자리에서 저장함
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+from loguru import logger
+
+ENV_VAR = 'GOLF_PROFILE'
+ALLOW_ENV_VAR = 'GOLF_PROFILE_ALLOW'
+QUERY_PARAM = 'profile'
+PROFILE_DIR = os.environ.get(
+    'GOLF_PROFILE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'profiles'),
+)
+SAMPLE_INTERVAL = 0.005
+TOP_N = 40
+KEEP_RUNS = 50
+
+_MODES = {'1': 'cprofile', 'cprofile': 'cprofile', 'sample': 'sample'}
+_local = threading.local()
+
+
+def _mode():
+    """쿼리 파라미터가 환경 변수보다 우선 (GOLF_PROFILE_ALLOW가 켜져 있을 때만). 꺼져 있으면 None"""
+    value = os.environ.get(ENV_VAR, '')
+    if os.environ.get(ALLOW_ENV_VAR, '') not in ('', '0'):
+        try:
+            import streamlit as st
+
+            value = st.query_params.get(QUERY_PARAM, value)
+        except Exception:
+            pass
+    return _MODES.get(value.lower())
+
+
+def _prune(keep=None):
+    """PROFILE_DIR에서 최근 keep번(기본 KEEP_RUNS)의 실행 파일만 남기고 삭제"""
+    keep = KEEP_RUNS if keep is None else keep
+    runs = {}
+    for entry in os.scandir(PROFILE_DIR):
+        base, ext = os.path.splitext(entry.name)
+        if ext in ('.prof', '.folded', '.txt'):
+            runs.setdefault(base, []).append(entry)
+    stale = sorted(runs, key=lambda b: max(e.stat().st_mtime for e in runs[b]), reverse=True)[keep:]
+    for base in stale:
+        for entry in runs[base]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+def _frame_name(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _Sampler:
+    """대상 스레드의 호출 스택을 일정 간격으로 읽어 접힌 스택별 횟수를 셈
+
+    대상 스레드가 먼저 끝나면 샘플링을 멈추고 on_exit()를 (샘플러 스레드에서) 호출
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL, on_exit=None):
+        self.interval = interval
+        self.stacks = Counter()
+        self.on_exit = on_exit
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                if self.on_exit is not None:
+                    self.on_exit()
+                return
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+
+class ScriptProfile:
+    """스크립트 실행 한 번의 프로파일. 생성 즉시 시작하고 with 블록이 끝날 때 저장"""
+
+    def __init__(self, script, mode):
+        self.script = script
+        self.mode = mode
+        self.paths = []
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._sampler = _Sampler(on_exit=self.stop)
+        self._sampler.start()
+        self._profiler = None
+        if mode == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def stop(self):
+        """프로파일러를 멈추고 파일을 저장. 저장한 경로 목록을 반환 (여러 번, 어느 스레드에서 불러도 한 번만 저장)"""
+        if getattr(_local, 'active', None) is self:
+            _local.active = None
+        with self._lock:
+            sampler, profiler = self._sampler, self._profiler
+            self._sampler = self._profiler = None
+        if sampler is None:
+            return self.paths
+        if profiler is not None:
+            profiler.disable()
+        sampler.stop()
+        elapsed = time.perf_counter() - self._start
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S') + f'-{int(time.time() * 1000) % 1000:03d}'
+        base = os.path.join(PROFILE_DIR, f'{self.script}-{stamp}')
+
+        summary = io.StringIO()
+        summary.write(f"{self.script} {self.mode} {elapsed * 1000:.1f} ms\n\n")
+        leaves = Counter()
+        for stack, count in sampler.stacks.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        samples = sum(leaves.values())
+        summary.write(f"샘플 {samples}개 (간격 {sampler.interval * 1000:.0f} ms), 자체 시간 상위\n")
+        for name, count in leaves.most_common(TOP_N):
+            summary.write(f"{count / samples:7.1%}  {name}\n")
+        self.paths.append(base + '.folded')
+        with open(self.paths[-1], 'w', encoding='utf-8') as f:
+            for stack, count in sampler.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        if profiler is not None:
+            self.paths.append(base + '.prof')
+            profiler.dump_stats(self.paths[-1])
+            summary.write("\n")
+            pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(TOP_N)
+        self.paths.append(base + '.txt')
+        with open(self.paths[-1], 'w', encoding='utf-8') as f:
+            f.write(summary.getvalue())
+        logger.info("profile {} {:.1f} ms → {}", self.script, elapsed * 1000, base)
+        _prune()
+        return self.paths
+
+
+class _Disabled:
+    paths = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def stop(self):
+        return ()
+
+
+_DISABLED = _Disabled()
+
+
+def profile_script(script):
+    """프로파일링이 켜져 있으면 바로 시작한 ScriptProfile, 아니면 아무것도 하지 않는 객체
+
+    같은 스레드에서 이전 실행의 프로파일이 (st.stop() 등으로) 끝나지 않았으면 먼저 저장
+    """
+    stale = getattr(_local, 'active', None)
+    if stale is not None:
+        stale.stop()
+    mode = _mode()
+    if mode is None:
+        return _DISABLED
+    _local.active = ScriptProfile(script, mode)
+    return _local.active
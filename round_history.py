@@ -0,0 +1,317 @@
+# 라운드 기록 저장소 (SQLite) + 통계
+#
+# 끝난 라운드의 샷 기록(shot_log)을 SQLite로 옮기면서 홀별 결과(드라이브 거리, 그린 적중)를
+# 한 번만 계산해 hole_results에 넣고, 코스·홀별 누적 합계(hole_totals)도 같은 트랜잭션에서
+# 갱신함. 통계 화면은 누적 합계나 최근 N라운드의 홀 결과만 인덱스로 읽으므로
+# 라운드가 수천 개여도 샷 기록 전체를 다시 읽지 않음
+#
+# 오래된 라운드의 샷은 Parquet 파일(cache/history/<코스>/)로 옮기고 SQLite에서 지움
+# (pyarrow 필요). 홀 결과는 SQLite에 남으므로 통계에는 영향 없음. 앱에서는 실행하지 않으므로
+# 주기적으로 CLI(compact)를 돌릴 것 (cron 등)
+#
+#   python round_history.py sync              # cache/rounds 의 새 라운드 가져오기
+#   python round_history.py stats jindalee --last 20
+#   python round_history.py compact --keep 50
+import glob
+import math
+import os
+import sqlite3
+import sys
+import threading
+
+import numpy as np
+
+from shot_log import ROUND_DIR, coords, read_round
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+DEFAULT_DB = os.path.join(CACHE_DIR, 'rounds.sqlite3')
+ARCHIVE_DIR = os.path.join(CACHE_DIR, 'history')
+
+# 그린 외곽선이 없는 홀은 홀컵에서 이 거리 안을 그린으로 봄 (m)
+GREEN_RADIUS_M = 12.0
+_M_PER_DEG_LAT = 111320.0
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS rounds ("
+    " id INTEGER PRIMARY KEY, course TEXT NOT NULL, source TEXT UNIQUE,"
+    " started INTEGER NOT NULL, holes INTEGER NOT NULL, shots INTEGER NOT NULL, archived TEXT)",
+    "CREATE INDEX IF NOT EXISTS rounds_course_started ON rounds (course, started)",
+    "CREATE TABLE IF NOT EXISTS shots ("
+    " round_id INTEGER NOT NULL, seq INTEGER NOT NULL, hole INTEGER NOT NULL, stroke INTEGER NOT NULL,"
+    " time INTEGER NOT NULL, lat REAL NOT NULL, lon REAL NOT NULL, length REAL, accuracy REAL,"
+    " PRIMARY KEY (round_id, seq)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS hole_results ("
+    " round_id INTEGER NOT NULL, hole INTEGER NOT NULL, course TEXT NOT NULL, par INTEGER NOT NULL,"
+    " marks INTEGER NOT NULL, drive REAL, gir INTEGER,"
+    " PRIMARY KEY (round_id, hole)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS hole_results_course_hole ON hole_results (course, hole)",
+    "CREATE TABLE IF NOT EXISTS hole_totals ("
+    " course TEXT NOT NULL, hole INTEGER NOT NULL,"
+    " drive_sum REAL NOT NULL DEFAULT 0, drive_count INTEGER NOT NULL DEFAULT 0,"
+    " gir_sum INTEGER NOT NULL DEFAULT 0, gir_count INTEGER NOT NULL DEFAULT 0,"
+    " PRIMARY KEY (course, hole)) WITHOUT ROWID",
+)
+
+
+def _in_polygon(lat, lon, ring):
+    """점들이 다각형 안에 있는지 (광선 교차, 배열)"""
+    y0, x0 = ring[:, 0], ring[:, 1]
+    y1, x1 = np.roll(y0, -1), np.roll(x0, -1)
+    lat, lon = lat[:, None], lon[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cross = ((y0 > lat) != (y1 > lat)) & (lon < x0 + (lat - y0) * (x1 - x0) / (y1 - y0))
+    return np.count_nonzero(cross, axis=1) % 2 == 1
+
+
+def hole_results(course, shots):
+    """한 라운드 샷 배열 → [(홀, 파, 표시 수, 드라이브 m 또는 None, GIR 0/1 또는 None)]
+
+    드라이브 = 파 3이 아닌 홀에서 두 번째 표시 지점의 length (티샷 거리)
+    GIR = 처음으로 그린 위에서 표시한 샷 번호 - 1 <= 파 - 2 (그린 위 표시가 없으면 None)
+    파를 모르는 홀(par <= 0, 코스 파일에 par가 없음)은 GIR만 None이고 드라이브는 그대로 계산
+    (파 3을 가려낼 수 없으므로 티샷 거리를 모두 드라이브로 봄)
+    """
+    index = {int(h): i for i, h in enumerate(course.number)}
+    lats, lons = coords(shots)
+    results = []
+    for hole in np.unique(shots['hole']).tolist():
+        i = index.get(hole)
+        if i is None:
+            continue
+        rows = np.flatnonzero(shots['hole'] == hole)
+        par = int(course.par[i])
+        strokes = shots['stroke'][rows]
+
+        drive = gir = None
+        second = rows[strokes == 2]
+        if par != 3 and len(second) and not math.isnan(shots['length'][second[0]]):
+            drive = float(shots['length'][second[0]])
+        if par <= 0:
+            results.append((hole, par, len(rows), drive, gir))
+            continue
+
+        ring = course.green_polygon(i)
+        if len(ring) >= 3:
+            on_green = _in_polygon(lats[rows], lons[rows], ring)
+        else:
+            plat, plon = course.pin[i]
+            dn = (lats[rows] - plat) * _M_PER_DEG_LAT
+            de = (lons[rows] - plon) * _M_PER_DEG_LAT * math.cos(math.radians(plat))
+            on_green = np.hypot(de, dn) <= GREEN_RADIUS_M
+        if on_green.any():
+            gir = int(int(strokes[on_green].min()) - 1 <= par - 2)
+        results.append((hole, par, len(rows), drive, gir))
+    return results
+
+
+class RoundHistory:
+    """라운드 기록 DB. 여러 세션이 연결 하나를 잠금으로 공유 (geocode_cache와 같은 방식)"""
+
+    def __init__(self, db_path=DEFAULT_DB):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    def close(self):
+        self._db.close()
+
+    # -- 쓰기 --------------------------------------------------------------
+
+    def add_round(self, course, shots, source=None):
+        """샷 배열(SHOT_DTYPE) 한 라운드를 저장하고 라운드 id를 반환. 이미 가져온 source면 None"""
+        if not len(shots):
+            return None
+        results = hole_results(course, shots)
+        lats, lons = coords(shots)
+        with self._lock, self._db:
+            try:
+                cur = self._db.execute(
+                    "INSERT INTO rounds (course, source, started, holes, shots) VALUES (?, ?, ?, ?, ?)",
+                    (course.id, source, int(shots['time'].min()), len(results), len(shots)),
+                )
+            except sqlite3.IntegrityError:
+                return None
+            round_id = cur.lastrowid
+            self._db.executemany(
+                "INSERT INTO shots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((round_id, seq, hole, stroke, t, lat, lon, _nullable(length), _nullable(acc))
+                 for seq, (t, _, _, length, acc, hole, stroke), lat, lon
+                 in zip(range(len(shots)), shots.tolist(), lats.tolist(), lons.tolist())),
+            )
+            self._db.executemany(
+                "INSERT INTO hole_results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((round_id, hole, course.id, par, marks, drive, gir)
+                 for hole, par, marks, drive, gir in results),
+            )
+            # 누적 합계 갱신 (통계 화면이 전체 기록을 다시 읽지 않도록)
+            self._db.executemany(
+                "INSERT INTO hole_totals VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (course, hole) DO UPDATE SET"
+                " drive_sum = drive_sum + excluded.drive_sum, drive_count = drive_count + excluded.drive_count,"
+                " gir_sum = gir_sum + excluded.gir_sum, gir_count = gir_count + excluded.gir_count",
+                ((course.id, hole, drive or 0.0, int(drive is not None), gir or 0, int(gir is not None))
+                 for hole, _, _, drive, gir in results),
+            )
+        return round_id
+
+    def import_round(self, path, course=None):
+        """shot_log 라운드 파일 가져오기 (코스는 상위 디렉터리 이름)
+
+        디렉터리 이름이 등록된 코스가 아니면 CourseDataError
+        """
+        if course is None:
+            from course_data import CourseDataError, load_course
+            course_id = os.path.basename(os.path.dirname(path))
+            try:
+                course = load_course(course_id)
+            except CourseDataError as e:
+                raise CourseDataError(f"{path}: 라운드 디렉터리 {course_id!r}의 코스를 불러올 수 없습니다 ({e})") from None
+        source = os.path.relpath(os.path.abspath(path), ROUND_DIR)
+        return self.add_round(course, read_round(path), source)
+
+    def sync(self, directory=ROUND_DIR, errors=None):
+        """디렉터리의 라운드 파일 중 아직 가져오지 않은 것만 가져옴. 가져온 라운드 수를 반환
+
+        등록되지 않은 코스 디렉터리의 파일은 건너뛰고, errors(리스트)가 있으면 오류 메시지를 추가
+        """
+        from course_data import CourseDataError
+
+        with self._lock:
+            known = {row[0] for row in self._db.execute("SELECT source FROM rounds WHERE source IS NOT NULL")}
+        added = 0
+        for path in sorted(glob.glob(os.path.join(directory, '*', '*.shots'))):
+            if os.path.relpath(os.path.abspath(path), ROUND_DIR) not in known:
+                try:
+                    added += self.import_round(path) is not None
+                except CourseDataError as e:
+                    if errors is not None:
+                        errors.append(str(e))
+        return added
+
+    # -- 통계 --------------------------------------------------------------
+
+    def hole_stats(self, course_id, last=None):
+        """{홀: {'drive', 'drives', 'gir', 'girs'}} — 평균 드라이브(m), GIR 비율과 각 표본 수
+
+        last=None이면 누적 합계 표에서 바로 읽고, last=N이면 최근 N라운드의 홀 결과만 읽음
+        """
+        if last is None:
+            sql = ("SELECT hole, drive_sum, drive_count, gir_sum, gir_count"
+                   " FROM hole_totals WHERE course = ? ORDER BY hole")
+            params = (course_id,)
+        else:
+            sql = ("SELECT hole, SUM(drive), COUNT(drive), SUM(gir), COUNT(gir) FROM hole_results"
+                   " WHERE round_id IN (SELECT id FROM rounds WHERE course = ? ORDER BY started DESC LIMIT ?)"
+                   " GROUP BY hole ORDER BY hole")
+            params = (course_id, int(last))
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return {
+            hole: {'drive': drive_sum / drives if drives else None, 'drives': drives,
+                   'gir': gir_sum / girs if girs else None, 'girs': girs}
+            for hole, drive_sum, drives, gir_sum, girs in rows
+        }
+
+    def round_count(self, course_id):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM rounds WHERE course = ?", (course_id,)).fetchone()[0]
+
+    # -- 보관 (Parquet) ----------------------------------------------------
+
+    def compact(self, keep=50, archive_dir=ARCHIVE_DIR):
+        """코스별 최근 keep라운드를 뺀 나머지의 샷을 Parquet 파일 하나로 옮기고 SQLite에서 삭제
+
+        옮긴 라운드 수를 반환. 홀 결과와 누적 합계는 그대로 남음
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet 보관에는 pyarrow가 필요합니다 (pip install pyarrow)") from None
+
+        columns = ('round_id', 'seq', 'hole', 'stroke', 'time', 'lat', 'lon', 'length', 'accuracy')
+        moved = 0
+        with self._lock:
+            courses = [row[0] for row in self._db.execute("SELECT DISTINCT course FROM rounds")]
+            for course_id in courses:
+                ids = [row[0] for row in self._db.execute(
+                    "SELECT id FROM rounds WHERE course = ? AND archived IS NULL AND id NOT IN"
+                    " (SELECT id FROM rounds WHERE course = ? ORDER BY started DESC LIMIT ?) ORDER BY id",
+                    (course_id, course_id, keep),
+                )]
+                if not ids:
+                    continue
+                marks = ','.join('?' * len(ids))
+                rows = self._db.execute(
+                    f"SELECT {', '.join(columns)} FROM shots WHERE round_id IN ({marks}) ORDER BY round_id, seq", ids,
+                ).fetchall()
+                name = os.path.join(course_id, f"{ids[0]:08d}-{ids[-1]:08d}.parquet")
+                path = os.path.join(archive_dir, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                pq.write_table(pa.table(dict(zip(columns, map(list, zip(*rows))))) if rows
+                               else pa.table({c: [] for c in columns}), path)
+                with self._db:
+                    self._db.execute(f"DELETE FROM shots WHERE round_id IN ({marks})", ids)
+                    self._db.execute(f"UPDATE rounds SET archived = ? WHERE id IN ({marks})", [name, *ids])
+                moved += len(ids)
+        return moved
+
+    def round_shots(self, round_id, archive_dir=ARCHIVE_DIR):
+        """라운드 샷 [(hole, stroke, time, lat, lon, length, accuracy)] — 보관된 라운드는 Parquet에서 읽음"""
+        with self._lock:
+            row = self._db.execute("SELECT archived FROM rounds WHERE id = ?", (round_id,)).fetchone()
+            if row is None:
+                raise KeyError(round_id)
+            if row[0] is None:
+                return self._db.execute(
+                    "SELECT hole, stroke, time, lat, lon, length, accuracy FROM shots"
+                    " WHERE round_id = ? ORDER BY seq", (round_id,),
+                ).fetchall()
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(os.path.join(archive_dir, row[0]), filters=[('round_id', '=', round_id)])
+        names = ('hole', 'stroke', 'time', 'lat', 'lon', 'length', 'accuracy')
+        return list(zip(*(table.column(n).to_pylist() for n in names)))
+
+
+def _nullable(value):
+    return None if math.isnan(value) else float(value)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="라운드 기록 DB")
+    parser.add_argument('--db', default=DEFAULT_DB)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('sync')
+    stats = sub.add_parser('stats')
+    stats.add_argument('course')
+    stats.add_argument('--last', type=int, help="최근 N라운드만")
+    compact = sub.add_parser('compact')
+    compact.add_argument('--keep', type=int, default=50, help="코스별로 SQLite에 남길 최근 라운드 수")
+    args = parser.parse_args(argv)
+
+    history = RoundHistory(args.db)
+    if args.command == 'sync':
+        errors = []
+        print(f"새 라운드 {history.sync(errors=errors)}개")
+        for message in errors:
+            print(f"건너뜀: {message}", file=sys.stderr)
+        return 1 if errors else 0
+    elif args.command == 'stats':
+        for hole, s in history.hole_stats(args.course, args.last).items():
+            drive = f"{s['drive']:.0f} m ({s['drives']})" if s['drive'] is not None else '-'
+            gir = f"{s['gir'] * 100:.0f}% ({s['girs']})" if s['gir'] is not None else '-'
+            print(f"홀 {hole:2d}  드라이브 {drive:>12}  GIR {gir}")
+    else:
+        print(f"Parquet로 옮긴 라운드 {history.compact(args.keep)}개")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,205 @@
+# 샷 기록 (라운드별 고정 길이 바이너리 로그)
+#
+# 샷을 표시할 때마다 위치를 고정 길이 레코드(SHOT_DTYPE, 26바이트) 하나로 버퍼에 넣고,
+# 버퍼가 차거나(DEFAULT_BATCH개) 홀이 바뀔 때 파일 끝에 한 번에 덧붙임. 남은 버퍼는 기록 객체가
+# 사라질 때(세션 종료)와 프로세스 종료 때도 저장함. 레코드의 length는 같은 홀의
+# 직전 표시 지점에서 이 지점까지의 거리 = 직전 샷의 거리 (홀 첫 샷은 NaN)
+#
+# 파일: cache/rounds/<코스>/<시작 시각>-<임의 id>.shots = 8바이트 헤더 + 레코드 배열
+# (같은 초에 시작한 라운드끼리 파일이 겹치지 않도록 임의 id를 붙임)
+# 한 시즌(회원 100명 × 라운드 50회 × 샷 90개)이 약 12 MB이고 np.fromfile로 바로 읽음
+#
+#   python shot_log.py list
+#   python shot_log.py show cache/rounds/jindalee/20260418-071502-3f9c2a1d.shots
+import atexit
+import glob
+import math
+import os
+import sys
+import time
+import uuid
+import weakref
+
+import numpy as np
+
+from distance_engine import WGS84_A, WGS84_E2
+
+ROUND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'rounds')
+
+MAGIC = b'GSHOT\x001\x00'
+# 좌표는 1e-7도(약 1 cm) 단위 정수로 저장
+COORD_SCALE = 1e7
+SHOT_DTYPE = np.dtype([
+    ('time', '<i8'),        # 표시 시각 (Unix ms)
+    ('lat', '<i4'),
+    ('lon', '<i4'),
+    ('length', '<f4'),      # 직전 표시 지점에서의 거리 (m)
+    ('accuracy', '<f4'),    # GPS 오차 (m, 모르면 NaN)
+    ('hole', 'u1'),
+    ('stroke', 'u1'),       # 홀 안에서 몇 번째 샷인지 (1부터)
+])
+
+DEFAULT_BATCH = 4
+
+# shot_distance가 타원체 거리와 ERROR_BOUND_M 이내로 맞는 범위 (m)
+SHOT_RANGE_M = 5000.0
+ERROR_BOUND_M = 1e-3
+
+
+def _ecef(lat, lon):
+    phi, lam = math.radians(lat), math.radians(lon)
+    sin_phi, cos_phi = math.sin(phi), math.cos(phi)
+    n = WGS84_A / math.sqrt(1 - WGS84_E2 * sin_phi * sin_phi)
+    return n * cos_phi * math.cos(lam), n * cos_phi * math.sin(lam), n * (1 - WGS84_E2) * sin_phi
+
+
+def shot_distance(lat1, lon1, lat2, lon2):
+    """샷 거리 (m). 두 점의 지구 중심 좌표 사이 직선 거리
+
+    5 km 이내에서는 타원체 거리와 1 mm 이내로 같고, 극지방이나 경도 ±180° 부근에서도 그대로 맞음
+    """
+    x1, y1, z1 = _ecef(lat1, lon1)
+    x2, y2, z2 = _ecef(lat2, lon2)
+    return math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2 + (z2 - z1) ** 2)
+
+
+def read_round(path):
+    """라운드 파일 → SHOT_DTYPE 배열"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path}: 샷 기록 파일이 아닙니다.")
+        return np.fromfile(f, dtype=SHOT_DTYPE)
+
+
+def coords(shots):
+    """레코드 배열 → (위도, 경도) 배열"""
+    return shots['lat'] / COORD_SCALE, shots['lon'] / COORD_SCALE
+
+
+# 프로세스 종료 때 버퍼를 저장할 열린 기록들
+_open_logs = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_logs():
+    for log in list(_open_logs):
+        log.flush()
+
+
+class RoundLog:
+    """한 라운드의 샷 기록. mark()는 버퍼에 쓰기만 하고 batch개마다 파일에 덧붙임"""
+
+    def __init__(self, path, batch=DEFAULT_BATCH):
+        self.path = path
+        self._buffer = np.zeros(batch, dtype=SHOT_DTYPE)
+        self._pending = 0
+        self._written = 0
+        self._last = None   # (홀, 타수, 위도, 경도)
+        if os.path.exists(path):
+            # 이어서 기록: 마지막 레코드로 직전 표시 지점을 복원
+            shots = read_round(path)
+            self._written = len(shots)
+            if len(shots):
+                last = shots[-1]
+                self._last = (int(last['hole']), int(last['stroke']),
+                              last['lat'] / COORD_SCALE, last['lon'] / COORD_SCALE)
+        else:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(MAGIC)
+        _open_logs.add(self)
+
+    def __del__(self):
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+    @classmethod
+    def start(cls, course_id, directory=ROUND_DIR, batch=DEFAULT_BATCH):
+        """새 라운드 파일 (코스 디렉터리 아래 시작 시각 + 임의 id 이름)"""
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.shots"
+        return cls(os.path.join(directory, course_id, name), batch)
+
+    def __len__(self):
+        return self._written + self._pending
+
+    def mark(self, lat, lon, hole, accuracy=math.nan, timestamp_ms=None):
+        """샷 위치 표시. 직전 샷 거리(m)를 반환 (홀의 첫 샷이면 NaN)"""
+        hole = int(hole)
+        if self._last is not None and self._last[0] == hole:
+            stroke = self._last[1] + 1
+            length = shot_distance(self._last[2], self._last[3], lat, lon)
+        else:
+            # 홀이 바뀌면 앞 홀 기록은 바로 저장
+            if self._pending:
+                self.flush()
+            stroke, length = 1, math.nan
+        if self._pending == len(self._buffer):
+            self.flush()
+
+        record = self._buffer[self._pending]
+        record['time'] = int(time.time() * 1000) if timestamp_ms is None else int(timestamp_ms)
+        record['lat'] = round(lat * COORD_SCALE)
+        record['lon'] = round(lon * COORD_SCALE)
+        record['length'] = length
+        record['accuracy'] = math.nan if accuracy is None else accuracy
+        record['hole'] = hole
+        record['stroke'] = min(stroke, 255)
+        self._pending += 1
+        self._last = (hole, stroke, lat, lon)
+        return length
+
+    def flush(self):
+        if not self._pending:
+            return
+        with open(self.path, 'ab') as f:
+            f.write(self._buffer[:self._pending].tobytes())
+        self._written += self._pending
+        self._pending = 0
+
+    def shots(self):
+        """저장된 레코드 + 아직 버퍼에 있는 레코드"""
+        return np.concatenate([read_round(self.path), self._buffer[:self._pending]])
+
+
+def load_rounds(directory=ROUND_DIR, course_id=None):
+    """여러 라운드를 한 배열로 (레코드 배열, 라운드별 시작 위치, 파일 경로 목록)
+
+    라운드 i의 샷은 shots[starts[i]:starts[i + 1]]
+    """
+    pattern = os.path.join(directory, course_id or '*', '*.shots')
+    paths = sorted(glob.glob(pattern))
+    rounds = [read_round(p) for p in paths]
+    starts = np.zeros(len(rounds) + 1, dtype=np.int64)
+    np.cumsum([len(r) for r in rounds], out=starts[1:])
+    shots = np.concatenate(rounds) if rounds else np.empty(0, dtype=SHOT_DTYPE)
+    return shots, starts, paths
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="샷 기록 보기")
+    sub = parser.add_subparsers(dest='command', required=True)
+    listing = sub.add_parser('list')
+    listing.add_argument('--course')
+    show = sub.add_parser('show')
+    show.add_argument('path')
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        shots, starts, paths = load_rounds(course_id=args.course)
+        for i, path in enumerate(paths):
+            print(f"{os.path.relpath(path, ROUND_DIR)}: 샷 {starts[i + 1] - starts[i]}개")
+        print(f"라운드 {len(paths)}개, 샷 {len(shots)}개, {shots.nbytes / 2**10:.1f} KiB")
+    else:
+        shots = read_round(args.path)
+        lats, lons = coords(shots)
+        for shot, lat, lon in zip(shots.tolist(), lats.tolist(), lons.tolist()):
+            length = '-' if math.isnan(shot[3]) else f"{shot[3]:.1f} m"
+            print(f"홀 {shot[5]:2d} #{shot[6]}  {lat:.6f}, {lon:.6f}  직전 샷 {length}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
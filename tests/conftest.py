@@ -0,0 +1,33 @@
+# 저장소 최상위 모듈(distance_engine, course_data ...)을 tests/ 에서 import 할 수 있게 함
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def make_course(tmp_path):
+    """공통 딕셔너리 형식의 코스 → 컴파일된 Course (임시 디렉터리의 YAML/바이너리 사용)"""
+    import yaml
+
+    from course_data import CourseStore, compile_courses
+
+    def make(course):
+        source = tmp_path / f"{course['id']}.yaml"
+        source.write_text(yaml.safe_dump(course), encoding='utf-8')
+        out = str(tmp_path / f"{course['id']}.bin")
+        compile_courses([str(source)], out)
+        return CourseStore(out).course(course['id'])
+
+    return make
+
+
+def offset(point, east_m, north_m):
+    """(위도, 경도)에서 동/북쪽으로 대략 east_m, north_m 떨어진 점 (경도 ±180° 정규화)"""
+    import math
+
+    lat, lon = point
+    lon = lon + east_m / (111320.0 * math.cos(math.radians(lat)))
+    return lat + north_m / 111320.0, (lon + 180.0) % 360.0 - 180.0
@@ -0,0 +1,28 @@
+import pytest
+
+from conftest import offset
+from centerline import Centerlines
+from distance_engine import geodesic_distance
+
+
+@pytest.mark.parametrize('tee', [(-27.5, 153.0), (-16.78, 179.998)], ids=['jindalee', 'antimeridian'])
+def test_dogleg_distance(make_course, tee):
+    corner = offset(tee, 0.0, 250.0)
+    pin = offset(corner, 150.0, 0.0)
+    course = make_course({'id': 'c', 'holes': [
+        {'number': 1, 'tee': list(tee), 'pin': list(pin),
+         'fairway': [list(offset(tee, 0.0, 120.0)), list(corner)]},  # 일직선 지점은 꺾임점 아님
+        {'number': 2, 'pin': list(offset(pin, 100.0, 0.0))},
+    ]})
+    lines = Centerlines(course)
+    assert 1 in lines and 2 not in lines
+    assert lines.along(tee, 2) is None
+    leg1 = float(geodesic_distance(*tee, *corner))
+    leg2 = float(geodesic_distance(*corner, *pin))
+    total, bends = lines.along(tee, 1)
+    assert total == pytest.approx(leg1 + leg2, abs=0.05)
+    assert bends == pytest.approx((leg1,), abs=0.05)
+    # 꺾임점을 지나면 남은 꺾임점 없음, 거리는 홀컵까지 직선
+    past = offset(corner, 50.0, 0.0)
+    total, bends = lines.along(past, 1)
+    assert bends == () and total == pytest.approx(float(geodesic_distance(*past, *pin)), abs=0.05)
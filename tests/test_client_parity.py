@@ -0,0 +1,97 @@
+# 브라우저 거리 컴포넌트의 JS 계산이 Python 구현과 같은 값을 내는지 (node가 있을 때만)
+import json
+import os
+import re
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+from distance_engine import LocalFrame, geodesic_distance
+from gps_filter import PositionFilter
+
+HTML = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                    'distance_component', 'frontend', 'index.html')
+JS_FUNCTIONS = ('ecef', 'makeFrame', 'toEnu', 'vincenty', 'kfStart', 'kfUpdate', 'kfPosition')
+
+DRIVER = """
+let frame = null, kf = null;
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+frame = makeFrame(input.frame[0], input.frame[1]);
+const out = {
+  enu: input.points.map(function (p) { return toEnu(p[0], p[1]); }),
+  geodesic: input.pairs.map(function (p) { return vincenty(p[0], p[1], p[2], p[3]); }),
+  track: [],
+};
+input.fixes.forEach(function (f) {
+  const ok = kfUpdate(f[0], f[1], f[2], f[3] / 1000);
+  const p = kfPosition();
+  out.track.push([ok, p.lat, p.lon, p.accuracy]);
+});
+console.log(JSON.stringify(out));
+"""
+
+pytestmark = pytest.mark.skipif(shutil.which('node') is None, reason="node가 없음")
+
+
+def _script():
+    with open(HTML, encoding='utf-8') as f:
+        source = f.read().replace('\r\n', '\n')
+    pieces = [re.search(r'^const A = .*$', source, re.M).group(0),
+              re.search(r'^const M_PER_DEG_LAT = .*$', source, re.M).group(0)]
+    for name in JS_FUNCTIONS:
+        pieces.append(re.search(r'^function %s\(.*?^}$' % name, source, re.M | re.S).group(0))
+    return '\n'.join(pieces) + DRIVER
+
+
+def _fixes(seed=0):
+    """걷기 + 잡음 위치 (위도, 경도, 정확도, 시각 ms): 이상값, 순서 뒤바뀜, 나쁜 정확도, 큰 이동 포함"""
+    rng = np.random.default_rng(seed)
+    lat, lon, t = -27.5354, 152.9444, 1_700_000_000_000
+    fixes = []
+    for k in range(120):
+        t += 1000
+        lat += 1.2 / 111320.0
+        accuracy = float(rng.uniform(3, 15))
+        noise = rng.normal(0, accuracy / 111320.0, 2)
+        fixes.append([lat + noise[0], lon + noise[1], accuracy, t])
+        if k == 30:
+            fixes.append([lat + 0.01, lon, 5.0, t + 200])          # 이상값
+        if k == 50:
+            fixes.append([lat, lon, 5.0, t - 5000])                 # 순서 뒤바뀜
+        if k == 70:
+            fixes.append([lat, lon, 80.0, t + 300])                 # 정확도 나쁨
+            fixes.append([lat, lon, None, t + 400])                 # 정확도 모름
+    for k in range(8):                                              # 카트로 크게 이동 → 재시작
+        t += 1000
+        fixes.append([lat + 0.003, lon + 0.002, 5.0, t])
+    return fixes
+
+
+def test_js_matches_python(tmp_path):
+    frame = (-27.53542, 152.94444)
+    rng = np.random.default_rng(1)
+    points = np.column_stack([frame[0] + rng.uniform(-0.05, 0.05, 50), frame[1] + rng.uniform(-0.05, 0.05, 50)])
+    pairs = np.column_stack([rng.uniform(-80, 80, (50, 1)), rng.uniform(-180, 180, (50, 1)),
+                             rng.uniform(-80, 80, (50, 1)), rng.uniform(-180, 180, (50, 1))])
+    pairs[0] = (-16.78, 179.999, -16.78, -179.998)  # 날짜변경선
+    fixes = _fixes()
+    script = tmp_path / 'parity.js'
+    script.write_text(_script(), encoding='utf-8')
+    payload = json.dumps({'frame': frame, 'points': points.tolist(), 'pairs': pairs.tolist(), 'fixes': fixes})
+    out = json.loads(subprocess.run(['node', str(script)], input=payload, capture_output=True, text=True,
+                                    check=True, timeout=60).stdout)
+
+    e, n = LocalFrame(*frame).to_enu(points[:, 0], points[:, 1])
+    np.testing.assert_allclose(out['enu'], np.column_stack([e, n]), atol=1e-6)
+
+    np.testing.assert_allclose(out['geodesic'], geodesic_distance(*pairs.T), atol=1e-6)
+
+    f = PositionFilter()
+    expected = []
+    for lat, lon, accuracy, t in fixes:
+        ok = f.update(lat, lon, accuracy, t)
+        expected.append([ok, *f.position, f.accuracy])
+    assert [row[0] for row in out['track']] == [row[0] for row in expected]
+    np.testing.assert_allclose([row[1:] for row in out['track']], [row[1:] for row in expected], atol=1e-9)
@@ -0,0 +1,139 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from course_data import (
+    CourseDataError, CourseStore, _stale, compile_courses, load_source, open_store, source_files,
+)
+
+YAML = """\
+id: demo
+name: Demo Course
+holes:
+  - number: 2
+    par: 3
+    pin: [-27.5, 153.0]
+    green: [[-27.5001, 153.0], [-27.5, 153.0001], [-27.4999, 153.0], [-27.5001, 153.0]]
+  - number: 1
+    par: 4
+    pin: [-27.501, 153.001]
+    tee: [-27.503, 153.001]
+    fairway: [[-27.502, 153.001], [-27.5015, 153.001]]
+    hazards:
+      - kind: water
+        polygon: [[-27.502, 153.002], [-27.502, 153.0025], [-27.5025, 153.0025]]
+"""
+
+
+def _feature(props, geometry):
+    return {'type': 'Feature', 'properties': props, 'geometry': geometry}
+
+
+def _geojson(features, **props):
+    return {'type': 'FeatureCollection', 'properties': props, 'features': features}
+
+
+@pytest.fixture
+def sources(tmp_path):
+    (tmp_path / 'demo.yaml').write_text(YAML, encoding='utf-8')
+    (tmp_path / 'other.json').write_text(json.dumps(_geojson([
+        _feature({'hole': 1, 'kind': 'pin', 'par': 5}, {'type': 'Point', 'coordinates': [152.0, -27.0]}),
+    ], id='other')), encoding='utf-8')
+    (tmp_path / 'notes.txt').write_text('x', encoding='utf-8')
+    return tmp_path
+
+
+def test_source_files_include_json(sources):
+    assert [p.rsplit('/', 1)[-1] for p in source_files(str(sources))] == ['demo.yaml', 'other.json']
+
+
+def test_compile_and_open(sources, tmp_path):
+    out = str(tmp_path / 'courses.bin')
+    assert sorted(compile_courses(source_files(str(sources)), out)) == ['demo', 'other']
+    store = CourseStore(out)
+    course = store.course('demo')
+    assert store.course('demo') is course
+    assert course.name == 'Demo Course'
+    assert course.number.tolist() == [1, 2]
+    assert course.hole_coords() == {1: (-27.501, 153.001), 2: (-27.5, 153.0)}
+    assert course.tee_coords() == {1: (-27.503, 153.001)}
+    # 닫는 점은 제거됨
+    assert course.green_polygon(1).shape == (3, 2)
+    assert course.fairway_coords() == {1: [(-27.502, 153.001), (-27.5015, 153.001)]}
+    assert course.hazard_polygon(0).shape == (3, 2)
+    assert not course.pin.flags.writeable
+    other = store.course('other')
+    assert other.name == 'other'  # 이름이 없으면 id
+    assert other.par.tolist() == [5]
+    np.testing.assert_allclose(other.pin, [[-27.0, 152.0]])
+
+
+def test_unknown_course_and_bad_file(sources, tmp_path):
+    out = str(tmp_path / 'courses.bin')
+    compile_courses(source_files(str(sources)), out)
+    with pytest.raises(CourseDataError):
+        CourseStore(out).course('missing')
+    bad = tmp_path / 'bad.bin'
+    bad.write_bytes(b'not a course store')
+    with pytest.raises(CourseDataError):
+        CourseStore(str(bad))
+
+
+def test_open_store_recompiles_stale(sources, tmp_path):
+    out = str(tmp_path / 'store.bin')
+    assert open_store(out, str(sources)).course_ids() == ['demo', 'other']
+    open_store.cache_clear()
+
+
+def test_duplicate_course_id(sources, tmp_path):
+    dup = tmp_path / 'dup.yaml'
+    dup.write_text(YAML, encoding='utf-8')
+    with pytest.raises(CourseDataError):
+        compile_courses([str(sources / 'demo.yaml'), str(dup)], str(tmp_path / 'x.bin'))
+
+
+@pytest.mark.parametrize('props, geometry, message', [
+    ({'kind': 'pin'}, {'type': 'Point', 'coordinates': [153.0, -27.5]}, 'feature 0: hole'),
+    ({'hole': 'x', 'kind': 'pin'}, {'type': 'Point', 'coordinates': [153.0, -27.5]}, 'feature 0: hole'),
+    ({'hole': 1, 'kind': 'pin', 'par': 'x'}, {'type': 'Point', 'coordinates': [153.0, -27.5]}, 'par'),
+    ({'hole': 1, 'kind': 'pin'}, {'type': 'Point'}, 'geometry'),
+    ({'hole': 1, 'kind': 'cart'}, {'type': 'Point', 'coordinates': [153.0, -27.5]}, 'feature 0'),
+])
+def test_geojson_errors(tmp_path, props, geometry, message):
+    path = tmp_path / 'bad.geojson'
+    path.write_text(json.dumps(_geojson([_feature(props, geometry)])), encoding='utf-8')
+    with pytest.raises(CourseDataError, match=message):
+        load_source(str(path))
+
+
+@pytest.mark.parametrize('text, message', [
+    ('holes:\n  - number: 1\n    pin: [95.0, 153.0]\n', '범위'),
+    ('holes: []\n', '홀이 없습니다'),
+    ('- just\n- a list\n', '매핑'),
+    ('holes:\n  - pin: [-27.5, 153.0]\n', '0번째 홀: number'),
+    ('holes:\n  - number: one\n    pin: [-27.5, 153.0]\n', 'number가 정수'),
+    ('holes:\n  - number: 1\n    par: four\n    pin: [-27.5, 153.0]\n', '홀 1: par'),
+    ('holes:\n  - number: 1\n    pin: [-27.5, 153.0]\n    hazards: [{kind: water}]\n', '홀 1: 해저드'),
+    ('holes:\n  - number: 1\n    pin: [-27.5, 153.0]\n  - number: 1\n    pin: [-27.6, 153.0]\n', '중복'),
+    ('holes:\n  - number: 1\n    pin: [-27.5, 153.0]\n    fairway: 3\n', '좌표 목록'),
+    ('holes: [\n', 'YAML'),
+])
+def test_yaml_errors(tmp_path, text, message):
+    path = tmp_path / 'bad.yaml'
+    path.write_text(text, encoding='utf-8')
+    with pytest.raises(CourseDataError, match=message):
+        load_source(str(path))
+
+
+def test_stale_store_notices_deleted_source(sources, tmp_path):
+    out = str(tmp_path / 'store.bin')
+    compile_courses(source_files(str(sources)), out)
+    assert not _stale(out, str(sources))
+    os.remove(sources / 'other.json')
+    assert _stale(out, str(sources))
+    compile_courses(source_files(str(sources)), out)
+    assert not _stale(out, str(sources))
+    # 임시 파일이 남지 않음
+    assert not [p for p in os.listdir(tmp_path) if p.endswith('.tmp')]
@@ -0,0 +1,50 @@
+import math
+
+import numpy as np
+import pytest
+
+from distance_engine import (
+    ERROR_BOUND_M, PROJECTED_ERROR_BOUND_M, DistanceEngine, ProjectedEngine, center,
+    check_accuracy, check_projected_accuracy, geodesic_distance,
+)
+
+JINDALEE = {1: (-27.53918, 152.945457), 9: (-27.535837, 152.943191), 6: (-27.532689, 152.945452)}
+# 날짜변경선(±180°)에 걸친 코스
+ANTIMERIDIAN = {1: (-16.78, 179.998), 2: (-16.781, -179.997), 3: (-16.779, 179.9995)}
+
+
+def test_geodesic_within_error_bound():
+    assert check_accuracy(n=2000) <= ERROR_BOUND_M
+
+
+@pytest.mark.parametrize('holes', [JINDALEE, ANTIMERIDIAN], ids=['jindalee', 'antimeridian'])
+def test_projected_within_error_bound(holes):
+    assert check_projected_accuracy(holes, n=5000) <= PROJECTED_ERROR_BOUND_M
+
+
+def test_zero_and_antipodal_distance():
+    assert geodesic_distance(-27.5, 153.0, -27.5, 153.0) == pytest.approx(0.0, abs=1e-9)
+    # 적도 위 대척점은 반 자오선 둘레 (Vincenty가 수렴하지 않아 Karney로 넘어가는 경우)
+    assert geodesic_distance(0.0, 0.0, 0.0, 180.0) == pytest.approx(20003931.4586, abs=ERROR_BOUND_M)
+
+
+def test_center_uses_circular_mean_of_longitudes():
+    lat0, lon0 = center(np.array([p[0] for p in ANTIMERIDIAN.values()]),
+                        np.array([p[1] for p in ANTIMERIDIAN.values()]))
+    assert abs(lon0) > 179.99
+
+
+def test_projected_falls_back_beyond_radius():
+    engine = ProjectedEngine(JINDALEE)
+    far = (engine.frame.lat0 + 1.0, engine.frame.lon0)
+    assert not engine.in_range(far)
+    assert engine.distances(far) == pytest.approx(DistanceEngine(JINDALEE).distances(far), abs=1e-6)
+
+
+def test_distance_by_hole_number():
+    engine = ProjectedEngine(JINDALEE)
+    lat, lon = JINDALEE[9]
+    assert engine.distance((lat, lon), 9) == pytest.approx(0.0, abs=PROJECTED_ERROR_BOUND_M)
+    assert engine.distance((lat, lon), 1) == pytest.approx(
+        float(geodesic_distance(lat, lon, *JINDALEE[1])), abs=PROJECTED_ERROR_BOUND_M)
+    assert not math.isnan(engine.distance((lat, lon), 6))
@@ -0,0 +1,52 @@
+import math
+
+import numpy as np
+import pytest
+
+from conftest import offset
+from distance_engine import DistanceEngine, ProjectedEngine, geodesic_distance
+from distance_raster import DistanceRaster, build_raster, error_bound
+
+PIN = (-27.5, 153.0)
+
+
+@pytest.fixture
+def course(make_course):
+    return make_course({'id': 'r', 'holes': [
+        {'number': 1, 'pin': list(PIN)},
+        {'number': 2, 'pin': list(offset(PIN, 250.0, 120.0))},
+    ]})
+
+
+@pytest.fixture
+def raster(course, tmp_path):
+    path = build_raster(course, step_m=2.0, margin_m=50.0, path=str(tmp_path / 'r.npy'))
+    return DistanceRaster(path, fallback=ProjectedEngine(course.hole_coords()))
+
+
+def test_within_error_bound(course, raster):
+    assert raster.grid.dtype == np.float16
+    # 최대 거리 < 512 m: float16 간격 0.25 m의 절반 + 보간(칸 대각선의 절반) + 평면 근사
+    assert raster.error_bound_m <= error_bound(np.float16, 511.0, 2.0)
+    rng = np.random.default_rng(0)
+    positions = [offset(PIN, *rng.uniform(-40, 280, 2)) for _ in range(300)]
+    exact = DistanceEngine(course.hole_coords()).matrix(np.array(positions))
+    got = raster.matrix(positions)
+    assert np.abs(got - exact).max() <= raster.error_bound_m
+    np.testing.assert_allclose(got[0], raster.distances(positions[0]))
+    assert raster.distance(positions[0], 2) == pytest.approx(got[0, 1])
+
+
+def test_outside_and_non_finite_use_fallback(course, raster):
+    far = offset(PIN, 3000.0, 0.0)
+    assert raster.distance(far, 1) == pytest.approx(float(geodesic_distance(*far, *PIN)), abs=0.01)
+    nan = (math.nan, math.nan)
+    assert np.isnan(raster.distances(nan)).all()
+    assert math.isnan(raster.distance(nan, 1))
+    assert np.isnan(raster.matrix([nan, PIN])[0]).all()
+
+    bare = DistanceRaster(raster.path)
+    with pytest.raises(ValueError):
+        bare.distance(far, 1)
+    with pytest.raises(ValueError):
+        bare.distances((math.inf, 153.0))
@@ -0,0 +1,78 @@
+# 타일 DEM: ASCII grid 변환, 타일 경계를 넘는 쌍선형 보간, nodata/범위 밖, plays-like
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from elevation import TILE, ElevationModel, PlaysLike, convert
+
+ROWS, COLS = TILE + 44, 12
+WEST, SOUTH, CELL = 152.9, -27.6, 0.0001
+
+
+def _plane(r, c):
+    return 50.0 + 0.25 * r - 0.5 * c
+
+
+def _write_grid(path, nodata_at=None):
+    rows = np.arange(ROWS)[:, None]
+    cols = np.arange(COLS)[None, :]
+    data = _plane(rows, cols)
+    if nodata_at is not None:
+        data[nodata_at] = -9999
+    header = (f"ncols {COLS}\nnrows {ROWS}\nxllcorner {WEST}\nyllcorner {SOUTH}\n"
+              f"cellsize {CELL}\nNODATA_value -9999\n")
+    with open(path, 'w', encoding='ascii') as f:
+        f.write(header)
+        np.savetxt(f, data, fmt='%.3f')
+
+
+def _latlon(r, c):
+    """셀 (행, 열) 중심 좌표 (행 0이 북쪽)"""
+    north = SOUTH + ROWS * CELL
+    return north - (np.asarray(r) + 0.5) * CELL, WEST + (np.asarray(c) + 0.5) * CELL
+
+
+@pytest.fixture
+def dem(tmp_path):
+    src = tmp_path / 'dem.asc'
+    _write_grid(src, nodata_at=(5, 5))
+    out = str(tmp_path / 'dem.npy')
+    assert convert(str(src), out) == (ROWS, COLS)
+    return ElevationModel(out, max_tiles=1)
+
+
+def test_bilinear_across_tile_boundary(dem):
+    r = np.array([10.25, TILE - 0.5, TILE + 0.75, ROWS - 2.0])
+    c = np.array([1.5, 3.25, 7.0, 10.5])
+    lats, lons = _latlon(r, c)
+    got = dem.sample(lats, lons)
+    assert got == pytest.approx(_plane(r, c), abs=1e-3)
+    for lat, lon, want in zip(lats, lons, got):
+        assert dem.elevation(lat, lon) == pytest.approx(want, abs=1e-9)
+
+
+def test_nodata_and_outside_are_nan(dem):
+    lat, lon = _latlon(5.5, 5.5)
+    assert np.isnan(dem.elevation(lat, lon))
+    assert np.isnan(dem.sample([lat, SOUTH - 0.01], [lon, WEST])).all()
+
+
+def test_crop_to_bounds(tmp_path):
+    src = tmp_path / 'dem.asc'
+    _write_grid(src)
+    (south, west), (north, east) = _latlon(60, 2), _latlon(20, 8)
+    out = str(tmp_path / 'crop.npy')
+    rows, cols = convert(str(src), out, bounds=(south, west, north, east))
+    assert rows < ROWS and cols < COLS
+    lat, lon = _latlon(40.25, 5.5)
+    assert ElevationModel(out).elevation(lat, lon) == pytest.approx(_plane(40.25, 5.5), abs=1e-3)
+
+
+def test_plays_like_adds_rise_and_ignores_unknown_elevation(dem):
+    pins = np.column_stack(_latlon([20.0, 200.0, 5.0], [2.0, 2.0, 5.0]))
+    here = _latlon(100.0, 2.0)
+    plays = PlaysLike(SimpleNamespace(pin=pins), dem, factor=1.0)
+    distances, rise = plays.adjust(here, [150.0, 150.0, 150.0])
+    assert rise == pytest.approx([_plane(20, 2) - _plane(100, 2), _plane(200, 2) - _plane(100, 2), 0.0], abs=1e-3)
+    assert distances == pytest.approx(150.0 + rise)
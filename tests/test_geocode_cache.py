@@ -0,0 +1,60 @@
+# 역지오코딩 캐시: 메모리/SQLite 히트와 ttl 만료
+from geocode_cache import ReverseGeocodeCache, StubGeocoder
+
+POINT = (-27.5, 152.94)
+
+
+class _NoAddress(StubGeocoder):
+    def reverse(self, query, **kwargs):
+        super().reverse(query)
+        return None
+
+
+def _cache(geocoder, db, **kwargs):
+    return ReverseGeocodeCache(geocoder, db_path=str(db), min_interval=0, **kwargs)
+
+
+def test_disk_hit_within_ttl(tmp_path):
+    geocoder = StubGeocoder()
+    db = tmp_path / 'geocode.sqlite3'
+    first = _cache(geocoder, db).reverse(*POINT)
+    again = _cache(geocoder, db).reverse(*POINT)
+    assert geocoder.calls == 1
+    assert again.address == first.address
+
+
+def test_expired_disk_entry_is_fetched_again(tmp_path):
+    geocoder = StubGeocoder()
+    db = tmp_path / 'geocode.sqlite3'
+    cache = _cache(geocoder, db, ttl=3600.0)
+    cache.reverse(*POINT)
+    cache._db.execute("UPDATE reverse_geocode SET fetched_at = fetched_at - 7200")
+    cache._db.commit()
+
+    fresh = _cache(geocoder, db, ttl=3600.0)
+    assert fresh.reverse(*POINT) is not None
+    assert geocoder.calls == 2
+    assert fresh.counters['misses'] == 1 and fresh.counters['disk_hits'] == 0
+    # 다시 가져온 결과로 시각이 갱신되어 다음에는 디스크 히트
+    assert _cache(geocoder, db, ttl=3600.0).reverse(*POINT) is not None
+    assert geocoder.calls == 2
+
+
+def test_memory_entry_expires(tmp_path):
+    geocoder = StubGeocoder()
+    cache = _cache(geocoder, tmp_path / 'geocode.sqlite3', ttl=0.0)
+    cache.reverse(*POINT)
+    cache.reverse(*POINT)
+    assert geocoder.calls == 2
+    assert cache.counters['memory_hits'] == 0
+
+
+def test_missing_address_uses_empty_ttl(tmp_path):
+    geocoder = _NoAddress()
+    db = tmp_path / 'geocode.sqlite3'
+    assert _cache(geocoder, db, empty_ttl=0.0).reverse(*POINT) is None
+    assert _cache(geocoder, db, empty_ttl=0.0).reverse(*POINT) is None
+    assert geocoder.calls == 2
+    # 주소 없음도 empty_ttl 안에서는 캐시됨
+    assert _cache(geocoder, db).reverse(*POINT) is None
+    assert geocoder.calls == 2
@@ -0,0 +1,43 @@
+# GPS 칼만 필터: 평활화, 이상값/역순 위치 거부, 연속 거부 후 재시작
+import numpy as np
+import pytest
+
+from conftest import offset
+from gps_filter import PositionFilter
+
+START = (37.5665, 126.978)
+
+
+def test_stationary_noise_is_smoothed():
+    rng = np.random.default_rng(3)
+    f = PositionFilter()
+    for k in range(60):
+        lat, lon = offset(START, *rng.normal(0.0, 5.0, 2))
+        assert f.update(lat, lon, 5.0, k * 1000)
+    lat, lon = f.position
+    assert lat == pytest.approx(START[0], abs=3.0 / 111320.0)
+    assert lon == pytest.approx(START[1], abs=3.0 / 88000.0)
+    assert f.accuracy < 5.0
+    assert f.accepted == 60 and f.rejected == 0
+
+
+def test_poor_accuracy_and_out_of_order_fixes_are_counted():
+    f = PositionFilter(max_accuracy_m=50.0)
+    assert f.update(*START, 5.0, 10_000)
+    assert not f.update(*START, 80.0, 11_000)
+    assert not f.update(*START, 5.0, 9_000)
+    assert (f.accepted, f.rejected) == (1, 2)
+    # 역순 위치는 이동 판단용 연속 거부 횟수에 들어가지 않음
+    assert f._rejects_in_row == 0
+
+
+def test_outliers_rejected_then_restart_after_max_rejects():
+    f = PositionFilter(max_rejects=3)
+    for k in range(5):
+        assert f.update(*START, 5.0, k * 1000)
+    far = offset(START, 500.0, 0.0)
+    assert not f.update(*far, 5.0, 5000)
+    assert not f.update(*far, 5.0, 6000)
+    assert f.update(*far, 5.0, 7000)
+    assert f.position == pytest.approx(far)
+    assert (f.accepted, f.rejected) == (6, 3)
@@ -0,0 +1,45 @@
+import math
+
+import numpy as np
+import pytest
+
+from conftest import offset
+from distance_engine import PROJECTED_ERROR_BOUND_M, geodesic_distance
+from green_geometry import GreenGeometry
+
+PIN = (-27.5, 153.0)
+
+
+def _square(centre, half_m):
+    return [list(offset(centre, e, n)) for e, n in
+            ((-half_m, -half_m), (half_m, -half_m), (half_m, half_m), (-half_m, half_m))]
+
+
+def test_front_centre_back(make_course):
+    course = make_course({'id': 'g', 'holes': [
+        {'number': 1, 'pin': list(PIN), 'green': _square(PIN, 10.0)},
+        {'number': 2, 'pin': list(offset(PIN, 300.0, 0.0))},
+    ]})
+    greens = GreenGeometry(course)
+    position = offset(PIN, 0.0, -100.0)
+    front, centre, back = greens.card(position, 1)
+    # offset()은 근사라 실제 간격은 1% 이내로만 맞음
+    assert (front, centre, back) == pytest.approx((90.0, 100.0, 110.0), rel=0.01)
+    assert back - centre == pytest.approx(centre - front, abs=0.01)
+    # 그린 외곽선이 없는 홀: 앞/뒤 NaN, 가운데는 홀컵 거리
+    front, centre, back = greens.card(position, 2)
+    assert math.isnan(front) and math.isnan(back)
+    assert centre == pytest.approx(float(geodesic_distance(*position, *course.pin[1])), abs=PROJECTED_ERROR_BOUND_M)
+    # 그린 위에서는 앞 거리 0
+    assert greens.card(offset(PIN, 0.0, 5.0), 1)[0] == 0.0
+
+
+def test_frame_across_antimeridian(make_course):
+    west, east = (-16.78, 179.999), (-16.78, -179.998)
+    course = make_course({'id': 'fiji', 'holes': [
+        {'number': 1, 'pin': list(west)}, {'number': 2, 'pin': list(east)},
+    ]})
+    greens = GreenGeometry(course)
+    assert abs(greens.frame.lon0) > 179.0
+    _, centre, _ = greens.cards(west)
+    np.testing.assert_allclose(centre, [0.0, float(geodesic_distance(*west, *east))], atol=PROJECTED_ERROR_BOUND_M)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from conftest import offset
+from hazard_index import HazardIndex, STRTree
+
+
+def _box(centre, east_m, north_m, half_m):
+    return [list(offset(centre, east_m + e, north_m + n)) for e, n in
+            ((-half_m, -half_m), (half_m, -half_m), (half_m, half_m), (-half_m, half_m))]
+
+
+def test_strtree_matches_brute_force():
+    rng = np.random.default_rng(0)
+    lo = rng.uniform(0, 1000, (500, 2))
+    boxes = np.column_stack([lo, lo + rng.uniform(1, 30, (500, 2))])
+    tree = STRTree(boxes, node_size=4)
+    for _ in range(200):
+        qx, qy = rng.uniform(-50, 1000, 2)
+        q = (qx, qy, qx + rng.uniform(0, 200), qy + rng.uniform(0, 200))
+        brute = np.flatnonzero((boxes[:, 0] <= q[2]) & (boxes[:, 2] >= q[0])
+                               & (boxes[:, 1] <= q[3]) & (boxes[:, 3] >= q[1]))
+        assert sorted(tree.query(q).tolist()) == brute.tolist()
+    assert len(STRTree(np.empty((0, 4))).query((0, 0, 1, 1))) == 0
+
+
+@pytest.mark.parametrize('pin', [(-27.5, 153.0), (-16.78, 179.9995)], ids=['jindalee', 'antimeridian'])
+def test_in_play(make_course, pin):
+    tee = offset(pin, 0.0, -300.0)
+    course = make_course({'id': 'h', 'holes': [{'number': 1, 'pin': list(pin), 'tee': list(tee), 'hazards': [
+        {'kind': 'water', 'polygon': _box(pin, 0.0, -150.0, 20.0)},    # 플레이 선 위
+        {'kind': 'bunker', 'polygon': _box(pin, 200.0, -150.0, 10.0)},  # 통로 밖
+        {'kind': 'ob', 'polygon': _box(pin, 0.0, -350.0, 10.0)},       # 뒤쪽
+    ]}, {'number': 2, 'pin': list(offset(pin, 300.0, 0.0))}]})  # 날짜변경선 건너편 홀
+    hazards = HazardIndex(course)
+    assert abs(hazards.frame.lon0 - offset(pin, 150.0, 0.0)[1]) < 0.01
+    found = hazards.in_play(tee, 1)
+    assert [h['kind'] for h in found] == ['water']
+    # offset()은 근사라 1% 이내로만 맞음
+    assert found[0]['layup'] == pytest.approx(130.0, rel=0.01)
+    assert found[0]['carry'] == pytest.approx(np.hypot(20.0, 170.0), rel=0.01)
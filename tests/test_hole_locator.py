@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from conftest import offset
+from distance_engine import PROJECTED_ERROR_BOUND_M, geodesic_distance
+from hole_locator import GREEN, TEE, HoleLocator, HoleTracker
+
+HOLES = {1: (-27.53918, 152.945457), 2: (-27.53658, 152.94362), 3: (-27.536325, 152.946275),
+         4: (-27.535989, 152.943866), 5: (-27.534852, 152.944261), 6: (-27.532689, 152.945452)}
+TEES = {2: (-27.5385, 152.9441), 3: (-27.5372, 152.9452)}
+
+
+
+def test_candidates_match_brute_force():
+    locator = HoleLocator.from_hole_coords(HOLES, tees=TEES, cell_m=50.0)
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        # 격자 바깥 위치도 포함
+        position = offset(HOLES[1], *rng.uniform(-1500, 1500, 2))
+        e, n = locator.frame.point_to_enu(*position)
+        brute = {}
+        for h, x, y in zip(locator.holes.tolist(), locator.east, locator.north):
+            brute[h] = min(brute.get(h, np.inf), float(np.hypot(x - e, y - n)))
+        best_hole, best_d = locator.nearest(position)
+        assert best_d == pytest.approx(min(brute.values()))
+        assert brute[best_hole] == pytest.approx(best_d)
+        for h, d in locator.candidates(position, slack_m=20.0):
+            assert d == pytest.approx(brute[h])
+            assert d <= best_d + 20.0
+
+
+def test_hole_distance():
+    locator = HoleLocator.from_hole_coords(HOLES, tees=TEES)
+    position = offset(TEES[2], 30.0, 0.0)
+    expected = float(geodesic_distance(*position, *TEES[2]))
+    assert locator.hole_distance(position, 2) == pytest.approx(expected, abs=PROJECTED_ERROR_BOUND_M)
+    assert locator.hole_distance(position, 99) == np.inf
+    assert locator.kinds.count(TEE) == len(TEES) and locator.kinds.count(GREEN) == len(HOLES)
+
+
+def test_empty_locator_rejected():
+    with pytest.raises(ValueError):
+        HoleLocator([])
+
+
+def test_tracker_hysteresis_and_jump():
+    locator = HoleLocator.from_hole_coords(HOLES)
+    tracker = HoleTracker(locator, margin_m=15.0, confirm_fixes=3, jump_m=100.0)
+    assert tracker.update(HOLES[3]) == 3
+    # 3번과 5번 사이 경계 부근: 5번이 margin 이상 가깝지 않으면 그대로 3번
+    midway = tuple((a + b) / 2 for a, b in zip(HOLES[3], HOLES[5]))
+    near5 = offset(midway, 0.0, 5.0)
+    assert tracker.update(near5) == 3
+    # 크게 이동하면 바로 전환
+    assert tracker.update(HOLES[6]) == 6
+
+
+def test_tracker_needs_consecutive_fixes():
+    locator = HoleLocator.from_hole_coords({1: (-27.5, 153.0), 2: offset((-27.5, 153.0), 80.0, 0.0)})
+    tracker = HoleTracker(locator, margin_m=15.0, confirm_fixes=3, jump_m=100.0)
+    assert tracker.update(offset((-27.5, 153.0), 10.0, 0.0)) == 1
+    toward2 = offset((-27.5, 153.0), 60.0, 0.0)  # 2번 20 m, 1번 60 m
+    assert [tracker.update(toward2) for _ in range(3)] == [1, 1, 2]
+
+
+def test_frame_across_antimeridian():
+    west = (-16.78, 179.9995)
+    holes = {1: west, 2: offset(west, 200.0, 0.0), 3: offset(west, 400.0, 0.0)}
+    locator = HoleLocator.from_hole_coords(holes)
+    assert abs(locator.frame.lon0) > 179.0
+    position = offset(west, 380.0, 10.0)
+    hole, d = locator.nearest(position)
+    assert hole == 3
+    assert d == pytest.approx(float(geodesic_distance(*position, *holes[3])), abs=PROJECTED_ERROR_BOUND_M)
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+import ip_locator
+from ip_locator import GeoIpDatabase, IpLocator, compile_geoip_csv, parse_ip
+
+
+@pytest.fixture
+def database(tmp_path):
+    csv_path = tmp_path / 'geoip.csv'
+    csv_path.write_text(
+        'start,end,country,lat,lon\n'
+        '8.8.8.0,8.8.8.255,US,37.751,-97.822\n'
+        '1.0.0.0,1.0.0.255,AU,-27.5,153.0\n'
+        '2001:4860::,2001:4860:ffff::,US,1.0,1.0\n',
+        encoding='utf-8',
+    )
+    out = str(tmp_path / 'geoip.bin')
+    assert compile_geoip_csv(str(csv_path), out) == 2
+    return GeoIpDatabase(out)
+
+
+@pytest.fixture
+def network(monkeypatch):
+    calls = []
+
+    def lookup():
+        calls.append(1)
+        return (10.0, 20.0)
+
+    monkeypatch.setattr(ip_locator, '_network_lookup', lookup)
+    return calls
+
+
+def test_parse_ip():
+    assert parse_ip(' 8.8.8.8 ') == '8.8.8.8'
+    assert parse_ip('2001:4860:0::1') == '2001:4860::1'
+    assert parse_ip('8.8.8.8, 10.0.0.1') is None
+    assert parse_ip(None) is None
+
+
+def test_database_lookup(database):
+    assert database.lookup('1.0.0.7') == pytest.approx((-27.5, 153.0))
+    assert database.lookup('9.9.9.9') is None
+    assert database.lookup('2001:4860::1') is None
+
+
+def test_locate_caches_hits(database, network):
+    locator = IpLocator(database, ttl=600.0, error_ttl=30.0)
+    assert locator.locate('8.8.8.8') == pytest.approx((37.751, -97.822))
+    assert locator.locate('8.8.8.8') == pytest.approx((37.751, -97.822))
+    assert locator.counters['hits'] == 1 and locator.counters['misses'] == 1
+    assert not network
+
+
+def test_missing_address_cached_briefly(database, network):
+    locator = IpLocator(database, ttl=600.0, error_ttl=0.05)
+    for ip in ('2001:4860::1', '9.9.9.9'):
+        assert locator.locate(ip) is None
+        time.sleep(0.1)
+        locator.locate(ip)
+    # error_ttl이 지나 다시 조회했고, 서버 위치(네트워크 조회)로 대신하지 않음
+    assert locator.counters['misses'] == 4
+    assert not network
+
+
+def test_private_and_malformed_use_network(database, network):
+    locator = IpLocator(database)
+    assert locator.locate('192.168.0.10') == (10.0, 20.0)
+    assert locator.locate('not-an-ip, 8.8.8.8') == (10.0, 20.0)
+    assert len(network) == 2
+
+
+def test_errors_cached_for_error_ttl(monkeypatch):
+    calls = []
+
+    def fail():
+        calls.append(1)
+        raise OSError('offline')
+
+    monkeypatch.setattr(ip_locator, '_network_lookup', fail)
+    locator = IpLocator(None, error_ttl=30.0)
+    for _ in range(2):
+        with pytest.raises(OSError):
+            locator.locate()
+    assert len(calls) == 1 and locator.counters['errors'] == 1
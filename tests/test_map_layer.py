@@ -0,0 +1,19 @@
+# 기본 지도 캐시가 프로세스 실행 중에 생긴 타일 캐시를 반영하는지 확인
+import map_layer
+from course_data import DEFAULT_COURSE
+
+
+def test_base_map_follows_tile_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(map_layer, 'MAP_DIR', str(tmp_path))
+    map_layer._base_map_url.cache_clear()
+    tiles = [None]
+    monkeypatch.setattr(map_layer, 'tile_url_template', lambda course_id: tiles[0])
+
+    online = map_layer.base_map_url(DEFAULT_COURSE)
+    assert map_layer.base_map_url(DEFAULT_COURSE) == online
+
+    tiles[0] = f'http://127.0.0.1:8765/{DEFAULT_COURSE}/{{z}}/{{x}}/{{y}}.png'
+    offline = map_layer.base_map_url(DEFAULT_COURSE)
+    assert offline != online
+    assert tiles[0] in (tmp_path / offline.split('/', 1)[1]).read_text(encoding='utf-8')
+    map_layer._base_map_url.cache_clear()
@@ -0,0 +1,90 @@
+# Prometheus 지표: 꺼져 있을 때 무시, timing 리스너 집계, 히스토그램 출력, 캐시 히트율, HTTP 서버
+import urllib.error
+import urllib.request
+
+import pytest
+
+import metrics
+import timing
+
+
+@pytest.fixture(autouse=True)
+def clean_state(monkeypatch):
+    monkeypatch.setattr(metrics, '_enabled', False)
+    monkeypatch.setattr(metrics, '_values', {})
+    monkeypatch.setattr(metrics, '_sessions', {})
+    monkeypatch.setattr(metrics, '_watched', {})
+    monkeypatch.setattr(timing, '_enabled', False)
+    monkeypatch.setattr(timing, '_active', False)
+    monkeypatch.setattr(timing, '_listeners', [])
+    monkeypatch.setattr(timing, '_samples', {})
+
+
+def _lines(text, prefix):
+    return [line for line in text.splitlines() if line.startswith(prefix)]
+
+
+def test_disabled_records_nothing():
+    metrics.inc('golf_map_renders_total')
+    metrics.observe('golf_rerun_duration_seconds', 0.1, script='app')
+    assert metrics.watch('geocode', object()) is not None
+    assert _lines(metrics.render(), 'golf_') == ['golf_sessions_active 0']
+
+
+def test_reruns_and_sections_from_timing():
+    metrics.enable()
+    with timing.rerun('app'):
+        with timing.timer('distance.all_holes'):
+            pass
+        with pytest.raises(OSError):
+            with timing.timer('geocode.fetch'):
+                raise OSError
+    timing.record('distance.all_holes', 0.003)
+    text = metrics.render()
+    assert 'golf_reruns_total{script="app"} 1' in text
+    assert 'golf_rerun_errors_total' not in text
+    assert 'golf_distance_computations_total{kind="all_holes"} 2' in text
+    assert 'golf_external_calls_total{service="nominatim"} 1' in text
+    assert 'golf_external_call_errors_total{service="nominatim"} 1' in text
+    assert _lines(text, 'golf_sessions_active ') == ['golf_sessions_active 0']
+
+
+def test_histogram_is_cumulative():
+    metrics.enable()
+    for seconds in (0.0005, 0.003, 0.003, 20.0):
+        metrics.observe('golf_rerun_duration_seconds', seconds, script='app')
+    text = metrics.render()
+    buckets = _lines(text, 'golf_rerun_duration_seconds_bucket')
+    assert buckets[0] == 'golf_rerun_duration_seconds_bucket{script="app",le="0.001"} 1'
+    assert 'golf_rerun_duration_seconds_bucket{script="app",le="0.005"} 3' in buckets
+    assert buckets[-1] == 'golf_rerun_duration_seconds_bucket{script="app",le="+Inf"} 4'
+    assert 'golf_rerun_duration_seconds_count{script="app"} 4' in text
+    assert float(_lines(text, 'golf_rerun_duration_seconds_sum')[0].split()[-1]) == pytest.approx(20.0065)
+
+
+def test_watched_counters_and_label_escaping():
+    metrics.enable()
+
+    class Cache:
+        counters = {'memory_hits': 3, 'disk_hits': 1, 'misses': 4}
+
+    metrics.watch('geo"code', Cache(), hits=('memory_hits', 'disk_hits'), misses=('misses',))
+    text = metrics.render()
+    assert 'golf_cache_events_total{cache="geo\\"code",event="misses"} 4' in text
+    assert 'golf_cache_hit_ratio{cache="geo\\"code"} 0.5' in text
+
+
+def test_metrics_server():
+    metrics.enable()
+    metrics.inc('golf_map_renders_total')
+    server = metrics.MetricsServer(port=0).start()
+    try:
+        url = f'http://127.0.0.1:{server.port}'
+        with urllib.request.urlopen(url + '/metrics', timeout=5) as r:
+            assert r.headers['Content-Type'] == metrics.CONTENT_TYPE
+            assert 'golf_map_renders_total 1' in r.read().decode('utf-8')
+        with pytest.raises(urllib.error.HTTPError) as e:
+            urllib.request.urlopen(url + '/other', timeout=5)
+        assert e.value.code == 404
+    finally:
+        server.stop()
@@ -0,0 +1,65 @@
+# 오프라인 역지오코더: 넓은 범위의 좌표 정밀도, 잘못된 행 건너뛰기, 최근접 검색
+import math
+
+import numpy as np
+import pytest
+
+from offline_geocoder import OfflineReverseGeocoder
+
+
+def test_point_precision_over_wide_gazetteer():
+    # 서울, 시드니, 런던, 호놀룰루: 평균에서 수천 km 떨어져 있어도 mm 단위까지 유지
+    points = [(37.5665123, 126.9779692, 'Seoul'), (-33.8688197, 151.2092955, 'Sydney'),
+              (51.5072178, -0.1275862, 'London'), (21.3098845, -157.8581401, 'Honolulu')]
+    geocoder = OfflineReverseGeocoder(points)
+    for lat, lon, name in points:
+        location = geocoder.reverse((lat, lon))
+        assert location.address == name
+        assert location.latitude == pytest.approx(lat, abs=1e-8)
+        assert location.longitude == pytest.approx(lon, abs=1e-8)
+        assert location.raw['distance_m'] < 0.01
+
+
+def test_malformed_csv_rows_are_skipped_and_counted(tmp_path):
+    path = tmp_path / 'points.csv'
+    path.write_text(
+        'lat,lon,address\n'
+        '37.5665,126.9780,Seoul City Hall\n'
+        'abc,126.9780,not a number\n'
+        '37.5700,,missing lon\n'
+        '137.0,126.9,out of range\n'
+        '37.5651,126.9895,Jongno,extra column\n'
+        '37.5512,126.9882,Namsan Tower\n',
+        encoding='utf-8')
+    geocoder = OfflineReverseGeocoder.from_file(str(path))
+    assert len(geocoder) == 2
+    assert geocoder.skipped == 4
+    assert geocoder.reverse('37.5513, 126.9881').address == 'Namsan Tower'
+
+
+def test_malformed_geojson_features_are_skipped(tmp_path):
+    path = tmp_path / 'points.geojson'
+    path.write_text(
+        '{"type": "FeatureCollection", "features": ['
+        '{"type": "Feature", "geometry": {"type": "Point", "coordinates": [126.978, 37.5665]},'
+        ' "properties": {"address": "Seoul City Hall"}},'
+        '{"type": "Feature", "geometry": {"type": "Point", "coordinates": ["x", 37.5]}, "properties": {}},'
+        '{"type": "Feature", "geometry": {"type": "Point"}, "properties": {}}]}',
+        encoding='utf-8')
+    geocoder = OfflineReverseGeocoder.from_file(str(path))
+    assert len(geocoder) == 1
+    assert geocoder.skipped == 2
+
+
+def test_nearest_matches_brute_force():
+    rng = np.random.default_rng(7)
+    lat = 37.5 + rng.uniform(-0.05, 0.05, 2000)
+    lon = 127.0 + rng.uniform(-0.05, 0.05, 2000)
+    geocoder = OfflineReverseGeocoder(
+        [(a, b, str(k)) for k, (a, b) in enumerate(zip(lat, lon))], cell_m=100.0)
+    for qlat, qlon in zip(37.5 + rng.uniform(-0.04, 0.04, 50), 127.0 + rng.uniform(-0.04, 0.04, 50)):
+        d = np.hypot((lat - qlat) * 111320.0, (lon - qlon) * 111320.0 * math.cos(math.radians(qlat)))
+        hit = geocoder.nearest(qlat, qlon)
+        assert hit is not None
+        assert geocoder.addresses[hit[0]] == str(int(d.argmin()))
+        assert hit[1] == pytest.approx(d.min(), abs=0.01)
@@ -0,0 +1,55 @@
+# 프로파일 저장: 명시적 stop(), 저장 없이 끝난 스크립트 스레드, 중복 저장 방지
+import os
+import threading
+import time
+
+import pytest
+
+import profiling
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILE_DIR', str(tmp_path))
+    return tmp_path
+
+
+def _busy(seconds=0.05):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _runs(directory):
+    return sorted(p.name for p in directory.iterdir())
+
+
+@pytest.mark.parametrize('mode, suffixes', [('sample', ['.folded', '.txt']),
+                                            ('cprofile', ['.folded', '.prof', '.txt'])])
+def test_stop_writes_profile_once(profile_dir, mode, suffixes):
+    profile = profiling.ScriptProfile('app', mode)
+    _busy()
+    paths = profile.stop()
+    assert sorted(os.path.splitext(p)[1] for p in paths) == suffixes
+    assert profile.stop() == paths
+    assert len(_runs(profile_dir)) == len(suffixes)
+    assert 'app' in (profile_dir / _runs(profile_dir)[-1]).read_text(encoding='utf-8')
+
+
+def test_profile_saved_when_script_thread_ends_without_stop(profile_dir):
+    # 다른 스크립트 실행 스레드에서 st.stop() 등으로 stop() 없이 끝난 경우
+    profiles = []
+
+    def run():
+        profiles.append(profiling.ScriptProfile('app', 'sample'))
+        _busy()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    deadline = time.monotonic() + 5.0
+    while len(_runs(profile_dir)) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [os.path.splitext(p)[1] for p in profiles[0].paths] == ['.folded', '.txt']
+    assert profiles[0].stop() == profiles[0].paths
+    assert len(_runs(profile_dir)) == 2
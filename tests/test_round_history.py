@@ -0,0 +1,64 @@
+import pytest
+
+from conftest import offset
+from round_history import RoundHistory
+from shot_log import RoundLog
+
+PIN = (-27.5, 153.0)
+
+
+@pytest.fixture
+def course(make_course):
+    return make_course({'id': 'demo', 'holes': [
+        {'number': 1, 'par': 4, 'pin': list(PIN)},
+        {'number': 2, 'pin': list(offset(PIN, 400.0, 0.0))},  # 파 모름
+    ]})
+
+
+def _round(tmp_path, name, drive_m, second_m):
+    """1번: 티 → drive_m → (그린까지 second_m) → 홀컵 옆, 2번: 티 → 200 m → 홀컵 옆"""
+    log = RoundLog(str(tmp_path / 'rounds' / 'demo' / name))
+    tee = offset(PIN, 0.0, -(drive_m + second_m))
+    log.mark(*tee, 1, timestamp_ms=1000)
+    log.mark(*offset(tee, 0.0, drive_m), 1, timestamp_ms=2000)
+    log.mark(*offset(PIN, 0.0, -3.0), 1, timestamp_ms=3000)
+    tee2 = offset(PIN, 400.0, -300.0)
+    log.mark(*tee2, 2, timestamp_ms=4000)
+    log.mark(*offset(tee2, 0.0, 200.0), 2, timestamp_ms=5000)
+    log.flush()
+    return log
+
+
+def test_totals_and_recent(tmp_path, course):
+    history = RoundHistory(str(tmp_path / 'rounds.sqlite3'))
+    first = _round(tmp_path, 'a.shots', 250.0, 150.0)
+    assert history.add_round(course, first.shots(), source='a') is not None
+    assert history.add_round(course, first.shots(), source='a') is None  # 이미 가져옴
+    history.add_round(course, _round(tmp_path, 'b.shots', 210.0, 150.0).shots(), source='b')
+    assert history.round_count('demo') == 2
+
+    stats = history.hole_stats('demo')
+    # offset()은 근사라 1% 이내로만 맞음
+    assert stats[1]['drive'] == pytest.approx(230.0, rel=0.01) and stats[1]['drives'] == 2
+    assert stats[1]['gir'] == 1.0 and stats[1]['girs'] == 2
+    # 파를 모르는 홀: 드라이브는 계산, GIR은 없음
+    assert stats[2]['drive'] == pytest.approx(200.0, rel=0.01) and stats[2]['drives'] == 2
+    assert stats[2]['gir'] is None and stats[2]['girs'] == 0
+
+    # 최근 N라운드 경로(hole_results)도 누적 합계와 같은 값
+    recent = history.hole_stats('demo', last=10)
+    for hole, s in stats.items():
+        assert recent[hole]['drive'] == pytest.approx(s['drive'])
+        assert (recent[hole]['gir'], recent[hole]['girs']) == (s['gir'], s['girs'])
+    history.close()
+
+
+def test_sync_skips_unknown_course(tmp_path):
+    history = RoundHistory(str(tmp_path / 'rounds.sqlite3'))
+    log = RoundLog(str(tmp_path / 'rounds' / 'nowhere' / 'x.shots'))
+    log.mark(*PIN, 1)
+    log.flush()
+    errors = []
+    assert history.sync(str(tmp_path / 'rounds'), errors=errors) == 0
+    assert len(errors) == 1 and 'nowhere' in errors[0]
+    history.close()
@@ -0,0 +1,90 @@
+# 샷 기록: 레코드 왕복, 버퍼 저장 시점, 이어서 기록, 샷 거리 정확도
+import math
+
+import numpy as np
+import pytest
+
+import shot_log
+from conftest import offset
+from distance_engine import geodesic_distance
+from shot_log import SHOT_DTYPE, RoundLog, coords, load_rounds, read_round, shot_distance
+
+TEE = (-27.5393, 152.9451)
+
+
+def test_record_size_and_round_trip(tmp_path):
+    assert SHOT_DTYPE.itemsize == 26
+    log = RoundLog(str(tmp_path / 'r.shots'), batch=8)
+    first = offset(TEE, 0.0, 0.0)
+    second = offset(TEE, 120.0, 180.0)
+    assert math.isnan(log.mark(*first, hole=1, accuracy=4.0, timestamp_ms=1000))
+    length = log.mark(*second, hole=1, timestamp_ms=2000)
+    log.flush()
+
+    shots = read_round(log.path)
+    assert shots['hole'].tolist() == [1, 1]
+    assert shots['stroke'].tolist() == [1, 2]
+    assert shots['time'].tolist() == [1000, 2000]
+    assert shots['accuracy'][0] == 4.0 and math.isnan(shots['accuracy'][1])
+    assert shots['length'][1] == pytest.approx(length)
+    lats, lons = coords(shots)
+    assert lats == pytest.approx([first[0], second[0]], abs=1e-7)
+    assert lons == pytest.approx([first[1], second[1]], abs=1e-7)
+
+
+def test_buffer_flushes_on_batch_and_hole_change(tmp_path):
+    log = RoundLog(str(tmp_path / 'r.shots'), batch=2)
+    for k in range(3):
+        log.mark(*offset(TEE, 0.0, 50.0 * k), hole=1)
+    # 세 번째 표시에서 가득 찬 버퍼(2개)를 먼저 저장
+    assert len(read_round(log.path)) == 2
+    log.mark(*TEE, hole=2)
+    # 홀이 바뀌면 앞 홀 기록(1개)을 바로 저장
+    assert len(read_round(log.path)) == 3
+    assert len(log) == 4 and len(log.shots()) == 4
+
+
+def test_reopen_continues_stroke_and_length(tmp_path):
+    path = str(tmp_path / 'r.shots')
+    log = RoundLog(path)
+    log.mark(*TEE, hole=3)
+    log.flush()
+    again = RoundLog(path)
+    length = again.mark(*offset(TEE, 0.0, 200.0), hole=3)
+    assert length == pytest.approx(200.0, rel=0.01)
+    again.flush()
+    assert read_round(path)['stroke'].tolist() == [1, 2]
+
+
+def test_open_logs_flushed_at_exit(tmp_path):
+    log = RoundLog(str(tmp_path / 'r.shots'))
+    log.mark(*TEE, hole=1)
+    assert len(read_round(log.path)) == 0
+    shot_log._flush_open_logs()
+    assert len(read_round(log.path)) == 1
+
+
+def test_start_gives_unique_names_and_load_rounds(tmp_path):
+    logs = [RoundLog.start('demo', directory=str(tmp_path)) for _ in range(3)]
+    assert len({log.path for log in logs}) == 3
+    for k, log in enumerate(logs):
+        for s in range(k + 1):
+            log.mark(*offset(TEE, 0.0, 10.0 * s), hole=1)
+        log.flush()
+    shots, starts, paths = load_rounds(str(tmp_path), 'demo')
+    assert len(paths) == 3
+    assert sorted(np.diff(starts).tolist()) == [1, 2, 3]
+    assert len(shots) == 6
+
+
+def test_not_a_round_file(tmp_path):
+    path = tmp_path / 'bad.shots'
+    path.write_bytes(b'not a shot log')
+    with pytest.raises(ValueError):
+        read_round(str(path))
+
+
+@pytest.mark.parametrize('start', [TEE, (89.9, 10.0), (-16.8, 179.999)])
+def test_shot_distance_matches_geodesic(start):
+    end = offset(start, 180.0, -240.0)
+    assert shot_distance(*start, *end) == pytest.approx(geodesic_distance(*start, *end), abs=1e-3)
@@ -0,0 +1,50 @@
+import os
+import urllib.error
+import urllib.request
+
+import pytest
+
+from tile_cache import MBTiles, TileServer, tile_xy, valid_tile
+
+
+@pytest.fixture
+def server(tmp_path):
+    MBTiles(str(tmp_path / 'demo.mbtiles')).put(16, 100, 200, b'png')
+    server = TileServer(tile_dir=str(tmp_path), port=0, upstream='http://127.0.0.1:9/{z}/{x}/{y}.png',
+                        course_ids={'demo', 'new'}).start()
+    yield server
+    server.stop()
+
+
+def _status(server, path):
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{server.port}{path}', timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def test_valid_tile():
+    assert valid_tile(0, 0, 0) and valid_tile(22, 2 ** 22 - 1, 0)
+    assert not valid_tile(23, 0, 0) and not valid_tile(2, 4, 0) and not valid_tile(2, 0, -1)
+    assert valid_tile(18, *tile_xy(-27.5, 152.9, 18))
+
+
+def test_serves_cached_tile(server):
+    assert server.tile('demo', 16, 100, 200) == b'png'
+    assert _status(server, '/demo/16/100/200.png') == 200
+
+
+def test_rejects_out_of_range_before_lookup(server, tmp_path):
+    assert server.tile('demo', 999999999, 0, 0) is None
+    assert _status(server, '/demo/999999999/0/0.png') == 404
+    assert _status(server, '/demo/2/4/0.png') == 404
+    assert _status(server, '/demo/23/0/0.png') == 404
+    assert server.counters['upstream'] == 0
+
+
+def test_unknown_course_creates_no_file(server, tmp_path):
+    assert _status(server, '/nowhere/16/100/200.png') == 404
+    assert not os.path.exists(tmp_path / 'nowhere.mbtiles')
+    # 등록된 코스는 upstream에서 받을 수 있도록 새 캐시 파일을 엶
+    assert server.store('new') is not None
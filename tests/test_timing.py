@@ -0,0 +1,79 @@
+# 구간 측정: 꺼져 있을 때 빈 컨텍스트, 백분위 집계, 실행 레코드, 리스너와 오류 구분
+import pytest
+from loguru import logger
+
+import timing
+
+
+@pytest.fixture(autouse=True)
+def clean_state(monkeypatch):
+    monkeypatch.setattr(timing, '_enabled', False)
+    monkeypatch.setattr(timing, '_active', False)
+    monkeypatch.setattr(timing, '_listeners', [])
+    monkeypatch.setattr(timing, '_samples', {})
+    monkeypatch.delenv(timing.LOG_ENV_VAR, raising=False)
+
+
+class _Stop(BaseException):
+    """st.stop()/st.rerun()처럼 BaseException으로 빠져나가는 제어 흐름"""
+
+
+def test_disabled_timer_is_noop():
+    assert timing.timer('x') is timing._NOOP
+    with timing.timer('x'):
+        pass
+    assert timing.stats() == {}
+
+
+def test_percentiles_over_window(monkeypatch):
+    monkeypatch.setattr(timing, 'WINDOW', 100)
+    timing.enable()
+    for ms in range(1, 201):
+        timing.record('section', ms / 1000)
+    s = timing.stats()['section']
+    # 최근 100개(101~200 ms)만 남음
+    assert s['count'] == 100
+    assert s['p50'] == pytest.approx(150.5)
+    assert s['max'] == pytest.approx(200.0)
+    assert s['p95'] <= s['p99'] <= s['max']
+
+
+def test_rerun_record_collects_sections():
+    timing.enable()
+    records = []
+    sink = logger.add(records.append, level='TRACE', filter=lambda r: r['extra'].get('timing') == 'rerun')
+    try:
+        with timing.rerun('app'):
+            with timing.timer('a'):
+                pass
+            with timing.timer('a'):
+                pass
+
+            @timing.timed('b')
+            def work():
+                return 42
+
+            assert work() == 42
+    finally:
+        logger.remove(sink)
+    assert len(records) == 1
+    extra = records[0].record['extra']
+    assert set(extra['sections']) == {'a', 'b'}
+    assert extra['error'] is False
+    assert timing.stats()['a']['count'] == 2
+    assert 'rerun.app' in timing.stats()
+
+
+def test_listener_runs_while_disabled_and_flags_errors():
+    events = []
+    timing.add_listener(lambda kind, name, seconds, error: events.append((kind, name, error)))
+    assert timing.timer('x') is not timing._NOOP
+    with pytest.raises(_Stop):
+        with timing.rerun('app'):
+            with pytest.raises(ValueError):
+                with timing.timer('fails'):
+                    raise ValueError
+            raise _Stop
+    assert events == [('section', 'fails', True), ('rerun', 'app', False)]
+    # 꺼져 있으면 백분위 집계는 하지 않음
+    assert timing.stats() == {}
@@ -0,0 +1,333 @@
+# 지도 타일 캐시 (MBTiles/SQLite) 와 로컬 타일 서버
+#
+# 코스 범위의 타일을 필요한 줌 레벨만 미리 받아 cache/tiles/<코스>.mbtiles 에 저장하고
+# 로컬 HTTP 서버가 /<코스>/{z}/{x}/{y}.png 로 제공함 (긴 캐시 헤더 + ETag)
+#
+#   python tile_cache.py prefetch jindalee --zoom 14-18
+#   python tile_cache.py serve --port 8765
+#
+# 타일 제공자의 이용 정책을 지킬 것 (OpenStreetMap 기본 서버는 대량 다운로드 금지,
+# 코스 하나 정도 범위를 느린 속도로 받는 용도로만 사용하거나 --url 로 다른 제공자 지정)
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import urllib.request
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'tiles')
+UPSTREAM_URL = os.environ.get('GOLF_TILE_UPSTREAM', 'https://tile.openstreetmap.org/{z}/{x}/{y}.png')
+USER_AGENT = 'jindalee-golf-gps/1.0 (course tile prefetch)'
+ATTRIBUTION = '&copy; OpenStreetMap contributors'
+
+# 코스 경계 바깥으로 더 받을 여유 (미터)
+DEFAULT_MARGIN_M = 300.0
+
+# 제공하는 최대 줌 (요청 좌표 검사용)
+MAX_ZOOM = 22
+
+
+def tile_xy(lat, lon, zoom):
+    """위경도 → 슬리피맵 타일 번호 (x, y)"""
+    n = 2 ** zoom
+    lat = max(min(lat, 85.05112878), -85.05112878)
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tiles_for_bbox(south, west, north, east, zooms):
+    """경계 상자를 덮는 (z, x, y) 목록"""
+    for z in zooms:
+        x0, y0 = tile_xy(north, west, z)
+        x1, y1 = tile_xy(south, east, z)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield z, x, y
+
+
+class MBTiles:
+    """MBTiles 파일 하나 (tile_row는 규격대로 TMS 방향으로 저장)"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);"
+            "CREATE TABLE IF NOT EXISTS tiles (zoom_level INTEGER, tile_column INTEGER,"
+            " tile_row INTEGER, tile_data BLOB);"
+            "CREATE UNIQUE INDEX IF NOT EXISTS tile_index ON tiles"
+            " (zoom_level, tile_column, tile_row);"
+        )
+
+    def get(self, z, x, y):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+                (z, x, (2 ** z) - 1 - y),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, z, x, y, data):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)", (z, x, (2 ** z) - 1 - y, data)
+            )
+            self._db.commit()
+
+    def set_metadata(self, **values):
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO metadata VALUES (?, ?)", [(k, str(v)) for k, v in values.items()]
+            )
+            self._db.commit()
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM tiles").fetchone()[0]
+
+
+def fetch_tile(z, x, y, url=UPSTREAM_URL, timeout=10):
+    request = urllib.request.Request(url.format(z=z, x=x, y=y), headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read()
+
+
+def prefetch(store, bbox, zooms, url=UPSTREAM_URL, delay=0.2, progress=None):
+    """경계 상자의 타일 중 없는 것만 받아 저장. (받은 수, 건너뛴 수) 반환"""
+    fetched = skipped = 0
+    for z, x, y in tiles_for_bbox(*bbox, zooms):
+        if store.get(z, x, y) is not None:
+            skipped += 1
+            continue
+        store.put(z, x, y, fetch_tile(z, x, y, url))
+        fetched += 1
+        if progress:
+            progress(z, x, y)
+        time.sleep(delay)
+    south, west, north, east = bbox
+    store.set_metadata(
+        format='png', minzoom=min(zooms), maxzoom=max(zooms),
+        bounds=f"{west},{south},{east},{north}", attribution=ATTRIBUTION,
+    )
+    return fetched, skipped
+
+
+def course_tiles_path(course_id):
+    return os.path.join(TILE_DIR, f"{course_id}.mbtiles")
+
+
+def valid_tile(z, x, y):
+    """0 <= z <= MAX_ZOOM, 0 <= x, y < 2**z 인 타일 좌표인지"""
+    if not 0 <= z <= MAX_ZOOM:
+        return False
+    n = 2 ** z
+    return 0 <= x < n and 0 <= y < n
+
+
+def _registered_courses():
+    # 코스 데이터에 등록된 코스 id (코스 데이터를 읽을 수 없으면 빈 집합)
+    from course_data import CourseDataError, open_store
+
+    try:
+        return frozenset(open_store().course_ids())
+    except (CourseDataError, OSError):
+        return frozenset()
+
+
+# ---------------------------------------------------------------------------
+# 로컬 타일 서버
+# ---------------------------------------------------------------------------
+
+class TileServer:
+    """TILE_DIR의 코스별 MBTiles를 /<코스>/{z}/{x}/{y}.png 로 제공하는 HTTP 서버
+
+    캐시에 없는 타일은 upstream이 설정된 경우에만 받아서 저장(read-through)하고,
+    오프라인이면 404를 돌려줌. 요청/캐시/외부 요청 수를 counters에 기록
+    범위 밖 타일 좌표와 모르는 코스(course_ids에도 없고 .mbtiles 파일도 없음)는 조회 없이 404
+    course_ids를 주지 않으면 course_data에 등록된 코스를 씀
+    """
+
+    _PATH = re.compile(r'^/([\w-]+)/(\d{1,2})/(\d{1,8})/(\d{1,8})\.png$')
+
+    def __init__(self, tile_dir=TILE_DIR, host='127.0.0.1', port=8765, upstream=None,
+                 max_age=30 * 24 * 3600, course_ids=None):
+        self.tile_dir = tile_dir
+        self.upstream = upstream
+        self.course_ids = frozenset(course_ids) if course_ids is not None else _registered_courses()
+        self.max_age = max_age
+        self.counters = {'requests': 0, 'served': 0, 'not_modified': 0, 'missing': 0, 'upstream': 0}
+        self._stores = {}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.httpd.server_address[1]
+
+    def store(self, course_id):
+        with self._lock:
+            store = self._stores.get(course_id)
+            if store is None:
+                path = os.path.join(self.tile_dir, f"{course_id}.mbtiles")
+                if not os.path.exists(path) and (self.upstream is None or course_id not in self.course_ids):
+                    return None
+                store = self._stores[course_id] = MBTiles(path)
+            return store
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def tile(self, course_id, z, x, y):
+        if not valid_tile(z, x, y):
+            return None
+        store = self.store(course_id)
+        if store is None:
+            return None
+        data = store.get(z, x, y)
+        if data is None and self.upstream:
+            try:
+                data = fetch_tile(z, x, y, self.upstream)
+            except OSError:
+                return None
+            self._count('upstream')
+            store.put(z, x, y, data)
+        return data
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._count('requests')
+                match = server._PATH.match(self.path.split('?')[0])
+                data = match and server.tile(match.group(1), *(int(v) for v in match.groups()[1:]))
+                if not data:
+                    server._count('missing')
+                    self.send_response(404)
+                    self.send_header('Access-Control-Allow-Origin', '*')
+                    self.end_headers()
+                    return
+                etag = '"' + hashlib.sha1(data).hexdigest()[:16] + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    server._count('not_modified')
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                server._count('served')
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/png')
+                self.send_header('Content-Length', str(len(data)))
+                self.send_header('Cache-Control', f'public, max-age={server.max_age}, immutable')
+                self.send_header('ETag', etag)
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작 (이미 실행 중이면 무시)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.httpd.serve_forever, name='tile-server', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@lru_cache(maxsize=None)
+def background_server(port, host='127.0.0.1'):
+    """앱 프로세스 안에서 타일 서버를 한 번만 띄움
+
+    다른 앱 프로세스가 이미 같은 포트로 띄운 경우에는 그 서버를 그대로 씀 (None 반환)
+    """
+    try:
+        return TileServer(host=host, port=port).start()
+    except OSError:
+        return None
+
+
+def tile_url_template(course_id):
+    """브라우저가 사용할 타일 URL 템플릿. 코스 타일 캐시가 없거나 설정이 없으면 None
+
+    GOLF_TILE_URL: 외부에서 접근 가능한 타일 서버 주소
+        (예: https://golf.example.com/tiles/{course}/{z}/{x}/{y}.png)
+    GOLF_TILE_PORT: 앱 프로세스 안에서 타일 서버를 띄울 포트 (로컬 실행용,
+        GOLF_TILE_URL이 없으면 http://localhost:<포트>/... 를 씀)
+    """
+    if not os.path.exists(course_tiles_path(course_id)):
+        return None
+    template = os.environ.get('GOLF_TILE_URL')
+    port = os.environ.get('GOLF_TILE_PORT')
+    if port:
+        server = background_server(int(port))
+        if server is not None:
+            import metrics
+
+            metrics.watch('tiles', server, hits=('served', 'not_modified'), misses=('missing',))
+        template = template or f"http://localhost:{port}/{{course}}/{{z}}/{{x}}/{{y}}.png"
+    if not template:
+        return None
+    return template.replace('{course}', course_id)
+
+
+def _zoom_range(text):
+    lo, _, hi = text.partition('-')
+    return list(range(int(lo), int(hi or lo) + 1))
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="코스 지도 타일 미리 받기 / 로컬 타일 서버")
+    sub = parser.add_subparsers(dest='command', required=True)
+    pre = sub.add_parser('prefetch')
+    pre.add_argument('course')
+    pre.add_argument('--zoom', default='14-18', help="줌 범위 (예: 14-18)")
+    pre.add_argument('--margin', type=float, default=DEFAULT_MARGIN_M)
+    pre.add_argument('--url', default=UPSTREAM_URL)
+    pre.add_argument('--delay', type=float, default=0.2, help="요청 간격 (초)")
+    serve = sub.add_parser('serve')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--upstream', default=None, help="캐시에 없는 타일을 받을 URL (기본: 오프라인)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'prefetch':
+        from course_data import load_course
+
+        bbox = load_course(args.course).bounds(args.margin)
+        zooms = _zoom_range(args.zoom)
+        total = sum(1 for _ in tiles_for_bbox(*bbox, zooms))
+        print(f"{args.course}: 줌 {zooms[0]}-{zooms[-1]}, 타일 {total}개")
+        store = MBTiles(course_tiles_path(args.course))
+        fetched, skipped = prefetch(store, bbox, zooms, args.url, args.delay)
+        print(f"받음 {fetched}, 이미 있음 {skipped} → {store.path}")
+    else:
+        server = TileServer(host=args.host, port=args.port, upstream=args.upstream)
+        print(f"http://{args.host}:{server.port}/<코스>/{{z}}/{{x}}/{{y}}.png")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            server.stop()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,223 @@
+# 리런 구간별 실행 시간 측정
+#
+#   with timer('distance.all_holes'): ...     # 구간 하나
+#   @timed('ui.location')                     # 함수 전체
+#   with rerun('ai-loc7777'): main()          # 스크립트 실행 한 번 (구간 합계를 한 레코드로)
+#
+# 켜는 방법: 환경 변수 GOLF_TIMING=1, 또는 앱 주소에 ?diag=1 (진단 패널도 함께 표시)
+#   ?diag=1은 GOLF_DIAG_ALLOW=1 일 때만 받음 (누구나 프로세스 전체 측정을 켜지 못하도록)
+# 꺼져 있으면 timer()는 미리 만든 빈 컨텍스트를 돌려주고 timed()는 원래 함수를 바로
+# 호출하므로 부담은 함수 호출 한 번 정도. 켜져 있으면 구간마다 loguru TRACE 레코드
+# (extra: timing, section, ms, rerun), 실행마다 DEBUG 레코드를 남기고,
+# 구간별 최근 WINDOW개 표본으로 p50/p95/p99를 계산함. GOLF_TIMING_LOG=<경로>를 주면 레코드를 JSON 줄로 파일에 씀
+# (LOG_ROTATION마다 새 파일, 최근 LOG_RETENTION개만 보관)
+# add_listener()로 등록한 함수는 측정값을 바로 받음 (metrics.py의 Prometheus 집계). 리스너가 있으면
+# 꺼져 있어도 측정은 하되 레코드와 p50/p95/p99 집계는 켜져 있을 때만
+import functools
+import itertools
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+from loguru import logger
+
+ENV_VAR = 'GOLF_TIMING'
+LOG_ENV_VAR = 'GOLF_TIMING_LOG'
+ALLOW_ENV_VAR = 'GOLF_DIAG_ALLOW'
+QUERY_PARAM = 'diag'
+LOG_ROTATION = '20 MB'
+LOG_RETENTION = 5
+WINDOW = 1024
+
+_enabled = False
+_active = False  # 측정 여부: 켜져 있거나 리스너가 있을 때
+_sink = None
+_samples = {}
+_lock = threading.Lock()
+_local = threading.local()
+_rerun_ids = itertools.count(1)
+_listeners = []
+
+
+class _Noop:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _Noop()
+
+
+class _Timer:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, time.perf_counter() - self.start, error=_failed(exc_type))
+        return False
+
+
+def _failed(exc_type):
+    # st.rerun()/st.stop()의 제어 흐름 예외(BaseException)는 실패로 보지 않음
+    return exc_type is not None and issubclass(exc_type, Exception)
+
+
+def enabled():
+    return _enabled
+
+
+def add_listener(fn):
+    """측정값마다 fn(kind, name, seconds, error) 호출 (kind: 'section' 또는 'rerun', 켜져 있을 때만)"""
+    global _active
+    if fn not in _listeners:
+        _listeners.append(fn)
+    _active = True
+
+
+def enable(flag=True):
+    """측정 켜기/끄기 (프로세스 전체). 처음 켤 때 GOLF_TIMING_LOG 파일 싱크를 추가"""
+    global _enabled, _active, _sink
+    _enabled = bool(flag)
+    _active = _enabled or bool(_listeners)
+    path = os.environ.get(LOG_ENV_VAR)
+    if _enabled and path and _sink is None:
+        _sink = logger.add(path, serialize=True, level='TRACE', enqueue=True,
+                           rotation=LOG_ROTATION, retention=LOG_RETENTION,
+                           filter=lambda r: 'timing' in r['extra'])
+
+
+def timer(name):
+    """구간 측정 컨텍스트 (꺼져 있으면 아무것도 하지 않음)"""
+    return _Timer(name) if _active else _NOOP
+
+
+def timed(name=None):
+    """함수 실행 시간 측정 데코레이터. 이름을 생략하면 함수 이름"""
+    def decorator(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _active:
+                return fn(*args, **kwargs)
+            with _Timer(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record(name, seconds, error=False):
+    """측정값 하나를 집계에 넣고 loguru 레코드로 남김 (꺼져 있으면 리스너에만 전달)"""
+    if _enabled:
+        with _lock:
+            samples = _samples.get(name)
+            if samples is None:
+                samples = _samples[name] = deque(maxlen=WINDOW)
+            samples.append(seconds)
+        current = getattr(_local, 'rerun', None)
+        if current is not None:
+            current['sections'][name] = current['sections'].get(name, 0.0) + seconds * 1000
+        logger.bind(timing='section', section=name, ms=seconds * 1000, error=error,
+                    rerun=current['id'] if current else None).trace("{} {:.2f} ms", name, seconds * 1000)
+    for fn in _listeners:
+        fn('section', name, seconds, error)
+
+
+class rerun:
+    """스크립트 실행 한 번. 안에서 측정한 구간을 모아 끝날 때 레코드 하나로 남김"""
+
+    def __init__(self, script):
+        self.script = script
+
+    def __enter__(self):
+        if _active:
+            self.start = time.perf_counter()
+            _local.rerun = {'id': next(_rerun_ids), 'sections': {}}
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        current = getattr(_local, 'rerun', None)
+        if current is None:
+            return False
+        _local.rerun = None
+        seconds = time.perf_counter() - self.start
+        error = _failed(exc_type)
+        if _enabled:
+            with _lock:
+                samples = _samples.setdefault(f'rerun.{self.script}', deque(maxlen=WINDOW))
+                samples.append(seconds)
+            logger.bind(timing='rerun', script=self.script, rerun=current['id'], ms=seconds * 1000,
+                        sections=current['sections'], error=error).debug(
+                "{} rerun {:.1f} ms", self.script, seconds * 1000)
+        for fn in _listeners:
+            fn('rerun', self.script, seconds, error)
+        return False
+
+
+def stats():
+    """{구간: {'count', 'p50', 'p95', 'p99', 'max'}} (ms, 최근 WINDOW개 기준)"""
+    with _lock:
+        snapshot = {name: np.array(samples) * 1000 for name, samples in _samples.items()}
+    out = {}
+    for name in sorted(snapshot):
+        values = snapshot[name]
+        p50, p95, p99 = np.percentile(values, [50, 95, 99]).tolist()
+        out[name] = {'count': len(values), 'p50': p50, 'p95': p95, 'p99': p99, 'max': float(values.max())}
+    return out
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+
+
+def _diag_requested():
+    """GOLF_DIAG_ALLOW가 켜져 있고 주소에 ?diag=1이 있는지"""
+    import streamlit as st
+
+    return os.environ.get(ALLOW_ENV_VAR, '') not in ('', '0') and st.query_params.get(QUERY_PARAM) == '1'
+
+
+def configure():
+    """Streamlit 앱 시작 시 호출: 허용된 ?diag=1이면 측정을 켬 (이후 프로세스 전체에서 유지)"""
+    if not _enabled and _diag_requested():
+        enable()
+
+
+def diagnostics_panel():
+    """허용된 ?diag=1일 때만 보이는 진단 패널 (구간별 p50/p95/p99)"""
+    import streamlit as st
+
+    if not _diag_requested():
+        return
+    with st.expander("⏱ 진단: 구간별 실행 시간 (ms)"):
+        data = stats()
+        if not data:
+            st.caption("측정값이 없습니다.")
+            return
+        st.table({
+            "구간": list(data),
+            "횟수": [s['count'] for s in data.values()],
+            "p50": [f"{s['p50']:.1f}" for s in data.values()],
+            "p95": [f"{s['p95']:.1f}" for s in data.values()],
+            "p99": [f"{s['p99']:.1f}" for s in data.values()],
+            "최대": [f"{s['max']:.1f}" for s in data.values()],
+        })
+        if st.button("측정값 초기화", key="timing_reset"):
+            reset()
+
+
+if os.environ.get(ENV_VAR, '') not in ('', '0'):
+    enable()